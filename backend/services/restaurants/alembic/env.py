@@ -16,7 +16,7 @@ if database_url:
     config.set_main_option("sqlalchemy.url", database_url)
 
 from shared.database import Base
-from app.models import Restaurant, Menu, MenuItem
+from app.models import Restaurant, Menu, MenuItem, MenuSnapshot
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,36 @@
+"""menu item search
+
+Revision ID: 3c7e9b1d5a20
+Revises: 8d4c6a2e1f37
+Create Date: 2026-10-16 13:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e9b1d5a20'
+down_revision: Union[str, Sequence[str], None] = '8d4c6a2e1f37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 'simple' keeps the index language-neutral: no stemming or stop words.
+    op.execute(
+        "ALTER TABLE menu_items ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.create_index('ix_menu_items_search_vector', 'menu_items', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_menu_items_search_vector', table_name='menu_items', postgresql_using='gin')
+    op.drop_column('menu_items', 'search_vector')
@@ -0,0 +1,56 @@
+"""keyset pagination indexes
+
+Revision ID: 5b1e2f7c9a41
+Revises: 062ac72cc702
+Create Date: 2026-10-16 10:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e2f7c9a41'
+down_revision: Union[str, Sequence[str], None] = '062ac72cc702'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite (filter, sort key, id) indexes back the keyset listings; the
+    # single-column foreign key indexes are prefixes of them.
+    op.create_index('ix_restaurants_created_at_id', 'restaurants', ['created_at', 'id'], unique=False)
+    op.create_index('ix_restaurants_name_id', 'restaurants', ['name', 'id'], unique=False)
+    op.create_index('ix_restaurants_rating_id', 'restaurants', [sa.text('coalesce(rating, -1)'), 'id'], unique=False)
+    op.create_index('ix_restaurants_owner_id_created_at_id', 'restaurants', ['owner_id', 'created_at', 'id'], unique=False)
+    op.drop_index(op.f('ix_restaurants_owner_id'), table_name='restaurants')
+
+    op.create_index('ix_menus_restaurant_id_created_at_id', 'menus', ['restaurant_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_menus_restaurant_id_kind_id', 'menus', ['restaurant_id', 'kind', 'id'], unique=False)
+    op.drop_index(op.f('ix_menus_restaurant_id'), table_name='menus')
+
+    op.create_index('ix_menu_items_menu_id_created_at_id', 'menu_items', ['menu_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_menu_items_menu_id_name_id', 'menu_items', ['menu_id', 'name', 'id'], unique=False)
+    op.create_index('ix_menu_items_menu_id_price_id', 'menu_items', ['menu_id', 'price', 'id'], unique=False)
+    op.drop_index(op.f('ix_menu_items_menu_id'), table_name='menu_items')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_menu_items_menu_id'), 'menu_items', ['menu_id'], unique=False)
+    op.drop_index('ix_menu_items_menu_id_price_id', table_name='menu_items')
+    op.drop_index('ix_menu_items_menu_id_name_id', table_name='menu_items')
+    op.drop_index('ix_menu_items_menu_id_created_at_id', table_name='menu_items')
+
+    op.create_index(op.f('ix_menus_restaurant_id'), 'menus', ['restaurant_id'], unique=False)
+    op.drop_index('ix_menus_restaurant_id_kind_id', table_name='menus')
+    op.drop_index('ix_menus_restaurant_id_created_at_id', table_name='menus')
+
+    op.create_index(op.f('ix_restaurants_owner_id'), 'restaurants', ['owner_id'], unique=False)
+    op.drop_index('ix_restaurants_owner_id_created_at_id', table_name='restaurants')
+    op.drop_index('ix_restaurants_rating_id', table_name='restaurants')
+    op.drop_index('ix_restaurants_name_id', table_name='restaurants')
+    op.drop_index('ix_restaurants_created_at_id', table_name='restaurants')
@@ -0,0 +1,34 @@
+"""restaurant coordinates
+
+Revision ID: 6f2a8c4e0b93
+Revises: 3c7e9b1d5a20
+Create Date: 2026-10-16 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f2a8c4e0b93'
+down_revision: Union[str, Sequence[str], None] = '3c7e9b1d5a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('restaurants', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('restaurants', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('restaurants', sa.Column('geohash', sa.String(length=12), nullable=True))
+    op.create_index('ix_restaurants_geohash', 'restaurants', ['geohash'], unique=False, postgresql_ops={'geohash': 'text_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_restaurants_geohash', table_name='restaurants')
+    op.drop_column('restaurants', 'geohash')
+    op.drop_column('restaurants', 'longitude')
+    op.drop_column('restaurants', 'latitude')
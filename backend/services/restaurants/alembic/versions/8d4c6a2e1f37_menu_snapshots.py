@@ -0,0 +1,38 @@
+"""menu snapshots
+
+Revision ID: 8d4c6a2e1f37
+Revises: 5b1e2f7c9a41
+Create Date: 2026-10-16 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4c6a2e1f37'
+down_revision: Union[str, Sequence[str], None] = '5b1e2f7c9a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('menu_snapshots',
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('restaurant_id', sa.UUID(), nullable=False),
+    sa.Column('body', sa.LargeBinary(), nullable=False),
+    sa.Column('body_gzip', sa.LargeBinary(), nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('content_hash')
+    )
+    op.create_index('ix_menu_snapshots_restaurant_id_published_at', 'menu_snapshots', ['restaurant_id', 'published_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_menu_snapshots_restaurant_id_published_at', table_name='menu_snapshots')
+    op.drop_table('menu_snapshots')
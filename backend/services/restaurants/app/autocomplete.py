@@ -0,0 +1,463 @@
+"""In-memory prefix index for restaurant and dish name typeahead.
+
+Every word-start suffix of a name ("chicken tikka", "tikka") is kept in
+sorted lists (one per kind, bucketed by first character), so the names
+matching a prefix are a contiguous range found by two binary searches.
+Suggestions are ranked by restaurant rating (a dish by its restaurant's).
+
+Small ranges are ranked on the fly. Prefixes matching more than
+``scan_limit`` entries keep a precomputed list of their best entries, filled
+in one pass over all names in rank order at load time and maintained exactly
+on every insert, rename, delete and rating change.
+
+The index is built at startup and kept current by the restaurant, menu and
+menu item services after each successful commit. Writes made anywhere else
+(other replicas, backfills, manual SQL) are picked up by
+``AutocompleteRebuilder``, which rebuilds it when the tables' version changes.
+"""
+import asyncio
+import bisect
+import heapq
+import re
+import threading
+import time
+from itertools import islice
+from typing import Callable, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from shared.database import get_database
+from shared.logging import get_logger
+from shared.metrics import Counter
+
+from app.catalog import table_version
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+from app.models.restaurant import Restaurant
+from app.schemas.autocomplete import AutocompleteSuggestion
+
+logger = get_logger("restaurants.autocomplete")
+
+RESTAURANT = "restaurant"
+MENU_ITEM = "menu_item"
+KINDS = (RESTAURANT, MENU_ITEM)
+
+MAX_SUFFIXES = 8
+_WORD = re.compile(r"[^\W_]+")
+_HIGHEST = "\U0010ffff"
+
+
+def normalize(text: str) -> str:
+    return " ".join(_WORD.findall(text.casefold()))
+
+
+def _suffixes(name: str) -> list[str]:
+    words = _WORD.findall(name.casefold())
+    return [" ".join(words[i:]) for i in range(min(len(words), MAX_SUFFIXES))]
+
+
+def _prefixes(keys: list[str], max_length: int) -> set[str]:
+    return {key[:end] for key in keys for end in range(1, min(len(key), max_length) + 1)}
+
+
+class _Entry:
+    __slots__ = ("kind", "id", "name", "restaurant_id", "menu_id", "keys")
+
+    def __init__(self, kind: str, id: UUID, name: str, restaurant_id: UUID, menu_id: Optional[UUID]):
+        self.kind = kind
+        self.id = id
+        self.name = name
+        self.restaurant_id = restaurant_id
+        self.menu_id = menu_id
+        self.keys = _suffixes(name)
+
+
+class _PrefixTable:
+    """Sorted ``(key, slot)`` pairs for one kind of name, plus cached top lists.
+
+    A cached list holds the exact best ``len(list)`` slots of its prefix: an
+    insert is only added if it beats the current last entry, a delete only
+    shortens the list. It is recomputed once it drops below ``max_limit``.
+    """
+
+    def __init__(self, rank: Callable[[int], tuple], max_limit: int, scan_limit: int):
+        self.rank = rank
+        self.max_limit = max_limit
+        self.capacity = max_limit * 2
+        self.scan_limit = max(scan_limit, self.capacity)
+        self.buckets: dict[str, list[tuple[str, int]]] = {}
+        self.top: dict[str, list[int]] = {}
+        self.longest_top = 0
+
+    def _range(self, prefix: str) -> tuple[list, int, int]:
+        keys = self.buckets.get(prefix[0], [])
+        start = bisect.bisect_left(keys, (prefix,))
+        return keys, start, bisect.bisect_left(keys, (prefix + _HIGHEST,), lo=start)
+
+    def _best(self, keys: list, start: int, end: int, count: int) -> list[int]:
+        return heapq.nsmallest(count, {slot for _, slot in keys[start:end]}, key=self.rank)
+
+    def load(self, pairs: list[tuple[str, int]], slots_by_rank: list[int], keys_of: Callable[[int], list[str]]):
+        pairs.sort()
+        self.buckets = {}
+        for pair in pairs:
+            self.buckets.setdefault(pair[0][0], []).append(pair)
+        self.top = {prefix: [] for prefix in self._large_prefixes()}
+        self.longest_top = max(map(len, self.top), default=0)
+        # Walk names best-first; each large prefix keeps the first `capacity` it sees.
+        unfilled = len(self.top)
+        for slot in slots_by_rank:
+            if not unfilled:
+                break
+            for prefix in _prefixes(keys_of(slot), self.longest_top):
+                top = self.top.get(prefix)
+                if top is not None and len(top) < self.capacity:
+                    top.append(slot)
+                    if len(top) == self.capacity:
+                        unfilled -= 1
+
+    def _large_prefixes(self) -> list[str]:
+        large = []
+        frontier = list(self.buckets)
+        while frontier:
+            prefix = frontier.pop()
+            keys, start, end = self._range(prefix)
+            if end - start <= self.scan_limit:
+                continue
+            large.append(prefix)
+            index = start
+            while index < end:
+                key = keys[index][0]
+                if len(key) == len(prefix):
+                    index = bisect.bisect_left(keys, (prefix + "\x00",), index, end)
+                    continue
+                child = key[:len(prefix) + 1]
+                frontier.append(child)
+                index = bisect.bisect_left(keys, (child + _HIGHEST,), index, end)
+        return large
+
+    def insert(self, slot: int, keys: list[str]):
+        for key in keys:
+            bisect.insort(self.buckets.setdefault(key[0], []), (key, slot))
+        self.promote(slot, keys)
+
+    def delete(self, slot: int, keys: list[str]):
+        self.withdraw(slot, keys)
+        for key in keys:
+            bucket = self.buckets.get(key[0], [])
+            index = bisect.bisect_left(bucket, (key, slot))
+            if index < len(bucket) and bucket[index] == (key, slot):
+                del bucket[index]
+
+    def promote(self, slot: int, keys: list[str]):
+        rank = self.rank(slot)
+        for prefix in _prefixes(keys, self.longest_top):
+            top = self.top.get(prefix)
+            if top and slot not in top and rank < self.rank(top[-1]):
+                bisect.insort(top, slot, key=self.rank)
+                del top[self.capacity:]
+
+    def withdraw(self, slot: int, keys: list[str]):
+        for prefix in _prefixes(keys, self.longest_top):
+            top = self.top.get(prefix)
+            if top and slot in top:
+                top.remove(slot)
+
+    def best(self, prefix: str) -> list[int]:
+        keys, start, end = self._range(prefix)
+        if end - start <= self.scan_limit:
+            return self._best(keys, start, end, self.max_limit)
+        top = self.top.get(prefix)
+        if top is None or len(top) < self.max_limit:
+            top = self.top[prefix] = self._best(keys, start, end, self.capacity)
+            self.longest_top = max(self.longest_top, len(prefix))
+        return top[:self.max_limit]
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self.buckets.values())
+
+
+class AutocompleteIndex:
+    def __init__(self, max_limit: int = 20, scan_limit: int = 512):
+        self.max_limit = max_limit
+        self._lock = threading.RLock()
+        self._entries: dict[int, _Entry] = {}
+        self._slots: dict[tuple[str, UUID], int] = {}
+        self._next_slot = 0
+        self._ratings: dict[UUID, Optional[float]] = {}
+        self._restaurant_items: dict[UUID, set[int]] = {}
+        self._menu_items: dict[UUID, set[int]] = {}
+        self._tables = {kind: _PrefixTable(self._rank, max_limit, scan_limit) for kind in KINDS}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _rank(self, slot: int) -> tuple:
+        entry = self._entries[slot]
+        rating = self._ratings.get(entry.restaurant_id)
+        return (-(rating if rating is not None else -1.0), entry.name.casefold(), slot)
+
+    def _new_entry(self, entry: _Entry) -> int:
+        slot = self._next_slot
+        self._next_slot += 1
+        self._entries[slot] = entry
+        self._slots[(entry.kind, entry.id)] = slot
+        if entry.kind == MENU_ITEM:
+            self._restaurant_items.setdefault(entry.restaurant_id, set()).add(slot)
+            self._menu_items.setdefault(entry.menu_id, set()).add(slot)
+        return slot
+
+    def _add(self, entry: _Entry):
+        slot = self._new_entry(entry)
+        self._tables[entry.kind].insert(slot, entry.keys)
+
+    def _remove(self, slot: int):
+        entry = self._entries[slot]
+        self._tables[entry.kind].delete(slot, entry.keys)
+        del self._slots[(entry.kind, entry.id)]
+        del self._entries[slot]
+        if entry.kind == MENU_ITEM:
+            for groups, group_id in ((self._restaurant_items, entry.restaurant_id), (self._menu_items, entry.menu_id)):
+                slots = groups.get(group_id)
+                if slots is not None:
+                    slots.discard(slot)
+                    if not slots:
+                        del groups[group_id]
+
+    def load(self, restaurants: Iterable[tuple], menu_items: Iterable[tuple]):
+        """Replace the contents from ``(id, name, rating)`` and ``(id, name, menu_id, restaurant_id)`` rows."""
+        with self._lock:
+            self._entries.clear()
+            self._slots.clear()
+            self._ratings.clear()
+            self._restaurant_items.clear()
+            self._menu_items.clear()
+            pairs = {kind: [] for kind in KINDS}
+            for restaurant_id, name, rating in restaurants:
+                self._ratings[restaurant_id] = rating
+                entry = _Entry(RESTAURANT, restaurant_id, name, restaurant_id, None)
+                slot = self._new_entry(entry)
+                pairs[RESTAURANT] += [(key, slot) for key in entry.keys]
+            for item_id, name, menu_id, restaurant_id in menu_items:
+                entry = _Entry(MENU_ITEM, item_id, name, restaurant_id, menu_id)
+                slot = self._new_entry(entry)
+                pairs[MENU_ITEM] += [(key, slot) for key in entry.keys]
+            slots_by_rank = sorted(self._entries, key=self._rank)
+            for kind, table in self._tables.items():
+                ranked = [slot for slot in slots_by_rank if self._entries[slot].kind == kind]
+                table.load(pairs[kind], ranked, lambda slot: self._entries[slot].keys)
+
+    def upsert_restaurant(self, restaurant_id: UUID, name: str, rating: Optional[float]):
+        with self._lock:
+            slot = self._slots.get((RESTAURANT, restaurant_id))
+            if slot is not None and self._ratings.get(restaurant_id) != rating:
+                # Re-rank the restaurant and its dishes in the cached top lists.
+                moved = [slot, *self._restaurant_items.get(restaurant_id, ())]
+                for moved_slot in moved:
+                    entry = self._entries[moved_slot]
+                    self._tables[entry.kind].withdraw(moved_slot, entry.keys)
+                self._ratings[restaurant_id] = rating
+                for moved_slot in moved:
+                    entry = self._entries[moved_slot]
+                    self._tables[entry.kind].promote(moved_slot, entry.keys)
+            self._ratings[restaurant_id] = rating
+            if slot is not None:
+                if self._entries[slot].name == name:
+                    return
+                self._remove(slot)
+            self._add(_Entry(RESTAURANT, restaurant_id, name, restaurant_id, None))
+
+    def remove_restaurant(self, restaurant_id: UUID):
+        """Drop the restaurant and, as the database cascade does, its dishes."""
+        with self._lock:
+            for slot in list(self._restaurant_items.get(restaurant_id, ())):
+                self._remove(slot)
+            slot = self._slots.get((RESTAURANT, restaurant_id))
+            if slot is not None:
+                self._remove(slot)
+            self._ratings.pop(restaurant_id, None)
+
+    def remove_menu(self, menu_id: UUID):
+        with self._lock:
+            for slot in list(self._menu_items.get(menu_id, ())):
+                self._remove(slot)
+
+    def add_menu_item(self, item_id: UUID, name: str, menu_id: UUID, restaurant_id: UUID):
+        with self._lock:
+            if (MENU_ITEM, item_id) not in self._slots:
+                self._add(_Entry(MENU_ITEM, item_id, name, restaurant_id, menu_id))
+
+    def rename_menu_item(self, item_id: UUID, name: str):
+        with self._lock:
+            slot = self._slots.get((MENU_ITEM, item_id))
+            if slot is None or self._entries[slot].name == name:
+                return
+            entry = self._entries[slot]
+            self._remove(slot)
+            self._add(_Entry(MENU_ITEM, item_id, name, entry.restaurant_id, entry.menu_id))
+
+    def remove_menu_item(self, item_id: UUID):
+        with self._lock:
+            slot = self._slots.get((MENU_ITEM, item_id))
+            if slot is not None:
+                self._remove(slot)
+
+    def suggest(self, q: str, kind: Optional[str] = None, limit: int = 10) -> list[AutocompleteSuggestion]:
+        prefix = normalize(q)
+        if not prefix:
+            return []
+        with self._lock:
+            kinds = KINDS if kind is None else (kind,)
+            ranked = heapq.merge(*(self._tables[name].best(prefix) for name in kinds), key=self._rank)
+            entries = [self._entries[slot] for slot in islice(ranked, limit)]
+            ratings = [self._ratings.get(entry.restaurant_id) for entry in entries]
+        return [
+            AutocompleteSuggestion(
+                kind=entry.kind,
+                id=entry.id,
+                name=entry.name,
+                restaurant_id=entry.restaurant_id,
+                rating=rating,
+            )
+            for entry, rating in zip(entries, ratings)
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "names": len(self._entries),
+            "keys": sum(len(table) for table in self._tables.values()),
+            "cached_prefixes": sum(len(table.top) for table in self._tables.values()),
+        }
+
+
+def build_autocomplete_index(index: AutocompleteIndex) -> list[str]:
+    """Load ``index`` from the database; returns the table version read before the rows."""
+    with get_database().get_session(readonly=True) as session:
+        version = table_version(session)
+        restaurants = session.execute(select(Restaurant.id, Restaurant.name, Restaurant.rating)).all()
+        menu_items = session.execute(
+            select(MenuItem.id, MenuItem.name, MenuItem.menu_id, Menu.restaurant_id).join(Menu, Menu.id == MenuItem.menu_id)
+        ).all()
+    index.load(restaurants, menu_items)
+    logger.info("Autocomplete index built", extra=index.stats())
+    return version
+
+
+class AutocompleteRebuilder:
+    """Replaces the served index when the tables change outside this process.
+
+    Every ``interval`` the tables' version (row counts and latest
+    ``updated_at``, as for the catalog) is compared with the one the index was
+    built from. If it differs, or the index is ``max_age`` old (for writes that
+    leave ``updated_at`` alone), a fresh index is built off to the side and
+    swapped in. A write committed during a rebuild changes the version again,
+    so the next check picks it up.
+    """
+
+    def __init__(self, max_limit: int, interval: float = 60.0, max_age: float = 3600.0):
+        self.max_limit = max_limit
+        self.interval = interval
+        self.max_age = max_age
+        self.version: Optional[list[str]] = None
+        self.built_at: Optional[float] = None
+        self.last_build_seconds: Optional[float] = None
+        self.rebuilds = Counter()
+        self.failures = Counter()
+        self._task: Optional[asyncio.Task] = None
+
+    def rebuild(self) -> AutocompleteIndex:
+        started = time.monotonic()
+        index = AutocompleteIndex(max_limit=self.max_limit)
+        version = build_autocomplete_index(index)
+        init_autocomplete(index)
+        self.version, self.built_at = version, time.monotonic()
+        self.last_build_seconds = self.built_at - started
+        self.rebuilds.inc()
+        return index
+
+    def refresh(self) -> bool:
+        """Rebuild if the tables changed or the index is too old. Returns whether it rebuilt."""
+        if self.built_at is not None and time.monotonic() - self.built_at < self.max_age:
+            with get_database().get_session(readonly=True) as session:
+                if table_version(session) == self.version:
+                    return False
+        self.rebuild()
+        return True
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                self.failures.inc()
+                logger.error("Autocomplete rebuild failed", extra={"error": str(e)})
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        index = get_autocomplete()
+        return {
+            **(index.stats() if index is not None else {}),
+            "rebuilds": self.rebuilds.value,
+            "failures": self.failures.value,
+            "age_seconds": round(time.monotonic() - self.built_at, 1) if self.built_at is not None else None,
+            "last_build_seconds": self.last_build_seconds,
+        }
+
+
+_index: Optional[AutocompleteIndex] = None
+
+
+def init_autocomplete(index: AutocompleteIndex) -> AutocompleteIndex:
+    global _index
+    _index = index
+    return _index
+
+
+def get_autocomplete() -> Optional[AutocompleteIndex]:
+    return _index
+
+
+# Queued by the services with ``after_commit``; no-ops until the index is built.
+
+def index_restaurant(restaurant_id: UUID, name: str, rating: Optional[float]):
+    if _index is not None:
+        _index.upsert_restaurant(restaurant_id, name, rating)
+
+
+def unindex_restaurant(restaurant_id: UUID):
+    if _index is not None:
+        _index.remove_restaurant(restaurant_id)
+
+
+def unindex_menu(menu_id: UUID):
+    if _index is not None:
+        _index.remove_menu(menu_id)
+
+
+def index_menu_items(items: Iterable, menu_id: UUID, restaurant_id: UUID):
+    if _index is not None:
+        for item in items:
+            _index.add_menu_item(item.id, item.name, menu_id, restaurant_id)
+
+
+def rename_menu_item(item_id: UUID, name: str):
+    if _index is not None:
+        _index.rename_menu_item(item_id, name)
+
+
+def unindex_menu_item(item_id: UUID):
+    if _index is not None:
+        _index.remove_menu_item(item_id)
@@ -0,0 +1,381 @@
+"""Memory-mapped columnar catalog of menu items for browse queries.
+
+Every menu item is denormalized with the menu and restaurant attributes that
+browse filters on, and written as one ``.npy`` file per column under
+``<catalog_dir>/<generation>/``. Workers map the files read-only, so the page
+cache holds a single copy for the whole host, and answer filter/sort queries
+with NumPy masks over whole columns instead of per-row ORM work.
+
+A background task in each worker keeps the catalog current. Whichever worker
+takes the file lock checks a cheap version of the three tables, rebuilds
+only if it changed, and publishes by replacing the ``CURRENT`` pointer. Readers
+reload when the pointer changes and report ``None`` (fall back to SQL) once the
+published data is older than ``max_staleness``.
+
+NumPy is optional: without it the catalog cannot be enabled and browse
+queries always go to SQL.
+"""
+import asyncio
+import fcntl
+import json
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from shared.database import get_database
+from shared.logging import get_logger
+from shared.pagination import Page, decode_cursor, encode_cursor, parse_sort
+
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+from app.models.restaurant import Restaurant
+from app.schemas.menu_item import MenuItemBrowseResult
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+logger = get_logger("restaurants.catalog")
+
+FORMAT_VERSION = 1
+POINTER = "CURRENT"
+LOCK = "build.lock"
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+# Sorts the catalog can answer with exactly the order (and cursors) of the SQL path.
+CATALOG_SORTS = {"price": (), "created_at": ()}
+
+
+def _micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // MICROSECOND
+
+
+def _uuid_parts(value: UUID) -> tuple[int, int]:
+    return int.from_bytes(value.bytes[:8], "big"), int.from_bytes(value.bytes[8:], "big")
+
+
+def _pack_uuids(values: list) -> "np.ndarray":
+    return np.frombuffer(b"".join(value.bytes for value in values), dtype=np.uint8).reshape(len(values), 16)
+
+
+def _pack_strings(values: list) -> tuple["np.ndarray", "np.ndarray"]:
+    encoded = [(value or "").encode() for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _load(path: str) -> "np.ndarray":
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # Zero-length arrays cannot be mapped.
+        return np.load(path)
+
+
+def table_version(session) -> list[str]:
+    """Row count and latest ``updated_at`` of each source table."""
+    version = []
+    for model in (Restaurant, Menu, MenuItem):
+        count, updated_at = session.execute(select(func.count(), func.max(model.updated_at)).select_from(model)).one()
+        version += [str(count), updated_at.isoformat() if updated_at else ""]
+    return version
+
+
+def _source_statement():
+    return (
+        select(
+            MenuItem.id,
+            MenuItem.menu_id,
+            Menu.restaurant_id,
+            Restaurant.owner_id,
+            MenuItem.name,
+            MenuItem.description,
+            MenuItem.price,
+            MenuItem.created_at,
+            MenuItem.updated_at,
+            Menu.kind,
+            Restaurant.rating,
+        )
+        .join(Menu, Menu.id == MenuItem.menu_id)
+        .join(Restaurant, Restaurant.id == Menu.restaurant_id)
+    )
+
+
+def _write_columns(directory: str, rows: list, version: list[str]):
+    ids = [row.id for row in rows]
+    price_cents = np.array([int(row.price.scaleb(2)) for row in rows], dtype=np.int64)
+    created_at = np.array([_micros(row.created_at) for row in rows], dtype=np.int64)
+    kinds = sorted({row.kind for row in rows})
+    kind_codes = {kind: code for code, kind in enumerate(kinds)}
+    uuids = _pack_uuids(ids)
+    id_parts = uuids.view(">u8")
+    columns = {
+        "id": uuids,
+        "menu_id": _pack_uuids([row.menu_id for row in rows]),
+        "restaurant_id": _pack_uuids([row.restaurant_id for row in rows]),
+        "owner_id": _pack_uuids([row.owner_id for row in rows]),
+        "price_cents": price_cents,
+        "created_at": created_at,
+        "updated_at": np.array([_micros(row.updated_at) for row in rows], dtype=np.int64),
+        "rating": np.array([np.nan if row.rating is None else row.rating for row in rows], dtype=np.float64),
+        "kind": np.array([kind_codes[row.kind] for row in rows], dtype=np.int32),
+        "description_null": np.array([row.description is None for row in rows], dtype=bool),
+        # Full (key, id) orderings, precomputed so a query is a mask and a gather.
+        "order_price": np.lexsort((id_parts[:, 1], id_parts[:, 0], price_cents)).astype(np.int64),
+        "order_created_at": np.lexsort((id_parts[:, 1], id_parts[:, 0], created_at)).astype(np.int64),
+    }
+    columns["name_offsets"], columns["name_data"] = _pack_strings([row.name for row in rows])
+    columns["description_offsets"], columns["description_data"] = _pack_strings([row.description for row in rows])
+    for name, array in columns.items():
+        np.save(os.path.join(directory, f"{name}.npy"), array)
+    meta = {"format": FORMAT_VERSION, "count": len(rows), "kinds": kinds, "version": version, "built_at": time.time()}
+    with open(os.path.join(directory, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+
+class CatalogSnapshot:
+    """One published generation, mapped read-only."""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        self.directory = directory
+        self.count = meta["count"]
+        self.version = meta["version"]
+        self.kinds = {kind: code for code, kind in enumerate(meta["kinds"])}
+        self.kind_names = meta["kinds"]
+        self.columns = {
+            name[:-4]: _load(os.path.join(directory, name)) for name in os.listdir(directory) if name.endswith(".npy")
+        }
+        self.id_parts = self.columns["id"].view(">u8")
+
+    def _uuid(self, column: str, index: int) -> UUID:
+        return UUID(bytes=self.columns[column][index].tobytes())
+
+    def _string(self, column: str, index: int) -> str:
+        offsets = self.columns[f"{column}_offsets"]
+        return self.columns[f"{column}_data"][offsets[index]:offsets[index + 1]].tobytes().decode()
+
+    def _uuid_mask(self, column: str, value: UUID) -> "np.ndarray":
+        high, low = _uuid_parts(value)
+        parts = self.columns[column].view(">u8")
+        return (parts[:, 0] == high) & (parts[:, 1] == low)
+
+    def _after_mask(self, key: "np.ndarray", after: list, descending: bool) -> "np.ndarray":
+        key_value, after_id = after
+        if isinstance(key_value, datetime):
+            key_value = _micros(key_value)
+        else:
+            key_value = int(Decimal(key_value).scaleb(2))
+        high, low = _uuid_parts(after_id)
+        if descending:
+            return (key < key_value) | ((key == key_value) & (
+                (self.id_parts[:, 0] < high) | ((self.id_parts[:, 0] == high) & (self.id_parts[:, 1] < low))
+            ))
+        return (key > key_value) | ((key == key_value) & (
+            (self.id_parts[:, 0] > high) | ((self.id_parts[:, 0] == high) & (self.id_parts[:, 1] > low))
+        ))
+
+    def _result(self, index: int) -> MenuItemBrowseResult:
+        columns = self.columns
+        return MenuItemBrowseResult(
+            id=self._uuid("id", index),
+            menu_id=self._uuid("menu_id", index),
+            name=self._string("name", index),
+            description=None if columns["description_null"][index] else self._string("description", index),
+            price=Decimal(int(columns["price_cents"][index])).scaleb(-2),
+            created_at=EPOCH + int(columns["created_at"][index]) * MICROSECOND,
+            updated_at=EPOCH + int(columns["updated_at"][index]) * MICROSECOND,
+            restaurant_id=self._uuid("restaurant_id", index),
+            menu_kind=self.kind_names[columns["kind"][index]],
+        )
+
+    def browse(
+        self,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        min_rating: Optional[float] = None,
+        menu_kind: Optional[str] = None,
+        owner_id: Optional[UUID] = None,
+        restaurant_id: Optional[UUID] = None,
+        sort: str = "price",
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Page[MenuItemBrowseResult]:
+        _, descending = parse_sort(sort, CATALOG_SORTS)
+        field = sort.lstrip("-")
+        columns = self.columns
+        mask = np.ones(self.count, dtype=bool)
+        # Prices are stored in cents; round the bounds inwards like Numeric(10, 2) comparisons.
+        if min_price is not None:
+            mask &= columns["price_cents"] >= int((min_price * 100).to_integral_value(rounding=ROUND_CEILING))
+        if max_price is not None:
+            mask &= columns["price_cents"] <= int((max_price * 100).to_integral_value(rounding=ROUND_FLOOR))
+        if min_rating is not None:
+            mask &= columns["rating"] >= min_rating
+        if menu_kind is not None:
+            if menu_kind not in self.kinds:
+                return Page(items=[], next_cursor=None, limit=limit)
+            mask &= columns["kind"] == self.kinds[menu_kind]
+        if owner_id is not None:
+            mask &= self._uuid_mask("owner_id", owner_id)
+        if restaurant_id is not None:
+            mask &= self._uuid_mask("restaurant_id", restaurant_id)
+        key = columns["price_cents"] if field == "price" else columns["created_at"]
+        if cursor:
+            mask &= self._after_mask(key, decode_cursor(cursor, sort), descending)
+
+        order = columns[f"order_{field}"]
+        if descending:
+            order = order[::-1]
+        positions = order[mask[order]][: limit + 1]
+        items = [self._result(int(index)) for index in positions[:limit]]
+        next_cursor = None
+        if len(positions) > limit:
+            last = items[-1]
+            next_cursor = encode_cursor(sort, (last.price if field == "price" else last.created_at, last.id))
+        return Page(items=items, next_cursor=next_cursor, limit=limit)
+
+
+class ColumnarCatalog:
+    def __init__(self, directory: str, refresh_interval: float = 30.0, max_staleness: float = 120.0):
+        if np is None:
+            raise RuntimeError("The columnar catalog requires numpy")
+        self.directory = directory
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._pointer_mtime: Optional[int] = None
+        self._verified_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _pointer_path(self) -> str:
+        return os.path.join(self.directory, POINTER)
+
+    def _published_version(self, generation: str) -> Optional[list]:
+        try:
+            with open(os.path.join(self.directory, generation, "meta.json")) as f:
+                return json.load(f)["version"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _read_pointer(self) -> Optional[dict]:
+        try:
+            with open(self._pointer_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_pointer(self, generation: str):
+        temporary = f"{self._pointer_path()}.{os.getpid()}"
+        with open(temporary, "w") as f:
+            json.dump({"generation": generation, "verified_at": time.time()}, f)
+        os.replace(temporary, self._pointer_path())
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """The published snapshot, or ``None`` if missing or too stale to serve."""
+        try:
+            mtime = os.stat(self._pointer_path()).st_mtime_ns
+        except OSError:
+            return None
+        if mtime != self._pointer_mtime:
+            pointer = self._read_pointer()
+            if pointer is None:
+                return None
+            if self._snapshot is None or os.path.basename(self._snapshot.directory) != pointer["generation"]:
+                try:
+                    self._snapshot = CatalogSnapshot(os.path.join(self.directory, pointer["generation"]))
+                except OSError:
+                    # Superseded and pruned between reading the pointer and mapping it.
+                    return None
+            self._verified_at = pointer["verified_at"]
+            self._pointer_mtime = mtime
+        if time.time() - self._verified_at > self.max_staleness:
+            return None
+        return self._snapshot
+
+    def refresh(self) -> bool:
+        """Rebuild if the source tables changed. Returns False if another worker holds the lock."""
+        with open(os.path.join(self.directory, LOCK), "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            with get_database().get_session(readonly=True) as session:
+                version = table_version(session)
+                pointer = self._read_pointer()
+                if pointer is not None and self._published_version(pointer["generation"]) == version:
+                    self._write_pointer(pointer["generation"])
+                    return True
+                rows = session.execute(_source_statement()).all()
+            generation = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+            staging = os.path.join(self.directory, f".{generation}")
+            os.makedirs(staging)
+            _write_columns(staging, rows, version)
+            os.rename(staging, os.path.join(self.directory, generation))
+            self._write_pointer(generation)
+            self._prune(keep={generation, pointer["generation"] if pointer else None})
+            logger.info("Catalog published", extra={"generation": generation, "items": len(rows)})
+            return True
+
+    def _prune(self, keep: set):
+        # Readers that still map an older generation keep their pages after the unlink.
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.isdir(path) and name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error("Catalog refresh failed", extra={"error": str(e)})
+            await asyncio.sleep(self.refresh_interval)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        snapshot = self.current()
+        return {
+            "serving": snapshot is not None,
+            "items": snapshot.count if snapshot else None,
+            "generation": os.path.basename(snapshot.directory) if snapshot else None,
+            "age_seconds": round(time.time() - self._verified_at, 1) if self._verified_at else None,
+        }
+
+
+_catalog: Optional[ColumnarCatalog] = None
+
+
+def init_catalog(catalog: ColumnarCatalog) -> ColumnarCatalog:
+    global _catalog
+    _catalog = catalog
+    return _catalog
+
+
+def get_catalog() -> Optional[ColumnarCatalog]:
+    return _catalog
@@ -1,85 +1,80 @@
-from typing import Optional
+from typing import Generator
 from uuid import UUID
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+from sqlalchemy.orm import Session
+from shared.database import get_database
 from shared.logging import get_logger
-from app.config import settings
+from app.auth import Principal, authenticate
+from app.services.restaurant_service import RestaurantService
+from app.services.menu_service import MenuService
+from app.services.menu_item_service import MenuItemService
+from app.services.menu_snapshot_service import MenuSnapshotService
+from app.services.search_service import SearchService
+from app.services.browse_service import BrowseService
 
 logger = get_logger("restaurants.dependencies")
 
 security = HTTPBearer()
 
+READ_ONLY_METHODS = ("GET", "HEAD")
+# POST only because the id list does not fit in a query string; still a read.
+READ_ONLY_PATH_SUFFIXES = ("/batch-get",)
 
-def decode_access_token(token: str) -> Optional[dict]:
-    try:
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
-        if payload.get("type") != "access":
-            return None
-        return payload
-    except JWTError:
-        return None
 
+def get_db_session(request: Request) -> Generator[Session, None, None]:
+    # One session per request, shared by every service the route depends on.
+    readonly = request.method in READ_ONLY_METHODS or request.url.path.endswith(READ_ONLY_PATH_SUFFIXES)
+    with get_database().unit_of_work(readonly=readonly) as session:
+        yield session
+
+
+def get_restaurant_service(session: Session = Depends(get_db_session)) -> RestaurantService:
+    return RestaurantService(session)
+
+
+def get_menu_service(session: Session = Depends(get_db_session)) -> MenuService:
+    return MenuService(session)
 
-async def get_current_user_id(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> UUID:
-    token = credentials.credentials
-    payload = decode_access_token(token)
-    if not payload:
-        logger.warning("Invalid access token in request")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    sub = payload.get("sub")
-    if not sub:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    try:
-        return UUID(sub)
-    except (ValueError, TypeError):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
 
+def get_menu_item_service(session: Session = Depends(get_db_session)) -> MenuItemService:
+    return MenuItemService(session)
 
-async def require_restaurant_owner(
+
+def get_menu_snapshot_service(session: Session = Depends(get_db_session)) -> MenuSnapshotService:
+    return MenuSnapshotService(session)
+
+
+def get_search_service(session: Session = Depends(get_db_session)) -> SearchService:
+    return SearchService(session)
+
+
+def get_browse_service(session: Session = Depends(get_db_session)) -> BrowseService:
+    return BrowseService(session)
+
+
+async def get_principal(
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> UUID:
-    token = credentials.credentials
-    payload = decode_access_token(token)
-    if not payload:
+) -> Principal:
+    principal = authenticate(credentials.credentials)
+    if principal is None:
         logger.warning("Invalid access token in request")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    sub = payload.get("sub")
-    role = payload.get("role")
-    if role != "restaurant_owner":
+    return principal
+
+
+async def get_current_user_id(principal: Principal = Depends(get_principal)) -> UUID:
+    return principal.user_id
+
+
+async def require_restaurant_owner(principal: Principal = Depends(get_principal)) -> UUID:
+    if principal.role != "restaurant_owner":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Restaurant owner role required",
         )
-    if not sub:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    try:
-        return UUID(sub)
-    except (ValueError, TypeError):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return principal.user_id
@@ -0,0 +1,83 @@
+"""Fill in restaurant coordinates and geohash cells for existing rows.
+
+Rows with latitude/longitude but no geohash get their cell computed. Rows
+without coordinates get them from ``location`` when it holds a
+``"lat, lon"`` pair; free-text addresses need geocoding and are left alone.
+Safe to re-run: it only visits rows whose geohash is still NULL.
+
+Run from ``backend/services/restaurants``:
+
+    PYTHONPATH=.:../.. python -m app.jobs.backfill_locations [--dry-run]
+"""
+import argparse
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+
+from shared import geo
+from shared.database import init_database, get_database
+from shared.logging import setup_logging
+
+from app.config import settings
+from app.models.restaurant import Restaurant
+
+logger = setup_logging(service_name="restaurants-backfill-locations", log_level="INFO")
+
+COORDINATES = re.compile(r"^\s*(-?\d{1,3}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*$")
+
+
+def parse_coordinates(location: Optional[str]) -> Optional[Tuple[float, float]]:
+    match = COORDINATES.match(location or "")
+    if not match:
+        return None
+    latitude, longitude = float(match.group(1)), float(match.group(2))
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+
+def backfill(batch_size: int, dry_run: bool = False) -> dict:
+    db = get_database()
+    counts = {"scanned": 0, "located": 0, "skipped": 0}
+    last_id = None
+    while True:
+        # Keyset over id, one transaction per batch, so the job never holds
+        # locks on more than batch_size rows and can be interrupted at any point.
+        statement = select(Restaurant).where(Restaurant.geohash.is_(None)).order_by(Restaurant.id).limit(batch_size)
+        if last_id is not None:
+            statement = statement.where(Restaurant.id > last_id)
+        with db.get_session() as session:
+            restaurants = session.scalars(statement).all()
+            if not restaurants:
+                break
+            for restaurant in restaurants:
+                counts["scanned"] += 1
+                if restaurant.latitude is None or restaurant.longitude is None:
+                    coordinates = parse_coordinates(restaurant.location)
+                    if coordinates is None:
+                        counts["skipped"] += 1
+                        continue
+                    restaurant.latitude, restaurant.longitude = coordinates
+                restaurant.geohash = geo.encode(restaurant.latitude, restaurant.longitude)
+                counts["located"] += 1
+            last_id = restaurants[-1].id
+            if dry_run:
+                session.rollback()
+        logger.info("Backfill batch done", extra={**counts, "last_id": str(last_id)})
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=settings.location_backfill_batch_size)
+    parser.add_argument("--dry-run", action="store_true", help="compute everything, commit nothing")
+    args = parser.parse_args()
+
+    init_database(settings.database_url)
+    counts = backfill(args.batch_size, args.dry_run)
+    logger.info("Location backfill finished", extra={**counts, "dry_run": args.dry_run})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Publish a menu snapshot for every restaurant that has none.
+
+Snapshots are published by restaurant, menu and menu item writes; restaurants
+last written before snapshots existed have none, and the snapshot endpoint
+answers 404 for them until this job has run. Safe to re-run: it only visits
+restaurants without a snapshot.
+
+Run from ``backend/services/restaurants``:
+
+    PYTHONPATH=.:../.. python -m app.jobs.backfill_menu_snapshots [--dry-run]
+"""
+import argparse
+
+from sqlalchemy import exists, select
+
+from shared.database import init_database, get_database
+from shared.logging import setup_logging
+
+from app.config import settings
+from app.models.restaurant import Restaurant
+from app.models.menu_snapshot import MenuSnapshot
+from app.services.menu_snapshot_service import publish_menu_snapshot
+
+logger = setup_logging(service_name="restaurants-backfill-menu-snapshots", log_level="INFO")
+
+
+def backfill(batch_size: int, dry_run: bool = False) -> dict:
+    db = get_database()
+    counts = {"published": 0}
+    last_id = None
+    while True:
+        # Keyset over id, one transaction per batch: publishing locks each
+        # restaurant row, so a batch never holds more than batch_size of them.
+        statement = (
+            select(Restaurant.id)
+            .where(~exists().where(MenuSnapshot.restaurant_id == Restaurant.id))
+            .order_by(Restaurant.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            statement = statement.where(Restaurant.id > last_id)
+        with db.get_session() as session:
+            restaurant_ids = session.scalars(statement).all()
+            if not restaurant_ids:
+                break
+            for restaurant_id in restaurant_ids:
+                if publish_menu_snapshot(session, restaurant_id) is not None:
+                    counts["published"] += 1
+            last_id = restaurant_ids[-1]
+            if dry_run:
+                session.rollback()
+        logger.info("Backfill batch done", extra={**counts, "last_id": str(last_id)})
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=settings.menu_snapshot_backfill_batch_size)
+    parser.add_argument("--dry-run", action="store_true", help="build every snapshot, commit nothing")
+    args = parser.parse_args()
+
+    init_database(settings.database_url)
+    counts = backfill(args.batch_size, args.dry_run)
+    logger.info("Menu snapshot backfill finished", extra={**counts, "dry_run": args.dry_run})
+
+
+if __name__ == "__main__":
+    main()
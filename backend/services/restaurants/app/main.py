@@ -1,13 +1,22 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from shared.logging import setup_logging, get_logger
+from shared.cache import LRUCache, SizedLRUCache, init_cache
 from shared.database import init_database, get_database
 from shared.exceptions import BitezException
+from shared.health import init_health_monitor, get_health_monitor
+from shared.metrics import collect_metrics, register_metrics
+from shared.middleware import ConsistencyKeyMiddleware, QueryStatsMiddleware
+from app.auth import TokenCache, init_token_cache
+from app.autocomplete import AutocompleteRebuilder
+from app.catalog import ColumnarCatalog, init_catalog, get_catalog
 from app.config import settings
-from app.routes import restaurants, menus, menu_items
+from app.services.menu_snapshot_service import init_snapshot_cache, snapshot_size
+from app.routes import restaurants, menus, menu_items, menu_snapshots, search, browse, autocomplete, batch
 
 logger = setup_logging(
     service_name="restaurants-service",
@@ -28,7 +37,11 @@ async def lifespan(app: FastAPI):
             pool_size=10,
             max_overflow=20,
             pool_pre_ping=True,
-            echo=settings.debug
+            echo=settings.debug,
+            slow_query_threshold=settings.slow_query_threshold_ms / 1000,
+            replica_urls=settings.replica_urls,
+            replica_retry_interval=settings.database_replica_retry_interval,
+            read_your_writes_window=settings.read_your_writes_window
         )
         db = get_database()
         if db.health_check():
@@ -39,7 +52,52 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error("Failed to initialize database", extra={"error": str(e)})
         raise
+    if settings.entity_cache_enabled:
+        cache = init_cache(LRUCache(max_size=settings.entity_cache_max_size, ttl=settings.entity_cache_ttl))
+        register_metrics("cache", cache.snapshot)
+    snapshot_cache = init_snapshot_cache(SizedLRUCache(
+        max_bytes=settings.menu_snapshot_cache_max_bytes,
+        size_of=snapshot_size
+    ))
+    register_metrics("menu_snapshot_cache", snapshot_cache.snapshot)
+    if settings.token_cache_enabled:
+        token_cache = init_token_cache(TokenCache(
+            max_size=settings.token_cache_max_size,
+            max_ttl=settings.token_cache_max_ttl
+        ))
+        register_metrics("token_cache", token_cache.stats)
+    autocomplete_rebuilder = None
+    if settings.autocomplete_enabled:
+        # Built before serving; from here on the services keep it current and
+        # the rebuilder catches writes made outside this process.
+        autocomplete_rebuilder = AutocompleteRebuilder(
+            max_limit=settings.autocomplete_max_limit,
+            interval=settings.autocomplete_rebuild_interval,
+            max_age=settings.autocomplete_max_age
+        )
+        await asyncio.to_thread(autocomplete_rebuilder.rebuild)
+        register_metrics("autocomplete", autocomplete_rebuilder.stats)
+        await autocomplete_rebuilder.start()
+    if settings.catalog_enabled:
+        catalog = init_catalog(ColumnarCatalog(
+            settings.catalog_dir,
+            refresh_interval=settings.catalog_refresh_interval,
+            max_staleness=settings.catalog_max_staleness
+        ))
+        register_metrics("catalog", catalog.stats)
+        await catalog.start()
+    health_monitor = init_health_monitor(
+        settings.database_url,
+        interval=settings.health_check_interval,
+        timeout=settings.health_check_timeout
+    )
+    await health_monitor.start()
     yield
+    await health_monitor.stop()
+    if autocomplete_rebuilder is not None:
+        await autocomplete_rebuilder.stop()
+    if get_catalog() is not None:
+        await get_catalog().stop()
     logger.info("Restaurants service shutting down")
 
 
@@ -61,6 +119,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ConsistencyKeyMiddleware)
+app.add_middleware(
+    QueryStatsMiddleware,
+    statement_budget=settings.sql_statement_budget,
+    repeated_statement_threshold=settings.sql_repeated_statement_threshold
+)
 
 
 @app.exception_handler(BitezException)
@@ -91,6 +155,11 @@ async def general_exception_handler(request, exc: Exception):
 app.include_router(restaurants.router)
 app.include_router(menus.router)
 app.include_router(menu_items.router)
+app.include_router(menu_snapshots.router)
+app.include_router(search.router)
+app.include_router(browse.router)
+app.include_router(autocomplete.router)
+app.include_router(batch.router)
 
 
 @app.get("/")
@@ -105,23 +174,28 @@ async def root():
 
 @app.get("/health")
 async def health():
-    db = get_database()
-    db_healthy = db.health_check()
+    monitor = get_health_monitor()
+    db_healthy = monitor.is_healthy("database")
     return {
-        "status": "healthy" if db_healthy else "unhealthy",
+        "status": "healthy" if monitor.all_healthy() else "unhealthy",
         "service": "restaurants",
-        "database": "connected" if db_healthy else "disconnected"
+        "database": "connected" if db_healthy else "disconnected",
+        "checks": monitor.status()
     }
 
 
 @app.get("/health/ready")
 async def readiness():
-    db = get_database()
-    db_ready = db.health_check()
-    if not db_ready:
+    monitor = get_health_monitor()
+    if not monitor.all_healthy():
         return JSONResponse(
             status_code=503,
-            content={"status": "not ready", "service": "restaurants", "database": "not connected"}
+            content={
+                "status": "not ready",
+                "service": "restaurants",
+                "database": "connected" if monitor.is_healthy("database") else "not connected",
+                "checks": monitor.status()
+            }
         )
     return {"status": "ready", "service": "restaurants"}
 
@@ -129,3 +203,8 @@ async def readiness():
 @app.get("/health/live")
 async def liveness():
     return {"status": "alive", "service": "restaurants"}
+
+
+@app.get("/metrics")
+async def metrics():
+    return {"service": "restaurants", **collect_metrics()}
@@ -1,5 +1,6 @@
 from app.models.restaurant import Restaurant
 from app.models.menu import Menu
 from app.models.menu_item import MenuItem
+from app.models.menu_snapshot import MenuSnapshot
 
-__all__ = ["Restaurant", "Menu", "MenuItem"]
+__all__ = ["Restaurant", "Menu", "MenuItem", "MenuSnapshot"]
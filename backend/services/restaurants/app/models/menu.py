@@ -1,5 +1,5 @@
 from uuid import uuid4
-from sqlalchemy import Column, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from shared.database import Base
@@ -7,9 +7,14 @@ from shared.database import Base
 
 class Menu(Base):
     __tablename__ = "menus"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_menus_restaurant_id_created_at_id", "restaurant_id", "created_at", "id"),
+        Index("ix_menus_restaurant_id_kind_id", "restaurant_id", "kind", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4, index=True)
-    restaurant_id = Column(UUID(as_uuid=True), ForeignKey("restaurants.id", ondelete="CASCADE"), nullable=False, index=True)
+    restaurant_id = Column(UUID(as_uuid=True), ForeignKey("restaurants.id", ondelete="CASCADE"), nullable=False)
     kind = Column(String(100), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,19 +1,45 @@
 from uuid import uuid4
-from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, String, Numeric, DateTime, ForeignKey, Index, Text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
+from sqlalchemy.schema import CreateColumn
 from shared.database import Base
 
+# 'simple' keeps the index language-neutral: no stemming or stop words.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
 
 class MenuItem(Base):
     __tablename__ = "menu_items"
+    # search_vector is only queried through the table (see search_service);
+    # mapped, eager_defaults would fetch it back after every insert and update.
+    __mapper_args__ = {"eager_defaults": True, "exclude_properties": ["search_vector"]}
+    __table_args__ = (
+        Index("ix_menu_items_menu_id_created_at_id", "menu_id", "created_at", "id"),
+        Index("ix_menu_items_menu_id_name_id", "menu_id", "name", "id"),
+        Index("ix_menu_items_menu_id_price_id", "menu_id", "price", "id"),
+        Index("ix_menu_items_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4, index=True)
-    menu_id = Column(UUID(as_uuid=True), ForeignKey("menus.id", ondelete="CASCADE"), nullable=False, index=True)
+    menu_id = Column(UUID(as_uuid=True), ForeignKey("menus.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     price = Column(Numeric(10, 2), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), info={"postgresql_only": True})
 
     menu = relationship("Menu", back_populates="items")
+
+
+@compiles(CreateColumn, "sqlite")
+def _skip_postgresql_only_columns(element, compiler, **kw):
+    # SQLite test databases get the table without Postgres-only columns.
+    if element.element.info.get("postgresql_only"):
+        return None
+    return compiler.visit_create_column(element, **kw)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, LargeBinary, func
+from sqlalchemy.dialects.postgresql import UUID
+from shared.database import Base
+
+
+class MenuSnapshot(Base):
+    __tablename__ = "menu_snapshots"
+    __table_args__ = (
+        Index("ix_menu_snapshots_restaurant_id_published_at", "restaurant_id", "published_at"),
+    )
+
+    content_hash = Column(String(64), primary_key=True)
+    restaurant_id = Column(UUID(as_uuid=True), ForeignKey("restaurants.id", ondelete="CASCADE"), nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    body_gzip = Column(LargeBinary, nullable=False)
+    published_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
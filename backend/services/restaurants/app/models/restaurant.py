@@ -1,5 +1,5 @@
 from uuid import uuid4
-from sqlalchemy import Column, String, Float, DateTime, func
+from sqlalchemy import Column, String, Float, DateTime, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from shared.database import Base
@@ -7,12 +7,24 @@ from shared.database import Base
 
 class Restaurant(Base):
     __tablename__ = "restaurants"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_restaurants_created_at_id", "created_at", "id"),
+        Index("ix_restaurants_name_id", "name", "id"),
+        Index("ix_restaurants_rating_id", text("coalesce(rating, -1)"), "id"),
+        Index("ix_restaurants_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        # Prefix (LIKE 'abc%') scans over geohash cells, independent of the database collation.
+        Index("ix_restaurants_geohash", "geohash", postgresql_ops={"geohash": "text_pattern_ops"}),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4, index=True)
-    owner_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    owner_id = Column(UUID(as_uuid=True), nullable=False)
     name = Column(String(255), nullable=False)
     location = Column(String(500), nullable=True)
     rating = Column(Float, nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
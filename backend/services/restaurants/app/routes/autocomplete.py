@@ -0,0 +1,25 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Query, status
+from shared.logging import get_logger
+from shared.responses import ModelResponse
+
+from app.autocomplete import get_autocomplete
+from app.schemas.autocomplete import AutocompleteSuggestion
+from app.config import settings
+
+logger = get_logger("restaurants.autocomplete_routes")
+
+router = APIRouter(prefix="/autocomplete", tags=["autocomplete"])
+
+
+@router.get("", response_model=list[AutocompleteSuggestion])
+def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix; every word is matched at word starts"),
+    kind: Optional[Literal["restaurant", "menu_item"]] = Query(None),
+    limit: int = Query(10, ge=1, le=settings.autocomplete_max_limit),
+):
+    """Restaurant and dish names starting with ``q``, best rated first."""
+    index = get_autocomplete()
+    if index is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Autocomplete is not available")
+    return ModelResponse(index.suggest(q, kind, limit))
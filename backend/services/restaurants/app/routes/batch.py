@@ -0,0 +1,63 @@
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, status, Depends
+from shared.logging import get_logger
+from shared.responses import ModelResponse
+
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
+from app.schemas.restaurant import RestaurantResponse
+from app.schemas.menu import MenuResponse
+from app.schemas.menu_item import MenuItemResponse
+from app.services.restaurant_service import RestaurantService
+from app.services.menu_service import MenuService
+from app.services.menu_item_service import MenuItemService
+from app.dependencies import get_restaurant_service, get_menu_service, get_menu_item_service
+from app.config import settings
+
+logger = get_logger("restaurants.batch")
+
+router = APIRouter(tags=["batch"])
+
+
+def _requested_ids(data: BatchGetRequest) -> list[UUID]:
+    ids = list(dict.fromkeys(data.ids))
+    if len(ids) > settings.batch_get_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.batch_get_max_ids} ids per request",
+        )
+    return ids
+
+
+def _batch_response(ids: list[UUID], found: dict) -> ModelResponse:
+    return ModelResponse(BatchGetResponse(
+        items=[found[entity_id] for entity_id in ids if entity_id in found],
+        missing=[entity_id for entity_id in ids if entity_id not in found],
+    ))
+
+
+@router.post("/restaurants/batch-get", response_model=BatchGetResponse[RestaurantResponse])
+def batch_get_restaurants(
+    data: BatchGetRequest,
+    service: RestaurantService = Depends(get_restaurant_service),
+):
+    """Restaurants for up to ``BATCH_GET_MAX_IDS`` ids in one query, in request order."""
+    ids = _requested_ids(data)
+    return _batch_response(ids, service.get_many(ids))
+
+
+@router.post("/menus/batch-get", response_model=BatchGetResponse[MenuResponse])
+def batch_get_menus(
+    data: BatchGetRequest,
+    service: MenuService = Depends(get_menu_service),
+):
+    ids = _requested_ids(data)
+    return _batch_response(ids, service.get_many(ids))
+
+
+@router.post("/menu-items/batch-get", response_model=BatchGetResponse[MenuItemResponse])
+def batch_get_menu_items(
+    data: BatchGetRequest,
+    service: MenuItemService = Depends(get_menu_item_service),
+):
+    ids = _requested_ids(data)
+    return _batch_response(ids, service.get_many(ids))
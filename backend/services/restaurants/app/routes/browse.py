@@ -0,0 +1,44 @@
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Query, Depends
+from shared.logging import get_logger
+from shared.responses import ModelResponse
+from shared.pagination import Page
+
+from app.schemas.menu_item import MenuItemBrowseResult
+from app.services.browse_service import BrowseService
+from app.dependencies import get_browse_service
+from app.config import settings
+
+logger = get_logger("restaurants.browse")
+
+router = APIRouter(prefix="/browse", tags=["browse"])
+
+
+@router.get("/menu-items", response_model=Page[MenuItemBrowseResult])
+def browse_menu_items(
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    min_rating: Optional[float] = Query(None, ge=0, le=5, description="Minimum restaurant rating"),
+    menu_kind: Optional[str] = Query(None, max_length=100),
+    owner_id: Optional[UUID] = Query(None),
+    restaurant_id: Optional[UUID] = Query(None),
+    sort: str = Query("price", description="price or created_at; prefix with - for descending order"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    service: BrowseService = Depends(get_browse_service),
+):
+    """Menu items across all restaurants, filtered by item, menu and restaurant attributes."""
+    page = service.browse_menu_items(
+        min_price=min_price,
+        max_price=max_price,
+        min_rating=min_rating,
+        menu_kind=menu_kind,
+        owner_id=owner_id,
+        restaurant_id=restaurant_id,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+    )
+    return ModelResponse(page)
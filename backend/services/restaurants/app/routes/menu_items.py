@@ -1,17 +1,27 @@
+import json
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError as PydanticValidationError
 from shared.logging import get_logger
+from shared.conditional import is_conditional, is_not_modified, make_etag, not_modified, page_etag, set_validators
 from shared.exceptions import NotFoundError, DatabaseError
+from shared.responses import ModelResponse
+from shared.pagination import Page
 
-from app.schemas.menu_item import MenuItemCreate, MenuItemUpdate, MenuItemResponse, MenuItemsBulkCreate
+from app.schemas.menu_item import MenuItemCreate, MenuItemUpdate, MenuItemResponse
 from app.services.menu_item_service import MenuItemService
 from app.services.menu_service import MenuService
-from app.dependencies import require_restaurant_owner
+from app.dependencies import get_menu_item_service, get_menu_service, require_restaurant_owner
+from app.config import settings
 
 logger = get_logger("restaurants.menu_items")
 
 router = APIRouter(prefix="/restaurants/{restaurant_id}/menus/{menu_id}/items", tags=["menu_items"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 @router.post("", response_model=MenuItemResponse, status_code=status.HTTP_201_CREATED)
 def create_menu_item(
@@ -19,8 +29,8 @@ def create_menu_item(
     menu_id: UUID,
     data: MenuItemCreate,
     owner_id: UUID = Depends(require_restaurant_owner),
-    item_service: MenuItemService = Depends(lambda: MenuItemService()),
-    menu_service: MenuService = Depends(lambda: MenuService()),
+    item_service: MenuItemService = Depends(get_menu_item_service),
+    menu_service: MenuService = Depends(get_menu_service),
 ):
     menu = menu_service.get_by_id(menu_id)
     if not menu or menu.restaurant_id != restaurant_id:
@@ -32,36 +42,169 @@ def create_menu_item(
     except DatabaseError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=e.message)
 
-@router.post("/bulk", response_model=list[MenuItemResponse], status_code=status.HTTP_201_CREATED)
-def create_menu_items_bulk(
+@router.post(
+    "/bulk",
+    response_model=list[MenuItemResponse],
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["items"],
+                        "properties": {
+                            "items": {"type": "array", "items": {"$ref": "#/components/schemas/MenuItemCreate"}}
+                        },
+                    }
+                },
+                NDJSON_MEDIA_TYPE: {"schema": {"$ref": "#/components/schemas/MenuItemCreate"}},
+            },
+        }
+    },
+)
+async def create_menu_items_bulk(
     restaurant_id: UUID,
     menu_id: UUID,
-    data: MenuItemsBulkCreate,
+    request: Request,
     owner_id: UUID = Depends(require_restaurant_owner),
-    item_service: MenuItemService = Depends(lambda: MenuItemService()),
-    menu_service: MenuService = Depends(lambda: MenuService()),
+    item_service: MenuItemService = Depends(get_menu_item_service),
+    menu_service: MenuService = Depends(get_menu_service),
 ):
-    menu = menu_service.get_by_id(menu_id)
+    """Create many items in one transaction.
+
+    Accepts either ``{"items": [...]}`` as JSON or one item per line as
+    ``application/x-ndjson``, which is parsed as it streams in; a line longer
+    than ``BULK_INSERT_MAX_LINE_BYTES`` is rejected with 413. Every row is
+    validated before anything is written; failures are reported per row.
+    """
+    menu = await run_in_threadpool(menu_service.get_by_id, menu_id)
     if not menu or menu.restaurant_id != restaurant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu not found")
+
+    items, errors = await _read_bulk_items(request)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": "Invalid menu items", "errors": errors},
+        )
+    if not items:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="No menu items supplied")
     try:
-        return item_service.create_many(menu_id, owner_id, data.items)
+        created = await run_in_threadpool(
+            item_service.create_many, menu_id, owner_id, items, settings.bulk_insert_batch_size
+        )
+        return ModelResponse(created, status_code=status.HTTP_201_CREATED)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
     except DatabaseError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=e.message)
 
-@router.get("", response_model=list[MenuItemResponse])
+
+def _line_too_long() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"NDJSON lines are limited to {settings.bulk_insert_max_line_bytes} bytes",
+    )
+
+
+async def _iter_ndjson(request: Request):
+    """Non-blank lines of an NDJSON body, each scanned for its newline once."""
+    max_line = settings.bulk_insert_max_line_bytes
+    buffer = bytearray()
+    async for chunk in request.stream():
+        start = 0
+        scanned = len(buffer)
+        buffer += chunk
+        while True:
+            end = buffer.find(b"\n", scanned)
+            if end == -1:
+                break
+            if end - start > max_line:
+                raise _line_too_long()
+            line = bytes(buffer[start:end])
+            if line.strip():
+                yield line
+            start = scanned = end + 1
+        del buffer[:start]
+        if len(buffer) > max_line:
+            raise _line_too_long()
+    if buffer.strip():
+        yield bytes(buffer)
+
+
+def _add_item(items: list[MenuItemCreate], errors: list[dict], index: int, raw) -> bool:
+    """Validate one row into ``items`` or ``errors``; False once the item limit is reached."""
+    if index >= settings.bulk_insert_max_items:
+        errors.append({"index": index, "errors": [
+            {"type": "too_many_items", "msg": f"At most {settings.bulk_insert_max_items} items per request"}
+        ]})
+        return False
+    try:
+        items.append(MenuItemCreate.model_validate(raw))
+    except PydanticValidationError as e:
+        errors.append({"index": index, "errors": e.errors(include_url=False, include_input=False)})
+    return True
+
+
+def _parse_json_items(body: bytes) -> tuple[list[MenuItemCreate], list[dict]]:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+    rows = payload.get("items") if isinstance(payload, dict) else None
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Body must be {\"items\": [...]}")
+    items: list[MenuItemCreate] = []
+    errors: list[dict] = []
+    for index, raw in enumerate(rows):
+        if not _add_item(items, errors, index, raw):
+            break
+    return items, errors
+
+
+async def _read_bulk_items(request: Request) -> tuple[list[MenuItemCreate], list[dict]]:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type != NDJSON_MEDIA_TYPE:
+        # A whole JSON body is parsed and validated in one go, off the event loop.
+        return await run_in_threadpool(_parse_json_items, await request.body())
+
+    items: list[MenuItemCreate] = []
+    errors: list[dict] = []
+    index = 0
+    async for line in _iter_ndjson(request):
+        try:
+            raw = json.loads(line)
+        except ValueError:
+            errors.append({"index": index, "errors": [{"type": "json_invalid", "msg": "Invalid JSON"}]})
+            index += 1
+            continue
+        if not _add_item(items, errors, index, raw):
+            break
+        index += 1
+    return items, errors
+
+
+@router.get("", response_model=Page[MenuItemResponse])
 def list_menu_items(
     restaurant_id: UUID,
     menu_id: UUID,
-    item_service: MenuItemService = Depends(lambda: MenuItemService()),
-    menu_service: MenuService = Depends(lambda: MenuService()),
+    request: Request,
+    sort: str = Query("created_at", description="created_at, name or price; prefix with - for descending order"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    item_service: MenuItemService = Depends(get_menu_item_service),
+    menu_service: MenuService = Depends(get_menu_service),
 ):
     menu = menu_service.get_by_id(menu_id)
     if not menu or menu.restaurant_id != restaurant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu not found")
-    return item_service.list_by_menu(menu_id)
+    rows = item_service.list_by_menu(menu_id, sort=sort, cursor=cursor, limit=limit)
+    etag = page_etag(rows, "menu_items", menu_id, sort, cursor, limit)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return set_validators(ModelResponse(rows.to_page(MenuItemResponse.model_validate)), etag)
 
 
 @router.get("/{item_id}", response_model=MenuItemResponse)
@@ -69,16 +212,24 @@ def get_menu_item(
     restaurant_id: UUID,
     menu_id: UUID,
     item_id: UUID,
-    item_service: MenuItemService = Depends(lambda: MenuItemService()),
-    menu_service: MenuService = Depends(lambda: MenuService()),
+    request: Request,
+    item_service: MenuItemService = Depends(get_menu_item_service),
+    menu_service: MenuService = Depends(get_menu_service),
 ):
     menu = menu_service.get_by_id(menu_id)
     if not menu or menu.restaurant_id != restaurant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu not found")
+    if is_conditional(request):
+        version = item_service.get_version(item_id)
+        if version is not None and version.menu_id == menu_id:
+            etag = make_etag("menu_item", version.id, version.updated_at)
+            if is_not_modified(request, etag, version.updated_at):
+                return not_modified(etag, version.updated_at)
     item = item_service.get_by_id(item_id)
     if not item or item.menu_id != menu_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu item not found")
-    return item
+    etag = make_etag("menu_item", item.id, item.updated_at)
+    return set_validators(ModelResponse(item), etag, item.updated_at)
 
 
 @router.put("/{item_id}", response_model=MenuItemResponse)
@@ -88,8 +239,8 @@ def update_menu_item(
     item_id: UUID,
     data: MenuItemUpdate,
     owner_id: UUID = Depends(require_restaurant_owner),
-    item_service: MenuItemService = Depends(lambda: MenuItemService()),
-    menu_service: MenuService = Depends(lambda: MenuService()),
+    item_service: MenuItemService = Depends(get_menu_item_service),
+    menu_service: MenuService = Depends(get_menu_service),
 ):
     menu = menu_service.get_by_id(menu_id)
     if not menu or menu.restaurant_id != restaurant_id:
@@ -108,8 +259,8 @@ def delete_menu_item(
     menu_id: UUID,
     item_id: UUID,
     owner_id: UUID = Depends(require_restaurant_owner),
-    item_service: MenuItemService = Depends(lambda: MenuItemService()),
-    menu_service: MenuService = Depends(lambda: MenuService()),
+    item_service: MenuItemService = Depends(get_menu_item_service),
+    menu_service: MenuService = Depends(get_menu_service),
 ):
     menu = menu_service.get_by_id(menu_id)
     if not menu or menu.restaurant_id != restaurant_id:
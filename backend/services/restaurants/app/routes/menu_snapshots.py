@@ -0,0 +1,88 @@
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, Path, Request, Response, status, Depends
+from shared.conditional import is_not_modified, not_modified
+from shared.logging import get_logger
+
+from app.services.menu_snapshot_service import MenuSnapshotService
+from app.dependencies import get_menu_snapshot_service
+
+logger = get_logger("restaurants.menu_snapshots")
+
+router = APIRouter(tags=["menu_snapshots"])
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether gzip has a non-zero q-value, by name or through ``*`` (RFC 9110 12.5.3)."""
+    wildcard = False
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        name = name.strip().lower()
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name in ("gzip", "x-gzip"):
+            return quality > 0
+        if name == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+def _snapshot_response(request: Request, snapshot: tuple[bytes, bytes], headers: dict) -> Response:
+    body, body_gzip = snapshot
+    headers = {**headers, "Vary": "Accept-Encoding"}
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        body = body_gzip
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/restaurants/{restaurant_id}/menu-snapshot")
+def get_current_menu_snapshot(
+    restaurant_id: UUID,
+    request: Request,
+    service: MenuSnapshotService = Depends(get_menu_snapshot_service),
+):
+    """Latest published menus of a restaurant; revalidate with the ETag."""
+    content_hash = service.get_current_hash(restaurant_id)
+    if content_hash is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu snapshot not found")
+    etag = f'"{content_hash}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Content-Location": f"/menu-snapshots/{content_hash}",
+    }
+    if is_not_modified(request, etag):
+        response = not_modified(etag)
+        response.headers.update(headers)
+        return response
+    snapshot = service.get_snapshot(content_hash)
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu snapshot not found")
+    return _snapshot_response(request, snapshot, headers)
+
+
+@router.get("/menu-snapshots/{content_hash}")
+def get_menu_snapshot(
+    request: Request,
+    content_hash: str = Path(..., pattern="^[0-9a-f]{64}$"),
+    service: MenuSnapshotService = Depends(get_menu_snapshot_service),
+):
+    """A published snapshot by content hash; its body never changes."""
+    etag = f'"{content_hash}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE}
+    if is_not_modified(request, etag):
+        response = not_modified(etag)
+        response.headers.update(headers)
+        return response
+    snapshot = service.get_snapshot(content_hash)
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu snapshot not found")
+    return _snapshot_response(request, snapshot, headers)
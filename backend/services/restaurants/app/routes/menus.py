@@ -1,11 +1,16 @@
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
 from shared.logging import get_logger
+from shared.conditional import is_conditional, is_not_modified, make_etag, not_modified, page_etag, set_validators
 from shared.exceptions import NotFoundError, DatabaseError
+from shared.responses import ModelResponse
+from shared.pagination import Page
 
 from app.schemas.menu import MenuCreate, MenuUpdate, MenuResponse
 from app.services.menu_service import MenuService
-from app.dependencies import require_restaurant_owner
+from app.dependencies import get_menu_service, require_restaurant_owner
+from app.config import settings
 
 logger = get_logger("restaurants.menus")
 
@@ -17,7 +22,7 @@ def create_menu(
     restaurant_id: UUID,
     data: MenuCreate,
     owner_id: UUID = Depends(require_restaurant_owner),
-    service: MenuService = Depends(lambda: MenuService()),
+    service: MenuService = Depends(get_menu_service),
 ):
     try:
         return service.create(restaurant_id, owner_id, data)
@@ -27,24 +32,40 @@ def create_menu(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=e.message)
 
 
-@router.get("", response_model=list[MenuResponse])
+@router.get("", response_model=Page[MenuResponse])
 def list_menus(
     restaurant_id: UUID,
-    service: MenuService = Depends(lambda: MenuService()),
+    request: Request,
+    sort: str = Query("created_at", description="created_at or kind; prefix with - for descending order"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    service: MenuService = Depends(get_menu_service),
 ):
-    return service.list_by_restaurant(restaurant_id)
+    rows = service.list_by_restaurant(restaurant_id, sort=sort, cursor=cursor, limit=limit)
+    etag = page_etag(rows, "menus", restaurant_id, sort, cursor, limit)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return set_validators(ModelResponse(rows.to_page(MenuResponse.model_validate)), etag)
 
 
 @router.get("/{menu_id}", response_model=MenuResponse)
 def get_menu(
     restaurant_id: UUID,
     menu_id: UUID,
-    service: MenuService = Depends(lambda: MenuService()),
+    request: Request,
+    service: MenuService = Depends(get_menu_service),
 ):
+    if is_conditional(request):
+        version = service.get_version(menu_id)
+        if version is not None and version.restaurant_id == restaurant_id:
+            etag = make_etag("menu", version.id, version.updated_at)
+            if is_not_modified(request, etag, version.updated_at):
+                return not_modified(etag, version.updated_at)
     menu = service.get_by_id(menu_id)
     if not menu or menu.restaurant_id != restaurant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu not found")
-    return menu
+    etag = make_etag("menu", menu.id, menu.updated_at)
+    return set_validators(ModelResponse(menu), etag, menu.updated_at)
 
 
 @router.put("/{menu_id}", response_model=MenuResponse)
@@ -53,7 +74,7 @@ def update_menu(
     menu_id: UUID,
     data: MenuUpdate,
     owner_id: UUID = Depends(require_restaurant_owner),
-    service: MenuService = Depends(lambda: MenuService()),
+    service: MenuService = Depends(get_menu_service),
 ):
     try:
         return service.update(menu_id, owner_id, data)
@@ -68,7 +89,7 @@ def delete_menu(
     restaurant_id: UUID,
     menu_id: UUID,
     owner_id: UUID = Depends(require_restaurant_owner),
-    service: MenuService = Depends(lambda: MenuService()),
+    service: MenuService = Depends(get_menu_service),
 ):
     try:
         service.delete(menu_id, owner_id)
@@ -1,11 +1,17 @@
+from decimal import Decimal
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
 from shared.logging import get_logger
+from shared.conditional import is_conditional, is_not_modified, make_etag, not_modified, page_etag, set_validators
 from shared.exceptions import NotFoundError, DatabaseError
+from shared.responses import ModelResponse
+from shared.pagination import Page
 
-from app.schemas.restaurant import RestaurantCreate, RestaurantUpdate, RestaurantResponse
+from app.schemas.restaurant import RestaurantCreate, RestaurantUpdate, RestaurantResponse, RestaurantTreeResponse, RestaurantNearbyResult
 from app.services.restaurant_service import RestaurantService
-from app.dependencies import get_current_user_id, require_restaurant_owner
+from app.dependencies import get_current_user_id, get_restaurant_service, require_restaurant_owner
+from app.config import settings
 
 logger = get_logger("restaurants.routes")
 
@@ -16,7 +22,7 @@ router = APIRouter(prefix="/restaurants", tags=["restaurants"])
 def create_restaurant(
     data: RestaurantCreate,
     owner_id: UUID = Depends(require_restaurant_owner),
-    service: RestaurantService = Depends(lambda: RestaurantService()),
+    service: RestaurantService = Depends(get_restaurant_service),
 ):
     try:
         return service.create(owner_id, data)
@@ -24,30 +30,99 @@ def create_restaurant(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=e.message)
 
 
-@router.get("", response_model=list[RestaurantResponse])
+SORT_DESCRIPTION = "created_at, name or rating; prefix with - for descending order"
+
+
+@router.get("", response_model=Page[RestaurantResponse])
 def list_restaurants(
-    service: RestaurantService = Depends(lambda: RestaurantService()),
+    request: Request,
+    sort: str = Query("-created_at", description=SORT_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    service: RestaurantService = Depends(get_restaurant_service),
 ):
-    return service.list_all()
+    rows = service.list_all(sort=sort, cursor=cursor, limit=limit, min_rating=min_rating)
+    etag = page_etag(rows, "restaurants", sort, cursor, limit, min_rating)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return set_validators(ModelResponse(rows.to_page(RestaurantResponse.model_validate)), etag)
 
 
-@router.get("/my", response_model=list[RestaurantResponse])
+@router.get("/my", response_model=Page[RestaurantResponse])
 def list_my_restaurants(
+    request: Request,
+    sort: str = Query("-created_at", description=SORT_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
     owner_id: UUID = Depends(require_restaurant_owner),
-    service: RestaurantService = Depends(lambda: RestaurantService()),
+    service: RestaurantService = Depends(get_restaurant_service),
+):
+    rows = service.get_by_owner(owner_id, sort=sort, cursor=cursor, limit=limit)
+    etag = page_etag(rows, "restaurants", owner_id, sort, cursor, limit)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return set_validators(ModelResponse(rows.to_page(RestaurantResponse.model_validate)), etag)
+
+
+@router.get("/nearby", response_model=list[RestaurantNearbyResult])
+def list_nearby_restaurants(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius: float = Query(5.0, gt=0, le=settings.nearby_max_radius_km, description="Search radius in km"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    service: RestaurantService = Depends(get_restaurant_service),
 ):
-    return service.get_by_owner(owner_id)
+    """Restaurants within ``radius`` km of the point, closest first.
+
+    Only restaurants with coordinates are considered. No validators are sent:
+    every caller's point differs, and a collection version would scan the table.
+    """
+    return ModelResponse(service.nearby(lat, lon, radius, limit))
 
 
 @router.get("/{restaurant_id}", response_model=RestaurantResponse)
 def get_restaurant(
     restaurant_id: UUID,
-    service: RestaurantService = Depends(lambda: RestaurantService()),
+    request: Request,
+    service: RestaurantService = Depends(get_restaurant_service),
 ):
+    if is_conditional(request):
+        version = service.get_version(restaurant_id)
+        if version is not None:
+            etag = make_etag("restaurant", version.id, version.updated_at)
+            if is_not_modified(request, etag, version.updated_at):
+                return not_modified(etag, version.updated_at)
     restaurant = service.get_by_id(restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found")
-    return restaurant
+    etag = make_etag("restaurant", restaurant.id, restaurant.updated_at)
+    return set_validators(ModelResponse(restaurant), etag, restaurant.updated_at)
+
+
+@router.get("/{restaurant_id}/full", response_model=RestaurantTreeResponse)
+def get_restaurant_tree(
+    restaurant_id: UUID,
+    request: Request,
+    depth: int = Query(2, ge=1, le=2, description="1 for menus only, 2 to include their items"),
+    menu_kind: Optional[str] = Query(None, max_length=100),
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    service: RestaurantService = Depends(get_restaurant_service),
+):
+    """Restaurant with its menus and items in one response."""
+    version = service.get_tree_version(restaurant_id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found")
+    # Counts and newest updated_at of each level: a delete changes the
+    # version, but not the newest timestamp, so no Last-Modified is sent.
+    etag = make_etag("restaurant_tree", restaurant_id, *version, depth, menu_kind, min_price, max_price)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    tree = service.get_tree(restaurant_id, depth, menu_kind, min_price, max_price)
+    if not tree:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found")
+    return set_validators(ModelResponse(tree), etag)
 
 
 @router.put("/{restaurant_id}", response_model=RestaurantResponse)
@@ -55,7 +130,7 @@ def update_restaurant(
     restaurant_id: UUID,
     data: RestaurantUpdate,
     owner_id: UUID = Depends(require_restaurant_owner),
-    service: RestaurantService = Depends(lambda: RestaurantService()),
+    service: RestaurantService = Depends(get_restaurant_service),
 ):
     try:
         return service.update(restaurant_id, owner_id, data)
@@ -69,7 +144,7 @@ def update_restaurant(
 def delete_restaurant(
     restaurant_id: UUID,
     owner_id: UUID = Depends(require_restaurant_owner),
-    service: RestaurantService = Depends(lambda: RestaurantService()),
+    service: RestaurantService = Depends(get_restaurant_service),
 ):
     try:
         service.delete(restaurant_id, owner_id)
@@ -0,0 +1,40 @@
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Query, Depends
+from shared.logging import get_logger
+from shared.responses import ModelResponse
+from shared.pagination import Page
+
+from app.schemas.menu_item import MenuItemSearchResult
+from app.services.search_service import SearchService
+from app.dependencies import get_search_service
+from app.config import settings
+
+logger = get_logger("restaurants.search")
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/menu-items", response_model=Page[MenuItemSearchResult])
+def search_menu_items(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match; each is matched as a prefix"),
+    restaurant_id: Optional[UUID] = Query(None),
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    sort: str = Query("-rank", description="rank or price; prefix with - for descending order"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    service: SearchService = Depends(get_search_service),
+):
+    """Full-text search over menu item names and descriptions."""
+    page = service.search_menu_items(
+        q,
+        restaurant_id=restaurant_id,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+    )
+    return ModelResponse(page)
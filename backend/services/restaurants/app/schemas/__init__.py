@@ -2,14 +2,21 @@ from app.schemas.restaurant import (
     RestaurantCreate,
     RestaurantUpdate,
     RestaurantResponse,
+    RestaurantTreeResponse,
+    RestaurantNearbyResult,
 )
 from app.schemas.menu import (
     MenuCreate,
     MenuUpdate,
     MenuResponse,
+    MenuTreeResponse,
 )
 from app.schemas.menu_item import (
     MenuItemCreate,
     MenuItemUpdate,
     MenuItemResponse,
+    MenuItemSearchResult,
+    MenuItemBrowseResult,
 )
+from app.schemas.autocomplete import AutocompleteSuggestion
+from app.schemas.batch import BatchGetRequest, BatchGetResponse
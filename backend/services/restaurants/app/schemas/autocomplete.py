@@ -0,0 +1,11 @@
+from typing import Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class AutocompleteSuggestion(BaseModel):
+    kind: Literal["restaurant", "menu_item"]
+    id: UUID
+    name: str
+    restaurant_id: UUID
+    rating: Optional[float]
@@ -0,0 +1,15 @@
+from typing import Generic, TypeVar
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class BatchGetRequest(BaseModel):
+    ids: list[UUID] = Field(..., min_length=1)
+
+
+class BatchGetResponse(BaseModel, Generic[T]):
+    # Found entities in request order; ids with no match are listed in missing.
+    items: list[T]
+    missing: list[UUID]
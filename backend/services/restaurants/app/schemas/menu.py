@@ -3,6 +3,8 @@ from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
+from app.schemas.menu_item import MenuItemResponse
+
 
 class MenuCreate(BaseModel):
     kind: str = Field(..., min_length=1, max_length=100)
@@ -21,3 +23,8 @@ class MenuResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class MenuTreeResponse(MenuResponse):
+    # None when the tree was requested without items (depth=1).
+    items: Optional[list[MenuItemResponse]] = None
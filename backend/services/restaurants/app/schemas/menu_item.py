@@ -28,6 +28,17 @@ class MenuItemResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class MenuItemSearchResult(MenuItemResponse):
+    restaurant_id: UUID
+    rank: float
+
         
 class MenuItemsBulkCreate(BaseModel):
-    items: list[MenuItemCreate] = Field(..., min_length=1)
\ No newline at end of file
+    items: list[MenuItemCreate] = Field(..., min_length=1)
+
+
+class MenuItemBrowseResult(MenuItemResponse):
+    restaurant_id: UUID
+    menu_kind: str
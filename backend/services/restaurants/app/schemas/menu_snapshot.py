@@ -0,0 +1,9 @@
+from uuid import UUID
+from pydantic import BaseModel
+
+from app.schemas.menu import MenuTreeResponse
+
+
+class MenuSnapshotDocument(BaseModel):
+    restaurant_id: UUID
+    menus: list[MenuTreeResponse]
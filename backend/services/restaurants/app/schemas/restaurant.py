@@ -2,16 +2,29 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
+from app.schemas.menu import MenuTreeResponse
 
-class RestaurantCreate(BaseModel):
+
+class Coordinates(BaseModel):
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+    @model_validator(mode="after")
+    def check_pair(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be set together")
+        return self
+
+
+class RestaurantCreate(Coordinates):
     name: str = Field(..., min_length=1, max_length=255)
     location: Optional[str] = Field(None, max_length=500)
     rating: Optional[float] = Field(None, ge=0, le=5)
 
 
-class RestaurantUpdate(BaseModel):
+class RestaurantUpdate(Coordinates):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     location: Optional[str] = Field(None, max_length=500)
     rating: Optional[float] = Field(None, ge=0, le=5)
@@ -23,8 +36,18 @@ class RestaurantResponse(BaseModel):
     name: str
     location: Optional[str]
     rating: Optional[float]
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class RestaurantTreeResponse(RestaurantResponse):
+    menus: list[MenuTreeResponse]
+
+
+class RestaurantNearbyResult(RestaurantResponse):
+    distance_km: float
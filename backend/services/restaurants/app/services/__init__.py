@@ -1,3 +1,6 @@
 from app.services.restaurant_service import RestaurantService
 from app.services.menu_service import MenuService
 from app.services.menu_item_service import MenuItemService
+from app.services.menu_snapshot_service import MenuSnapshotService
+from app.services.search_service import SearchService
+from app.services.browse_service import BrowseService
@@ -0,0 +1,103 @@
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from shared.database import get_database
+from shared.logging import get_logger
+from shared.pagination import Page, build_page, keyset_select
+
+from app.catalog import get_catalog
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+from app.models.restaurant import Restaurant
+from app.schemas.menu_item import MenuItemBrowseResult
+
+logger = get_logger("restaurants.browse_service")
+
+BROWSE_SORTS = {
+    "price": (MenuItem.price, MenuItem.id),
+    "created_at": (MenuItem.created_at, MenuItem.id),
+}
+
+
+def _browse_statement(
+    min_price: Optional[Decimal],
+    max_price: Optional[Decimal],
+    min_rating: Optional[float],
+    menu_kind: Optional[str],
+    owner_id: Optional[UUID],
+    restaurant_id: Optional[UUID],
+    sort: str,
+    cursor: Optional[str],
+    limit: int,
+):
+    statement = (
+        select(MenuItem, Menu.restaurant_id, Menu.kind)
+        .join(Menu, Menu.id == MenuItem.menu_id)
+        .join(Restaurant, Restaurant.id == Menu.restaurant_id)
+    )
+    if min_price is not None:
+        statement = statement.where(MenuItem.price >= min_price)
+    if max_price is not None:
+        statement = statement.where(MenuItem.price <= max_price)
+    if min_rating is not None:
+        statement = statement.where(Restaurant.rating >= min_rating)
+    if menu_kind is not None:
+        statement = statement.where(Menu.kind == menu_kind)
+    if owner_id is not None:
+        statement = statement.where(Restaurant.owner_id == owner_id)
+    if restaurant_id is not None:
+        statement = statement.where(Menu.restaurant_id == restaurant_id)
+    return keyset_select(statement, BROWSE_SORTS, sort, cursor, limit)
+
+
+def _to_result(row) -> MenuItemBrowseResult:
+    item, restaurant_id, menu_kind = row
+    return MenuItemBrowseResult(
+        id=item.id,
+        menu_id=item.menu_id,
+        name=item.name,
+        description=item.description,
+        price=item.price,
+        created_at=item.created_at,
+        updated_at=item.updated_at,
+        restaurant_id=restaurant_id,
+        menu_kind=menu_kind,
+    )
+
+
+class BrowseService:
+    """Cross-restaurant menu item browsing.
+
+    Served from the columnar catalog when it is enabled and fresh, otherwise
+    from SQL. Both paths order and encode cursors identically, so a client
+    can keep paging across a switch.
+    """
+
+    def __init__(self, session: Optional[Session] = None):
+        self.db = get_database()
+        self.session = session
+
+    def browse_menu_items(
+        self,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        min_rating: Optional[float] = None,
+        menu_kind: Optional[str] = None,
+        owner_id: Optional[UUID] = None,
+        restaurant_id: Optional[UUID] = None,
+        sort: str = "price",
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Page[MenuItemBrowseResult]:
+        filters = (min_price, max_price, min_rating, menu_kind, owner_id, restaurant_id)
+        catalog = get_catalog()
+        snapshot = catalog.current() if catalog is not None else None
+        if snapshot is not None:
+            return snapshot.browse(*filters, sort=sort, cursor=cursor, limit=limit)
+        statement = _browse_statement(*filters, sort, cursor, limit)
+        with self.db.session_scope(self.session, readonly=True) as session:
+            rows = session.execute(statement).all()
+            return build_page(rows, sort, limit, _to_result)
@@ -1,25 +1,40 @@
-from typing import Optional, List
-from uuid import UUID
+from typing import Optional
+from uuid import UUID, uuid4
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
-from shared.database import get_database
+from shared.database import after_commit, get_database
 from shared.logging import get_logger
 from shared.exceptions import NotFoundError, DatabaseError
+from shared.cache import EntityCache
+from shared.pagination import RowPage, keyset_select, row_page
 
 from app.models.restaurant import Restaurant
 from app.models.menu import Menu
 from app.models.menu_item import MenuItem
 from app.schemas.menu_item import MenuItemCreate, MenuItemUpdate, MenuItemResponse
+from app.autocomplete import index_menu_items, rename_menu_item, unindex_menu_item
+from app.services.menu_snapshot_service import publish_menu_snapshot
 
 logger = get_logger("restaurants.menu_item_service")
 
+menu_item_cache = EntityCache("menu_item", MenuItem)
+
+MENU_ITEM_SORTS = {
+    "created_at": (MenuItem.created_at, MenuItem.id),
+    "name": (MenuItem.name, MenuItem.id),
+    "price": (MenuItem.price, MenuItem.id),
+}
+
 
 class MenuItemService:
-    def __init__(self):
+    def __init__(self, session: Optional[Session] = None):
         self.db = get_database()
+        self.session = session
 
     def create(self, menu_id: UUID, owner_id: UUID, data: MenuItemCreate) -> MenuItemResponse:
-        with self.db.get_session() as session:
+        with self.db.session_scope(self.session) as session:
             menu = session.query(Menu).join(Restaurant).filter(
                 Menu.id == menu_id,
                 Restaurant.owner_id == owner_id,
@@ -29,8 +44,10 @@ class MenuItemService:
             item = MenuItem(menu_id=menu_id, name=data.name, description=data.description, price=data.price)
             try:
                 session.add(item)
-                session.commit()
+                publish_menu_snapshot(session, menu.restaurant_id)
+                session.flush()
                 logger.info("MenuItem created", extra={"item_id": str(item.id), "menu_id": str(menu_id)})
+                after_commit(session, index_menu_items, [item], menu_id, menu.restaurant_id)
                 return MenuItemResponse.model_validate(item)
             except IntegrityError as e:
                 session.rollback()
@@ -40,23 +57,43 @@ class MenuItemService:
                 logger.error("MenuItem creation failed", extra={"error": str(e)})
                 raise DatabaseError("Failed to create menu item", details={"error": str(e)})
 
-    def create_many(self, menu_id: UUID, owner_id: UUID, items: list[MenuItemCreate]) -> list[MenuItemResponse]:
-        with self.db.get_session() as session:
+    def create_many(
+        self,
+        menu_id: UUID,
+        owner_id: UUID,
+        items: list[MenuItemCreate],
+        batch_size: int = 1000,
+    ) -> list[MenuItemResponse]:
+        with self.db.session_scope(self.session) as session:
             menu = session.query(Menu).join(Restaurant).filter(
                 Menu.id == menu_id,
                 Restaurant.owner_id == owner_id,
             ).first()
             if not menu:
                 raise NotFoundError("Menu not found")
+            # One multi-row INSERT ... RETURNING per batch instead of a flush
+            # per item; RETURNING hands back the server-side timestamps.
+            table = MenuItem.__table__
+            statement = insert(table).returning(*table.c, sort_by_parameter_order=True)
             created = []
             try:
-                for data in items:
-                    item = MenuItem(menu_id=menu_id, name=data.name, description=data.description, price=data.price)
-                    session.add(item)
-                    session.flush()
-                    created.append(MenuItemResponse.model_validate(item))
-                session.commit()
+                for start in range(0, len(items), batch_size):
+                    rows = [
+                        {
+                            "id": uuid4(),
+                            "menu_id": menu_id,
+                            "name": data.name,
+                            "description": data.description,
+                            "price": data.price,
+                        }
+                        for data in items[start:start + batch_size]
+                    ]
+                    result = session.execute(statement, rows)
+                    created.extend(MenuItemResponse.model_validate(dict(row._mapping)) for row in result)
+                publish_menu_snapshot(session, menu.restaurant_id)
+                session.flush()
                 logger.info("MenuItems bulk created", extra={"menu_id": str(menu_id), "count": len(created)})
+                after_commit(session, index_menu_items, created, menu_id, menu.restaurant_id)
                 return created
             except IntegrityError as e:
                 session.rollback()
@@ -67,19 +104,58 @@ class MenuItemService:
                 raise DatabaseError("Failed to create menu items", details={"error": str(e)})
 
     def get_by_id(self, item_id: UUID) -> Optional[MenuItemResponse]:
-        with self.db.get_session() as session:
+        cached = menu_item_cache.get(item_id)
+        if cached is not None:
+            return cached
+        epoch = menu_item_cache.epoch
+        with self.db.session_scope(self.session, readonly=True) as session:
             item = session.query(MenuItem).filter(MenuItem.id == item_id).first()
             if not item:
                 return None
-            return MenuItemResponse.model_validate(item)
+            response = MenuItemResponse.model_validate(item)
+        menu_item_cache.set(item_id, response, epoch)
+        return response
+
+    def get_many(self, item_ids: list[UUID]) -> dict[UUID, MenuItemResponse]:
+        """Found menu items by id: cache hits, then one ``IN`` query for the rest."""
+        found = menu_item_cache.get_many(item_ids)
+        missing = [item_id for item_id in item_ids if item_id not in found]
+        if missing:
+            epoch = menu_item_cache.epoch
+            with self.db.session_scope(self.session, readonly=True) as session:
+                for item in session.scalars(select(MenuItem).where(MenuItem.id.in_(missing))):
+                    found[item.id] = MenuItemResponse.model_validate(item)
+            for item_id in missing:
+                if item_id in found:
+                    menu_item_cache.set(item_id, found[item_id], epoch)
+        return found
+
+    def get_version(self, item_id: UUID):
+        """``id``, ``menu_id`` and ``updated_at`` for validating conditional requests."""
+        cached = menu_item_cache.get(item_id)
+        if cached is not None:
+            return cached
+        with self.db.session_scope(self.session, readonly=True) as session:
+            return session.execute(
+                select(MenuItem.id, MenuItem.menu_id, MenuItem.updated_at).where(MenuItem.id == item_id)
+            ).first()
 
-    def list_by_menu(self, menu_id: UUID) -> List[MenuItemResponse]:
-        with self.db.get_session() as session:
-            items = session.query(MenuItem).filter(MenuItem.menu_id == menu_id).all()
-            return [MenuItemResponse.model_validate(i) for i in items]
+    def list_by_menu(
+        self,
+        menu_id: UUID,
+        sort: str = "created_at",
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> RowPage[MenuItem]:
+        statement = keyset_select(
+            select(MenuItem).where(MenuItem.menu_id == menu_id), MENU_ITEM_SORTS, sort, cursor, limit
+        )
+        with self.db.session_scope(self.session, readonly=True) as session:
+            rows = session.execute(statement).all()
+            return row_page(rows, sort, limit)
 
     def update(self, item_id: UUID, owner_id: UUID, data: MenuItemUpdate) -> MenuItemResponse:
-        with self.db.get_session() as session:
+        with self.db.session_scope(self.session) as session:
             item = session.query(MenuItem).join(Menu).join(Restaurant).filter(
                 MenuItem.id == item_id,
                 Restaurant.owner_id == owner_id,
@@ -89,12 +165,14 @@ class MenuItemService:
             update_data = data.model_dump(exclude_unset=True)
             for field, value in update_data.items():
                 setattr(item, field, value)
-            session.commit()
+            publish_menu_snapshot(session, menu_id=item.menu_id)
+            session.flush()
             logger.info("MenuItem updated", extra={"item_id": str(item_id)})
+            after_commit(session, rename_menu_item, item.id, item.name)
             return MenuItemResponse.model_validate(item)
 
     def delete(self, item_id: UUID, owner_id: UUID) -> None:
-        with self.db.get_session() as session:
+        with self.db.session_scope(self.session) as session:
             item = session.query(MenuItem).join(Menu).join(Restaurant).filter(
                 MenuItem.id == item_id,
                 Restaurant.owner_id == owner_id,
@@ -102,5 +180,7 @@ class MenuItemService:
             if not item:
                 raise NotFoundError("Menu item not found")
             session.delete(item)
-            session.commit()
+            publish_menu_snapshot(session, menu_id=item.menu_id)
+            session.flush()
             logger.info("MenuItem deleted", extra={"item_id": str(item_id)})
+            after_commit(session, unindex_menu_item, item_id)
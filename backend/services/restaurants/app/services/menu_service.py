@@ -1,24 +1,38 @@
-from typing import Optional, List
+from typing import Optional
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
-from shared.database import get_database
+from shared.database import after_commit, get_database
 from shared.logging import get_logger
 from shared.exceptions import NotFoundError, DatabaseError
+from shared.cache import EntityCache
+from shared.pagination import RowPage, keyset_select, row_page
 
 from app.models.restaurant import Restaurant
 from app.models.menu import Menu
 from app.schemas.menu import MenuCreate, MenuUpdate, MenuResponse
+from app.autocomplete import unindex_menu
+from app.services.menu_snapshot_service import publish_menu_snapshot
 
 logger = get_logger("restaurants.menu_service")
 
+menu_cache = EntityCache("menu", Menu)
+
+MENU_SORTS = {
+    "created_at": (Menu.created_at, Menu.id),
+    "kind": (Menu.kind, Menu.id),
+}
+
 
 class MenuService:
-    def __init__(self):
+    def __init__(self, session: Optional[Session] = None):
         self.db = get_database()
+        self.session = session
 
     def create(self, restaurant_id: UUID, owner_id: UUID, data: MenuCreate) -> MenuResponse:
-        with self.db.get_session() as session:
+        with self.db.session_scope(self.session) as session:
             restaurant = session.query(Restaurant).filter(
                 Restaurant.id == restaurant_id,
                 Restaurant.owner_id == owner_id,
@@ -28,7 +42,8 @@ class MenuService:
             menu = Menu(restaurant_id=restaurant_id, kind=data.kind)
             try:
                 session.add(menu)
-                session.commit()
+                publish_menu_snapshot(session, restaurant_id)
+                session.flush()
                 logger.info("Menu created", extra={"menu_id": str(menu.id), "restaurant_id": str(restaurant_id)})
                 return MenuResponse.model_validate(menu)
             except IntegrityError as e:
@@ -40,19 +55,58 @@ class MenuService:
                 raise DatabaseError("Failed to create menu", details={"error": str(e)})
 
     def get_by_id(self, menu_id: UUID) -> Optional[MenuResponse]:
-        with self.db.get_session() as session:
+        cached = menu_cache.get(menu_id)
+        if cached is not None:
+            return cached
+        epoch = menu_cache.epoch
+        with self.db.session_scope(self.session, readonly=True) as session:
             menu = session.query(Menu).filter(Menu.id == menu_id).first()
             if not menu:
                 return None
-            return MenuResponse.model_validate(menu)
+            response = MenuResponse.model_validate(menu)
+        menu_cache.set(menu_id, response, epoch)
+        return response
+
+    def get_many(self, menu_ids: list[UUID]) -> dict[UUID, MenuResponse]:
+        """Found menus by id: cache hits, then one ``IN`` query for the rest."""
+        found = menu_cache.get_many(menu_ids)
+        missing = [menu_id for menu_id in menu_ids if menu_id not in found]
+        if missing:
+            epoch = menu_cache.epoch
+            with self.db.session_scope(self.session, readonly=True) as session:
+                for menu in session.scalars(select(Menu).where(Menu.id.in_(missing))):
+                    found[menu.id] = MenuResponse.model_validate(menu)
+            for menu_id in missing:
+                if menu_id in found:
+                    menu_cache.set(menu_id, found[menu_id], epoch)
+        return found
+
+    def get_version(self, menu_id: UUID):
+        """``id``, ``restaurant_id`` and ``updated_at`` for validating conditional requests."""
+        cached = menu_cache.get(menu_id)
+        if cached is not None:
+            return cached
+        with self.db.session_scope(self.session, readonly=True) as session:
+            return session.execute(
+                select(Menu.id, Menu.restaurant_id, Menu.updated_at).where(Menu.id == menu_id)
+            ).first()
 
-    def list_by_restaurant(self, restaurant_id: UUID) -> List[MenuResponse]:
-        with self.db.get_session() as session:
-            menus = session.query(Menu).filter(Menu.restaurant_id == restaurant_id).all()
-            return [MenuResponse.model_validate(m) for m in menus]
+    def list_by_restaurant(
+        self,
+        restaurant_id: UUID,
+        sort: str = "created_at",
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> RowPage[Menu]:
+        statement = keyset_select(
+            select(Menu).where(Menu.restaurant_id == restaurant_id), MENU_SORTS, sort, cursor, limit
+        )
+        with self.db.session_scope(self.session, readonly=True) as session:
+            rows = session.execute(statement).all()
+            return row_page(rows, sort, limit)
 
     def update(self, menu_id: UUID, owner_id: UUID, data: MenuUpdate) -> MenuResponse:
-        with self.db.get_session() as session:
+        with self.db.session_scope(self.session) as session:
             menu = session.query(Menu).join(Restaurant).filter(
                 Menu.id == menu_id,
                 Restaurant.owner_id == owner_id,
@@ -62,12 +116,13 @@ class MenuService:
             update_data = data.model_dump(exclude_unset=True)
             for field, value in update_data.items():
                 setattr(menu, field, value)
-            session.commit()
+            publish_menu_snapshot(session, menu.restaurant_id)
+            session.flush()
             logger.info("Menu updated", extra={"menu_id": str(menu_id)})
             return MenuResponse.model_validate(menu)
 
     def delete(self, menu_id: UUID, owner_id: UUID) -> None:
-        with self.db.get_session() as session:
+        with self.db.session_scope(self.session) as session:
             menu = session.query(Menu).join(Restaurant).filter(
                 Menu.id == menu_id,
                 Restaurant.owner_id == owner_id,
@@ -75,5 +130,7 @@ class MenuService:
             if not menu:
                 raise NotFoundError("Menu not found")
             session.delete(menu)
-            session.commit()
+            publish_menu_snapshot(session, menu.restaurant_id)
+            session.flush()
             logger.info("Menu deleted", extra={"menu_id": str(menu_id)})
+            after_commit(session, unindex_menu, menu_id)
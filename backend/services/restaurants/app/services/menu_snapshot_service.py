@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+from collections import defaultdict
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from shared.cache import CacheBackend
+from shared.database import get_database
+from shared.logging import get_logger
+
+from app.models.restaurant import Restaurant
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+from app.models.menu_snapshot import MenuSnapshot
+from app.schemas.menu import MenuTreeResponse
+from app.schemas.menu_item import MenuItemResponse
+from app.schemas.menu_snapshot import MenuSnapshotDocument
+
+logger = get_logger("restaurants.menu_snapshot_service")
+
+# Snapshots never change once written, so cached bodies are never stale and
+# need no invalidation. Whole bodies are kept apart from the entity cache, in
+# a cache bounded by bytes (see init_snapshot_cache).
+_snapshot_cache: Optional[CacheBackend] = None
+
+SNAPSHOTS_KEPT = 10
+
+
+def build_menu_document(session: Session, restaurant_id: UUID) -> bytes:
+    menus = session.execute(
+        select(Menu.id, Menu.restaurant_id, Menu.kind, Menu.created_at, Menu.updated_at)
+        .where(Menu.restaurant_id == restaurant_id)
+        .order_by(Menu.created_at, Menu.id)
+    ).all()
+    items = defaultdict(list)
+    for row in session.execute(
+        select(*MenuItem.__table__.c)
+        .where(MenuItem.menu_id.in_(select(Menu.id).where(Menu.restaurant_id == restaurant_id)))
+        .order_by(MenuItem.created_at, MenuItem.id)
+    ):
+        items[row.menu_id].append(MenuItemResponse.model_validate(row))
+    document = MenuSnapshotDocument(
+        restaurant_id=restaurant_id,
+        menus=[MenuTreeResponse(**menu._mapping, items=items[menu.id]) for menu in menus],
+    )
+    return document.model_dump_json().encode()
+
+
+def publish_menu_snapshot(
+    session: Session,
+    restaurant_id: Optional[UUID] = None,
+    menu_id: Optional[UUID] = None,
+) -> Optional[str]:
+    """Rebuild and store the restaurant's menu snapshot in the caller's transaction.
+
+    Pass ``menu_id`` when only the menu is known. Returns the content hash.
+    """
+    session.flush()
+    if restaurant_id is None:
+        restaurant_id = session.scalar(select(Menu.restaurant_id).where(Menu.id == menu_id))
+    # Serialize publishers per restaurant so the last one to commit has seen
+    # every earlier committed change.
+    locked = session.scalar(select(Restaurant.id).where(Restaurant.id == restaurant_id).with_for_update())
+    if locked is None:
+        return None
+
+    body = build_menu_document(session, restaurant_id)
+    content_hash = hashlib.sha256(body).hexdigest()
+    statement = insert(MenuSnapshot).values(
+        content_hash=content_hash,
+        restaurant_id=restaurant_id,
+        body=body,
+        body_gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        published_at=func.clock_timestamp(),
+    )
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[MenuSnapshot.content_hash],
+        set_={"published_at": statement.excluded.published_at},
+    ))
+    kept = (
+        select(MenuSnapshot.content_hash)
+        .where(MenuSnapshot.restaurant_id == restaurant_id)
+        .order_by(MenuSnapshot.published_at.desc())
+        .limit(SNAPSHOTS_KEPT)
+    )
+    session.execute(
+        delete(MenuSnapshot)
+        .where(MenuSnapshot.restaurant_id == restaurant_id, MenuSnapshot.content_hash.not_in(kept))
+        .execution_options(synchronize_session=False)
+    )
+    logger.info("Menu snapshot published", extra={"restaurant_id": str(restaurant_id), "content_hash": content_hash})
+    return content_hash
+
+
+class MenuSnapshotService:
+    def __init__(self, session: Optional[Session] = None):
+        self.db = get_database()
+        self.session = session
+
+    def get_current_hash(self, restaurant_id: UUID) -> Optional[str]:
+        """Hash of the latest snapshot, or None if none has been published.
+
+        Snapshots are published by every restaurant, menu and item write;
+        restaurants created before that get theirs from
+        ``app.jobs.backfill_menu_snapshots``. Reads never publish.
+        """
+        with self.db.session_scope(self.session, readonly=True) as session:
+            return session.scalar(
+                select(MenuSnapshot.content_hash)
+                .where(MenuSnapshot.restaurant_id == restaurant_id)
+                .order_by(MenuSnapshot.published_at.desc())
+                .limit(1)
+            )
+
+    def get_snapshot(self, content_hash: str) -> Optional[tuple[bytes, bytes]]:
+        """Identity and gzip encodings of a snapshot body."""
+        if _snapshot_cache is not None:
+            cached = _snapshot_cache.get(content_hash)
+            if cached is not None:
+                return cached
+        with self.db.session_scope(self.session, readonly=True) as session:
+            row = session.execute(
+                select(MenuSnapshot.body, MenuSnapshot.body_gzip).where(MenuSnapshot.content_hash == content_hash)
+            ).first()
+        if row is None:
+            return None
+        snapshot = (bytes(row.body), bytes(row.body_gzip))
+        if _snapshot_cache is not None:
+            _snapshot_cache.set(content_hash, snapshot)
+        return snapshot
+
+
+def snapshot_size(snapshot: tuple[bytes, bytes]) -> int:
+    return len(snapshot[0]) + len(snapshot[1])
+
+
+def init_snapshot_cache(cache: Optional[CacheBackend]) -> Optional[CacheBackend]:
+    global _snapshot_cache
+    _snapshot_cache = cache
+    return _snapshot_cache
+
+
+def get_snapshot_cache() -> Optional[CacheBackend]:
+    return _snapshot_cache
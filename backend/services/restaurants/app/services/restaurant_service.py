@@ -1,20 +1,151 @@
-from typing import Optional, List
+from decimal import Decimal
+from typing import Optional
 from uuid import UUID
+from sqlalchemy import func, literal_column, or_, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 
-from shared.database import get_database
+from shared import geo
+from shared.database import after_commit, get_database
 from shared.logging import get_logger
 from shared.exceptions import NotFoundError, DatabaseError
+from shared.cache import EntityCache
+from shared.pagination import RowPage, keyset_select, row_page
 
+from app.autocomplete import index_restaurant, unindex_restaurant
+from app.services.menu_snapshot_service import publish_menu_snapshot
 from app.models.restaurant import Restaurant
-from app.schemas.restaurant import RestaurantCreate, RestaurantUpdate, RestaurantResponse
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+from app.schemas.menu import MenuTreeResponse
+from app.schemas.menu_item import MenuItemResponse
+from app.schemas.restaurant import (
+    RestaurantCreate,
+    RestaurantUpdate,
+    RestaurantResponse,
+    RestaurantTreeResponse,
+    RestaurantNearbyResult,
+)
 
 logger = get_logger("restaurants.restaurant_service")
 
+restaurant_cache = EntityCache("restaurant", Restaurant)
+
+RESTAURANT_SORTS = {
+    "created_at": (Restaurant.created_at, Restaurant.id),
+    "name": (Restaurant.name, Restaurant.id),
+    # Unrated restaurants sort as -1 so they can take part in the row comparison.
+    "rating": (func.coalesce(Restaurant.rating, literal_column("-1")), Restaurant.id),
+}
+
+
+def _filter(statement, owner_id: Optional[UUID], min_rating: Optional[float]):
+    if owner_id is not None:
+        statement = statement.where(Restaurant.owner_id == owner_id)
+    if min_rating is not None:
+        statement = statement.where(Restaurant.rating >= min_rating)
+    return statement
+
+
+def _list_statement(owner_id: Optional[UUID], min_rating: Optional[float], sort: str, cursor: Optional[str], limit: int):
+    return keyset_select(_filter(select(Restaurant), owner_id, min_rating), RESTAURANT_SORTS, sort, cursor, limit)
+
+
+def _version_statement(restaurant_id: UUID):
+    return select(Restaurant.id, Restaurant.updated_at).where(Restaurant.id == restaurant_id)
+
+
+def _tree_statement(
+    restaurant_id: UUID,
+    depth: int,
+    menu_kind: Optional[str],
+    min_price: Optional[Decimal],
+    max_price: Optional[Decimal],
+):
+    # One query per level: the restaurant, then menus and items via IN lists.
+    menus = Restaurant.menus.and_(Menu.kind == menu_kind) if menu_kind is not None else Restaurant.menus
+    loader = selectinload(menus)
+    if depth > 1:
+        item_filters = []
+        if min_price is not None:
+            item_filters.append(MenuItem.price >= min_price)
+        if max_price is not None:
+            item_filters.append(MenuItem.price <= max_price)
+        loader = loader.selectinload(Menu.items.and_(*item_filters) if item_filters else Menu.items)
+    return (
+        select(Restaurant)
+        .where(Restaurant.id == restaurant_id)
+        .options(loader)
+        .execution_options(populate_existing=True)
+    )
+
+
+def _tree_version_statement(restaurant_id: UUID):
+    menu_ids = select(Menu.id).where(Menu.restaurant_id == restaurant_id)
+    return select(
+        Restaurant.updated_at,
+        select(func.count(Menu.id)).where(Menu.restaurant_id == restaurant_id).scalar_subquery(),
+        select(func.max(Menu.updated_at)).where(Menu.restaurant_id == restaurant_id).scalar_subquery(),
+        select(func.count(MenuItem.id)).where(MenuItem.menu_id.in_(menu_ids)).scalar_subquery(),
+        select(func.max(MenuItem.updated_at)).where(MenuItem.menu_id.in_(menu_ids)).scalar_subquery(),
+    ).where(Restaurant.id == restaurant_id)
+
+
+def _locate(restaurant: Restaurant):
+    if restaurant.latitude is None or restaurant.longitude is None:
+        restaurant.geohash = None
+    else:
+        restaurant.geohash = geo.encode(restaurant.latitude, restaurant.longitude)
+
+
+def _nearby_statement(latitude: float, longitude: float, radius_km: float, limit: int):
+    # Prune to the covering geohash cells (index range scans), then filter and
+    # order the survivors by exact haversine distance.
+    cells = geo.covering_cells(latitude, longitude, radius_km)
+    lat1, lat2 = func.radians(latitude), func.radians(Restaurant.latitude)
+    dlat = func.radians(Restaurant.latitude - latitude)
+    dlon = func.radians(Restaurant.longitude - longitude)
+    a = func.power(func.sin(dlat / 2), 2) + func.cos(lat1) * func.cos(lat2) * func.power(func.sin(dlon / 2), 2)
+    distance = 2 * geo.EARTH_RADIUS_KM * func.asin(func.sqrt(a))
+    return (
+        select(Restaurant, distance)
+        .where(or_(*(Restaurant.geohash.like(f"{cell}%") for cell in cells)))
+        .where(distance <= radius_km)
+        .order_by(distance, Restaurant.id)
+        .limit(limit)
+    )
+
+
+def _nearby_result(row) -> RestaurantNearbyResult:
+    restaurant, distance_km = row
+    return RestaurantNearbyResult(**RestaurantResponse.model_validate(restaurant).model_dump(), distance_km=distance_km)
+
+
+def _creation_order(row):
+    return (row.created_at, row.id)
+
+
+def _tree_response(restaurant: Restaurant, depth: int) -> RestaurantTreeResponse:
+    menus = []
+    for menu in sorted(restaurant.menus, key=_creation_order):
+        items = None
+        if depth > 1:
+            items = [MenuItemResponse.model_validate(item) for item in sorted(menu.items, key=_creation_order)]
+        menus.append(MenuTreeResponse(
+            id=menu.id,
+            restaurant_id=menu.restaurant_id,
+            kind=menu.kind,
+            created_at=menu.created_at,
+            updated_at=menu.updated_at,
+            items=items,
+        ))
+    return RestaurantTreeResponse(**RestaurantResponse.model_validate(restaurant).model_dump(), menus=menus)
+
 
 class RestaurantService:
-    def __init__(self):
+    def __init__(self, session: Optional[Session] = None):
         self.db = get_database()
+        self.session = session
 
     def create(self, owner_id: UUID, data: RestaurantCreate) -> RestaurantResponse:
         restaurant = Restaurant(
@@ -22,12 +153,17 @@ class RestaurantService:
             name=data.name,
             location=data.location,
             rating=data.rating,
+            latitude=data.latitude,
+            longitude=data.longitude,
         )
-        with self.db.get_session() as session:
+        _locate(restaurant)
+        with self.db.session_scope(self.session) as session:
             try:
                 session.add(restaurant)
-                session.commit()
+                session.flush()
+                publish_menu_snapshot(session, restaurant.id)
                 logger.info("Restaurant created", extra={"restaurant_id": str(restaurant.id), "owner_id": str(owner_id)})
+                after_commit(session, index_restaurant, restaurant.id, restaurant.name, restaurant.rating)
                 return RestaurantResponse.model_validate(restaurant)
             except IntegrityError as e:
                 session.rollback()
@@ -38,24 +174,94 @@ class RestaurantService:
                 raise DatabaseError("Failed to create restaurant", details={"error": str(e)})
 
     def get_by_id(self, restaurant_id: UUID) -> Optional[RestaurantResponse]:
-        with self.db.get_session() as session:
+        cached = restaurant_cache.get(restaurant_id)
+        if cached is not None:
+            return cached
+        epoch = restaurant_cache.epoch
+        with self.db.session_scope(self.session, readonly=True) as session:
             restaurant = session.query(Restaurant).filter(Restaurant.id == restaurant_id).first()
             if not restaurant:
                 return None
-            return RestaurantResponse.model_validate(restaurant)
+            response = RestaurantResponse.model_validate(restaurant)
+        restaurant_cache.set(restaurant_id, response, epoch)
+        return response
+
+    def get_many(self, restaurant_ids: list[UUID]) -> dict[UUID, RestaurantResponse]:
+        """Found restaurants by id: cache hits, then one ``IN`` query for the rest."""
+        found = restaurant_cache.get_many(restaurant_ids)
+        missing = [restaurant_id for restaurant_id in restaurant_ids if restaurant_id not in found]
+        if missing:
+            epoch = restaurant_cache.epoch
+            with self.db.session_scope(self.session, readonly=True) as session:
+                for restaurant in session.scalars(select(Restaurant).where(Restaurant.id.in_(missing))):
+                    found[restaurant.id] = RestaurantResponse.model_validate(restaurant)
+            for restaurant_id in missing:
+                if restaurant_id in found:
+                    restaurant_cache.set(restaurant_id, found[restaurant_id], epoch)
+        return found
+
+    def get_tree(
+        self,
+        restaurant_id: UUID,
+        depth: int = 2,
+        menu_kind: Optional[str] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+    ) -> Optional[RestaurantTreeResponse]:
+        statement = _tree_statement(restaurant_id, depth, menu_kind, min_price, max_price)
+        with self.db.session_scope(self.session, readonly=True) as session:
+            restaurant = session.scalar(statement)
+            if not restaurant:
+                return None
+            return _tree_response(restaurant, depth)
+
+    def get_tree_version(self, restaurant_id: UUID):
+        """Restaurant ``updated_at`` plus count and latest ``updated_at`` of its menus and items."""
+        with self.db.session_scope(self.session, readonly=True) as session:
+            return session.execute(_tree_version_statement(restaurant_id)).first()
+
+    def get_version(self, restaurant_id: UUID):
+        """``id`` and ``updated_at`` for validating conditional requests."""
+        cached = restaurant_cache.get(restaurant_id)
+        if cached is not None:
+            return cached
+        with self.db.session_scope(self.session, readonly=True) as session:
+            return session.execute(_version_statement(restaurant_id)).first()
+
+    def nearby(
+        self, latitude: float, longitude: float, radius_km: float, limit: int = 20
+    ) -> list[RestaurantNearbyResult]:
+        """Restaurants within ``radius_km`` of the point, closest first."""
+        statement = _nearby_statement(latitude, longitude, radius_km, limit)
+        with self.db.session_scope(self.session, readonly=True) as session:
+            return [_nearby_result(row) for row in session.execute(statement).all()]
 
-    def get_by_owner(self, owner_id: UUID) -> List[RestaurantResponse]:
-        with self.db.get_session() as session:
-            restaurants = session.query(Restaurant).filter(Restaurant.owner_id == owner_id).all()
-            return [RestaurantResponse.model_validate(r) for r in restaurants]
+    def get_by_owner(
+        self,
+        owner_id: UUID,
+        sort: str = "-created_at",
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> RowPage[Restaurant]:
+        statement = _list_statement(owner_id, None, sort, cursor, limit)
+        with self.db.session_scope(self.session, readonly=True) as session:
+            rows = session.execute(statement).all()
+            return row_page(rows, sort, limit)
 
-    def list_all(self) -> List[RestaurantResponse]:
-        with self.db.get_session() as session:
-            restaurants = session.query(Restaurant).all()
-            return [RestaurantResponse.model_validate(r) for r in restaurants]
+    def list_all(
+        self,
+        sort: str = "-created_at",
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        min_rating: Optional[float] = None,
+    ) -> RowPage[Restaurant]:
+        statement = _list_statement(None, min_rating, sort, cursor, limit)
+        with self.db.session_scope(self.session, readonly=True) as session:
+            rows = session.execute(statement).all()
+            return row_page(rows, sort, limit)
 
     def update(self, restaurant_id: UUID, owner_id: UUID, data: RestaurantUpdate) -> RestaurantResponse:
-        with self.db.get_session() as session:
+        with self.db.session_scope(self.session) as session:
             restaurant = session.query(Restaurant).filter(
                 Restaurant.id == restaurant_id,
                 Restaurant.owner_id == owner_id,
@@ -65,12 +271,15 @@ class RestaurantService:
             update_data = data.model_dump(exclude_unset=True)
             for field, value in update_data.items():
                 setattr(restaurant, field, value)
-            session.commit()
+            if "latitude" in update_data:
+                _locate(restaurant)
+            session.flush()
             logger.info("Restaurant updated", extra={"restaurant_id": str(restaurant_id)})
+            after_commit(session, index_restaurant, restaurant.id, restaurant.name, restaurant.rating)
             return RestaurantResponse.model_validate(restaurant)
 
     def delete(self, restaurant_id: UUID, owner_id: UUID) -> None:
-        with self.db.get_session() as session:
+        with self.db.session_scope(self.session) as session:
             restaurant = session.query(Restaurant).filter(
                 Restaurant.id == restaurant_id,
                 Restaurant.owner_id == owner_id,
@@ -78,5 +287,6 @@ class RestaurantService:
             if not restaurant:
                 raise NotFoundError("Restaurant not found")
             session.delete(restaurant)
-            session.commit()
+            session.flush()
             logger.info("Restaurant deleted", extra={"restaurant_id": str(restaurant_id)})
+            after_commit(session, unindex_restaurant, restaurant_id)
@@ -0,0 +1,182 @@
+import bisect
+import re
+from decimal import Decimal
+from typing import Iterable, Optional
+from uuid import UUID
+from sqlalchemy import Double, cast, func, literal_column, select
+from sqlalchemy.orm import Session
+
+from shared.database import get_database
+from shared.exceptions import ValidationError
+from shared.logging import get_logger
+from shared.pagination import Page, build_page, decode_cursor, encode_cursor, keyset_select, parse_sort
+
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+from app.schemas.menu_item import MenuItemResponse, MenuItemSearchResult
+
+logger = get_logger("restaurants.search_service")
+
+MAX_QUERY_TERMS = 8
+
+# A generated column of the menu_items table, not an attribute of MenuItem.
+SEARCH_VECTOR = MenuItem.__table__.c.search_vector
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+# ts_rank_cd's default weights for the A (name) and B (description) labels.
+NAME_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.4
+
+_TERM = re.compile(r"[^\W_]+")
+
+
+def query_terms(q: str) -> list[str]:
+    terms = _TERM.findall(q.lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        raise ValidationError("Search query must contain at least one word")
+    return terms
+
+
+def _search_statement(
+    terms: list[str],
+    restaurant_id: Optional[UUID],
+    min_price: Optional[Decimal],
+    max_price: Optional[Decimal],
+    sort: str,
+    cursor: Optional[str],
+    limit: int,
+):
+    # Every term is matched as a prefix, so "chick tik" finds "Chicken Tikka".
+    tsquery = func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
+    # ts_rank_cd returns float4; widened in SQL so the ORDER BY, the returned
+    # value and the cursor comparison all see the same float8, which a Python
+    # float round-trips exactly. Compared as float4 against a float8 cursor,
+    # tied ranks would be skipped or repeated across pages.
+    rank = cast(func.ts_rank_cd(SEARCH_VECTOR, tsquery), Double)
+    statement = (
+        select(MenuItem, Menu.restaurant_id, rank)
+        .join(Menu, Menu.id == MenuItem.menu_id)
+        .where(SEARCH_VECTOR.op("@@")(tsquery))
+    )
+    if restaurant_id is not None:
+        statement = statement.where(Menu.restaurant_id == restaurant_id)
+    if min_price is not None:
+        statement = statement.where(MenuItem.price >= min_price)
+    if max_price is not None:
+        statement = statement.where(MenuItem.price <= max_price)
+    options = {"rank": (rank, MenuItem.id), "price": (MenuItem.price, MenuItem.id)}
+    return keyset_select(statement, options, sort, cursor, limit)
+
+
+def _fallback_statement(restaurant_id: Optional[UUID], min_price: Optional[Decimal], max_price: Optional[Decimal]):
+    statement = select(MenuItem, Menu.restaurant_id).join(Menu, Menu.id == MenuItem.menu_id)
+    if restaurant_id is not None:
+        statement = statement.where(Menu.restaurant_id == restaurant_id)
+    if min_price is not None:
+        statement = statement.where(MenuItem.price >= min_price)
+    if max_price is not None:
+        statement = statement.where(MenuItem.price <= max_price)
+    return statement
+
+
+def _to_result(row) -> MenuItemSearchResult:
+    item, restaurant_id, rank = row
+    return MenuItemSearchResult(
+        id=item.id,
+        menu_id=item.menu_id,
+        name=item.name,
+        description=item.description,
+        price=item.price,
+        created_at=item.created_at,
+        updated_at=item.updated_at,
+        restaurant_id=restaurant_id,
+        rank=rank,
+    )
+
+
+class MenuItemSearchIndex:
+    """In-process inverted index for databases without full-text search (SQLite test runs).
+
+    Matches like the Postgres search (every term as a prefix of a word in the
+    name or description) but scores more simply: a word is worth
+    ``NAME_WEIGHT`` per occurrence in the name plus ``DESCRIPTION_WEIGHT``
+    per occurrence in the description, each query term takes the best word
+    it prefixes, and the rank is the sum over terms. ts_rank_cd also rewards
+    terms that occur close together, so the two can order results
+    differently. Built from the rows it is given; it does not track later
+    writes.
+    """
+
+    def __init__(self, rows: Iterable[tuple]):
+        self._items: dict[UUID, tuple[MenuItemResponse, UUID]] = {}
+        self._postings: dict[str, dict[UUID, float]] = {}
+        for item, restaurant_id in rows:
+            response = MenuItemResponse.model_validate(item)
+            self._items[response.id] = (response, restaurant_id)
+            self._add(response.id, response.name, NAME_WEIGHT)
+            self._add(response.id, response.description or "", DESCRIPTION_WEIGHT)
+        self._terms = sorted(self._postings)
+
+    def _add(self, item_id: UUID, text: str, weight: float):
+        for term in _TERM.findall(text.lower()):
+            postings = self._postings.setdefault(term, {})
+            postings[item_id] = postings.get(item_id, 0.0) + weight
+
+    def _match_prefix(self, prefix: str) -> dict[UUID, float]:
+        matches: dict[UUID, float] = {}
+        start = bisect.bisect_left(self._terms, prefix)
+        for term in self._terms[start:]:
+            if not term.startswith(prefix):
+                break
+            for item_id, weight in self._postings[term].items():
+                matches[item_id] = max(matches.get(item_id, 0.0), weight)
+        return matches
+
+    def search(self, terms: list[str], sort: str, cursor: Optional[str], limit: int) -> Page[MenuItemSearchResult]:
+        _, descending = parse_sort(sort, {"rank": (), "price": ()})
+        ranks: Optional[dict[UUID, float]] = None
+        for term in terms:
+            matches = self._match_prefix(term)
+            if ranks is None:
+                ranks = matches
+            else:
+                ranks = {item_id: ranks[item_id] + weight for item_id, weight in matches.items() if item_id in ranks}
+        results = []
+        for item_id, rank in (ranks or {}).items():
+            item, restaurant_id = self._items[item_id]
+            results.append(MenuItemSearchResult(**item.model_dump(), restaurant_id=restaurant_id, rank=rank))
+
+        def key(result: MenuItemSearchResult) -> tuple:
+            return (result.rank if sort.lstrip("-") == "rank" else result.price, result.id)
+
+        results.sort(key=key, reverse=descending)
+        if cursor:
+            after = tuple(decode_cursor(cursor, sort))
+            results = [r for r in results if (key(r) < after if descending else key(r) > after)]
+        next_cursor = encode_cursor(sort, key(results[limit - 1])) if len(results) > limit else None
+        return Page(items=results[:limit], next_cursor=next_cursor, limit=limit)
+
+
+class SearchService:
+    def __init__(self, session: Optional[Session] = None):
+        self.db = get_database()
+        self.session = session
+
+    def search_menu_items(
+        self,
+        q: str,
+        restaurant_id: Optional[UUID] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        sort: str = "-rank",
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Page[MenuItemSearchResult]:
+        terms = query_terms(q)
+        with self.db.session_scope(self.session, readonly=True) as session:
+            if self.db.engine.dialect.name != "postgresql":
+                rows = session.execute(_fallback_statement(restaurant_id, min_price, max_price)).all()
+                return MenuItemSearchIndex(rows).search(terms, sort, cursor, limit)
+            statement = _search_statement(terms, restaurant_id, min_price, max_price, sort, cursor, limit)
+            rows = session.execute(statement).all()
+            return build_page(rows, sort, limit, _to_result)
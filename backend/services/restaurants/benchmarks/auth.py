@@ -0,0 +1,62 @@
+"""Per-request cost of authenticating an access token.
+
+Compares full HS256 verification with ``TokenCache`` for a pool of live
+tokens, the way repeat requests from the same clients arrive.
+
+Run from ``backend/services/restaurants``:
+
+    PYTHONPATH=.:../.. python -m benchmarks.auth --tokens 1000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from jose import jwt
+
+from app.auth import TokenCache, verify_access_token
+from app.config import settings
+
+
+def make_token() -> str:
+    claims = {
+        "sub": str(uuid4()),
+        "role": random.choice(["customer", "restaurant_owner"]),
+        "type": "access",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=15),
+    }
+    return jwt.encode(claims, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+
+
+def per_call(fn, tokens: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for token in tokens:
+            fn(token)
+        best = min(best, (time.perf_counter() - start) / len(tokens))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(7)
+    pool = [make_token() for _ in range(args.tokens)]
+    requests = [random.choice(pool) for _ in range(args.requests)]
+    cache = TokenCache(max_size=max(args.tokens, 1))
+    full = per_call(verify_access_token, requests, args.repeat)
+    cached = per_call(cache.verify, requests, args.repeat)
+    print(f"{args.requests} requests over {args.tokens} tokens, best of {args.repeat}")
+    print(f"  jwt.decode  {full * 1e6:7.2f} us/request")
+    print(f"  TokenCache  {cached * 1e6:7.2f} us/request  {full / cached:6.1f}x")
+    print(f"  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
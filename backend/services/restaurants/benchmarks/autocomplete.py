@@ -0,0 +1,75 @@
+"""Autocomplete latency at a million names.
+
+Loads synthetic restaurant and dish names into ``AutocompleteIndex`` and
+reports suggestion latency percentiles for prefixes typed one character at a
+time, plus the cost of incremental inserts and renames.
+
+Run from ``backend/services/restaurants``:
+
+    PYTHONPATH=.:../.. python -m benchmarks.autocomplete --names 1000000
+"""
+import argparse
+import random
+import time
+from uuid import uuid4
+
+from app.autocomplete import AutocompleteIndex
+
+WORDS = (
+    "spicy sweet smoked grilled crispy garlic lemon chicken beef lamb paneer tofu shrimp salmon tikka masala "
+    "curry noodle ramen pho burger pizza taco burrito salad bowl soup stew kitfo tibs injera doro wat firfir "
+    "shiro berbere mango honey chili basil pepper cheese truffle mushroom avocado coconut peanut sesame"
+).split()
+
+
+def name(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) + f" {rng.randint(1, 999)}"
+
+
+def percentile(samples: list, fraction: float) -> float:
+    return sorted(samples)[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    restaurant_count = max(args.names // 50, 1)
+    restaurants = [(uuid4(), name(rng), rng.choice([None, rng.uniform(0, 5)])) for _ in range(restaurant_count)]
+    items = [
+        (uuid4(), name(rng), uuid4(), restaurants[rng.randrange(restaurant_count)][0])
+        for _ in range(args.names - restaurant_count)
+    ]
+    index = AutocompleteIndex()
+    start = time.perf_counter()
+    index.load(restaurants, items)
+    print(f"{len(index)} names, {index.stats()['keys']} keys, loaded in {time.perf_counter() - start:.1f}s")
+
+    # What a user types: every prefix of a name, one keystroke at a time.
+    prefixes = []
+    while len(prefixes) < args.queries:
+        typed = name(rng)
+        prefixes += [typed[:end] for end in range(1, min(len(typed), 12) + 1)]
+    latencies = []
+    for prefix in prefixes[:args.queries]:
+        start = time.perf_counter()
+        index.suggest(prefix, limit=10)
+        latencies.append(time.perf_counter() - start)
+    print(f"  suggest  p50 {percentile(latencies, 0.5) * 1e3:6.3f} ms  p99 {percentile(latencies, 0.99) * 1e3:6.3f} ms"
+          f"  max {max(latencies) * 1e3:7.3f} ms")
+
+    writes = []
+    for _ in range(1000):
+        item_id = uuid4()
+        start = time.perf_counter()
+        index.add_menu_item(item_id, name(rng), uuid4(), restaurants[rng.randrange(restaurant_count)][0])
+        index.rename_menu_item(item_id, name(rng))
+        writes.append(time.perf_counter() - start)
+    print(f"  insert+rename  p50 {percentile(writes, 0.5) * 1e3:6.3f} ms  p99 {percentile(writes, 0.99) * 1e3:6.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
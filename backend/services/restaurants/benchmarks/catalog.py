@@ -0,0 +1,99 @@
+"""Browse query latency: SQL + ORM path versus the columnar catalog.
+
+Seeds a throwaway SQLite database (or uses ``--database-url`` as is), builds
+the catalog from it and pages through a few typical browse queries both ways.
+
+Run from ``backend/services/restaurants``:
+
+    PYTHONPATH=.:../.. python -m benchmarks.catalog --items 100000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import insert
+
+from shared.database import init_database, get_database
+from app.catalog import ColumnarCatalog, init_catalog
+from app.models import Restaurant, Menu, MenuItem
+from app.services.browse_service import BrowseService
+
+QUERIES = {
+    "cheapest": dict(sort="price"),
+    "price range": dict(min_price=Decimal("8"), max_price=Decimal("15"), sort="-price"),
+    "rated dinner": dict(min_rating=4.0, menu_kind="dinner", sort="created_at"),
+}
+
+
+def seed(items: int, items_per_menu: int = 25):
+    random.seed(7)
+    now = datetime.now(timezone.utc)
+    restaurants, menus, menu_items = [], [], []
+    for _ in range(max(items // (items_per_menu * 2), 1)):
+        restaurant_id = uuid4()
+        restaurants.append(dict(
+            id=restaurant_id, owner_id=uuid4(), name="Restaurant", rating=random.uniform(0, 5),
+            created_at=now, updated_at=now,
+        ))
+        for kind in ("lunch", "dinner"):
+            menu_id = uuid4()
+            menus.append(dict(id=menu_id, restaurant_id=restaurant_id, kind=kind, created_at=now, updated_at=now))
+            for _ in range(items_per_menu):
+                created_at = now - timedelta(seconds=random.randint(0, 10 ** 7))
+                menu_items.append(dict(
+                    id=uuid4(), menu_id=menu_id, name="Dish", description="Slow-cooked with seasonal vegetables",
+                    price=Decimal(random.randint(300, 3000)).scaleb(-2), created_at=created_at, updated_at=created_at,
+                ))
+    with get_database().get_session() as session:
+        for model, rows in ((Restaurant, restaurants), (Menu, menus), (MenuItem, menu_items)):
+            for start in range(0, len(rows), 5000):
+                session.execute(insert(model), rows[start:start + 5000])
+    return len(menu_items)
+
+
+def measure(fn, repeat: int) -> float:
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", default=None, help="existing database to read instead of seeding SQLite")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bitez-catalog-")
+    init_database(args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    if args.database_url is None:
+        get_database().create_tables()
+        seed(args.items)
+    catalog = ColumnarCatalog(os.path.join(workdir, "catalog"))
+    start = time.perf_counter()
+    catalog.refresh()
+    build_seconds = time.perf_counter() - start
+    snapshot = catalog.current()
+    service = BrowseService()
+
+    print(f"{snapshot.count} menu items, limit {args.limit}, best of {args.repeat}; catalog built in {build_seconds:.2f}s")
+    for name, query in QUERIES.items():
+        init_catalog(None)
+        sql = measure(lambda: service.browse_menu_items(limit=args.limit, **query), args.repeat)
+        init_catalog(catalog)
+        columnar = measure(lambda: service.browse_menu_items(limit=args.limit, **query), args.repeat)
+        print(f"  {name:<14} SQL+ORM {sql * 1000:8.2f} ms   catalog {columnar * 1000:8.2f} ms  {sql / columnar:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Per-item response serialization cost for list_menu_items.
+
+Compares FastAPI's default ``response_model`` path (dump, re-validate,
+serialize, ``json.dumps``) with returning ``ModelResponse``, for a page of
+already-validated ``MenuItemResponse`` objects.
+
+Run from ``backend/services/restaurants``:
+
+    PYTHONPATH=.:../.. python -m benchmarks.serialization --items 1000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from shared.pagination import Page
+from shared.responses import ModelResponse
+from app.schemas.menu_item import MenuItemResponse
+
+try:
+    from fastapi.utils import create_model_field
+except ImportError:  # fastapi < 0.100
+    from fastapi.utils import create_response_field as create_model_field
+
+
+def build_page(count: int) -> Page[MenuItemResponse]:
+    menu_id = uuid4()
+    now = datetime.now(timezone.utc)
+    rows = [
+        SimpleNamespace(
+            id=uuid4(),
+            menu_id=menu_id,
+            name=f"Dish {i}",
+            description="Slow-cooked with seasonal vegetables and house spices",
+            price=Decimal("12.50") + i,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+    # What the service already does once per row.
+    items = [MenuItemResponse.model_validate(row) for row in rows]
+    return Page(items=items, next_cursor=None, limit=count)
+
+
+def measure(fn, repeat: int) -> float:
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    page = build_page(args.items)
+    field = create_model_field(name="Response_list_menu_items", type_=Page[MenuItemResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def response_model_path():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=page))
+        return JSONResponse(content).body
+
+    def model_response_path():
+        return ModelResponse(page).body
+
+    assert len(response_model_path()) > 0 and len(model_response_path()) > 0
+
+    results = {
+        "response_model (FastAPI default)": measure(response_model_path, args.repeat),
+        "ModelResponse": measure(model_response_path, args.repeat),
+    }
+    baseline = results["response_model (FastAPI default)"]
+    print(f"{args.items} menu items, best of {args.repeat}")
+    for name, seconds in results.items():
+        print(
+            f"  {name:<34} {seconds * 1000:8.2f} ms  {seconds / args.items * 1e6:7.2f} us/item"
+            f"  {baseline / seconds:5.1f}x"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import sys
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+
+# The service runs with both its own directory and backend/ (for ``shared``)
+# on the path; mirror that so tests import ``app`` and ``shared`` the same way.
+for path in (SERVICE_DIR, SERVICE_DIR.parents[1]):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,93 @@
+import time
+from uuid import uuid4
+
+import pytest
+from jose import jwt
+
+import app.auth
+from app.auth import TokenCache
+from app.config import settings
+
+START = time.time()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # One clock for the token's exp (wall time) and the cache's TTL (monotonic).
+    now = [START]
+    monkeypatch.setattr(app.auth.time, "time", lambda: now[0])
+    monkeypatch.setattr(app.auth.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    calls = []
+    verify = app.auth.verify_access_token
+
+    def counting(token):
+        calls.append(token)
+        return verify(token)
+
+    monkeypatch.setattr(app.auth, "verify_access_token", counting)
+    return calls
+
+
+def make_token(expires_in=900, secret=None, **claims):
+    claims = {"sub": str(uuid4()), "role": "customer", "type": "access", "exp": int(START) + expires_in, **claims}
+    return jwt.encode(claims, secret or settings.jwt_secret, algorithm=settings.jwt_algorithm)
+
+
+def test_verified_token_is_cached_until_its_exp(clock, decodes):
+    cache = TokenCache(max_size=10, max_ttl=300.0)
+    token = make_token(expires_in=60)
+    principal = cache.verify(token)
+    assert principal is not None and principal.role == "customer"
+
+    clock[0] = int(START) + 59
+    assert cache.verify(token) is principal
+    assert len(decodes) == 1
+
+    clock[0] = int(START) + 60
+    cache.verify(token)
+    assert len(decodes) == 2
+    # Verified again past exp (by this clock), so not cached for a further request.
+    cache.verify(token)
+    assert len(decodes) == 3
+
+
+def test_entry_lifetime_is_capped_at_max_ttl(clock, decodes):
+    cache = TokenCache(max_size=10, max_ttl=300.0)
+    token = make_token(expires_in=3600)
+    cache.verify(token)
+    clock[0] += 299
+    cache.verify(token)
+    assert len(decodes) == 1
+    clock[0] += 2
+    assert cache.verify(token) is not None
+    assert len(decodes) == 2
+    assert cache.stats()["expirations"] == 1
+
+
+@pytest.mark.parametrize("token", [
+    make_token(secret="another-secret-that-is-long-enough-to-pass"),
+    make_token(type="refresh"),
+    make_token(sub="not-a-uuid"),
+    make_token(expires_in=-10),
+    "not.a.jwt",
+])
+def test_rejected_tokens_are_never_cached(clock, decodes, token):
+    cache = TokenCache(max_size=10)
+    assert cache.verify(token) is None
+    assert cache.verify(token) is None
+    assert len(decodes) == 2
+    assert cache.stats()["rejected"] == 2
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_is_bounded(clock):
+    cache = TokenCache(max_size=2)
+    for _ in range(3):
+        cache.verify(make_token())
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
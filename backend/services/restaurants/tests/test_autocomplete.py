@@ -0,0 +1,180 @@
+import random
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert
+
+import app.autocomplete
+from shared.database import init_database
+from app.autocomplete import MENU_ITEM, RESTAURANT, AutocompleteIndex, AutocompleteRebuilder, get_autocomplete, normalize
+from app.models import Restaurant
+
+WORDS = "chicken chili chips tikka tibs tofu soup salad samosa pho pizza paneer".split()
+RATINGS = [None, 1.0, 3.5, 4.5, 5.0]
+NOW = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+class Oracle:
+    """The index's contents as plain dicts, ranked by brute force."""
+
+    def __init__(self):
+        self.restaurants = {}  # id -> (name, rating)
+        self.items = {}  # id -> (name, menu_id, restaurant_id)
+
+    def suggest(self, q, kind, limit):
+        prefix = normalize(q)
+        entries = [(RESTAURANT, id, name, id) for id, (name, _) in self.restaurants.items()]
+        entries += [(MENU_ITEM, id, name, restaurant_id) for id, (name, _, restaurant_id) in self.items.items()]
+        matches = []
+        for entry_kind, id, name, restaurant_id in entries:
+            words = normalize(name).split()
+            keys = [" ".join(words[start:]) for start in range(min(len(words), 8))]
+            if kind in (None, entry_kind) and any(key.startswith(prefix) for key in keys):
+                rating = self.restaurants[restaurant_id][1]
+                matches.append(((-(rating if rating is not None else -1.0), name.casefold()), entry_kind, id))
+        return [(entry_kind, id) for _, entry_kind, id in sorted(matches)[:limit]]
+
+
+class Mutator:
+    def __init__(self, rng, index, oracle):
+        self.rng = rng
+        self.index = index
+        self.oracle = oracle
+        self.menus = {}  # menu_id -> restaurant_id
+        self.counter = 0
+
+    def name(self):
+        # The counter keeps names unique, so the ranking is total.
+        self.counter += 1
+        return " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(1, 3))) + f" {self.counter}"
+
+    def add_restaurant(self):
+        restaurant_id, name, rating = uuid4(), self.name(), self.rng.choice(RATINGS)
+        self.index.upsert_restaurant(restaurant_id, name, rating)
+        self.oracle.restaurants[restaurant_id] = (name, rating)
+
+    def update_restaurant(self):
+        restaurant_id = self.rng.choice(list(self.oracle.restaurants))
+        name, rating = self.oracle.restaurants[restaurant_id]
+        if self.rng.random() < 0.5:
+            rating = self.rng.choice(RATINGS)
+        else:
+            name = self.name()
+        self.index.upsert_restaurant(restaurant_id, name, rating)
+        self.oracle.restaurants[restaurant_id] = (name, rating)
+
+    def remove_restaurant(self):
+        restaurant_id = self.rng.choice(list(self.oracle.restaurants))
+        self.index.remove_restaurant(restaurant_id)
+        del self.oracle.restaurants[restaurant_id]
+        self.oracle.items = {id: item for id, item in self.oracle.items.items() if item[2] != restaurant_id}
+        self.menus = {id: owner for id, owner in self.menus.items() if owner != restaurant_id}
+
+    def add_menu_item(self):
+        if self.menus and self.rng.random() < 0.7:
+            menu_id = self.rng.choice(list(self.menus))
+        else:
+            menu_id = uuid4()
+            self.menus[menu_id] = self.rng.choice(list(self.oracle.restaurants))
+        item_id, name = uuid4(), self.name()
+        self.index.add_menu_item(item_id, name, menu_id, self.menus[menu_id])
+        self.oracle.items[item_id] = (name, menu_id, self.menus[menu_id])
+
+    def rename_menu_item(self):
+        item_id = self.rng.choice(list(self.oracle.items))
+        name = self.name()
+        self.index.rename_menu_item(item_id, name)
+        self.oracle.items[item_id] = (name, *self.oracle.items[item_id][1:])
+
+    def remove_menu_item(self):
+        item_id = self.rng.choice(list(self.oracle.items))
+        self.index.remove_menu_item(item_id)
+        del self.oracle.items[item_id]
+
+    def remove_menu(self):
+        menu_id = self.rng.choice(list(self.menus))
+        self.index.remove_menu(menu_id)
+        del self.menus[menu_id]
+        self.oracle.items = {id: item for id, item in self.oracle.items.items() if item[1] != menu_id}
+
+    def step(self):
+        if len(self.oracle.restaurants) < 3:
+            return self.add_restaurant()
+        actions = [self.add_restaurant, self.update_restaurant, self.update_restaurant, self.remove_restaurant]
+        actions += [self.add_menu_item] * 4
+        if self.oracle.items:
+            actions += [self.rename_menu_item, self.remove_menu_item]
+        if self.menus:
+            actions.append(self.remove_menu)
+        self.rng.choice(actions)()
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_suggest_matches_brute_force_after_random_mutations(seed):
+    rng = random.Random(seed)
+    # A small scan limit, so most prefixes are answered from the maintained top lists.
+    index = AutocompleteIndex(max_limit=4, scan_limit=8)
+    oracle = Oracle()
+    mutator = Mutator(rng, index, oracle)
+    for _ in range(20):
+        mutator.add_restaurant()
+    for _ in range(150):
+        mutator.add_menu_item()
+    restaurants = [(id, name, rating) for id, (name, rating) in oracle.restaurants.items()]
+    items = [(id, *item) for id, item in oracle.items.items()]
+    index.load(restaurants, items)
+
+    for step in range(300):
+        mutator.step()
+        for _ in range(3):
+            word = rng.choice(WORDS)
+            q = word[:rng.randint(1, len(word))]
+            if rng.random() < 0.2:
+                q = f"{word} {rng.choice(WORDS)[:2]}"
+            kind = rng.choice([None, RESTAURANT, MENU_ITEM])
+            limit = rng.randint(1, 4)
+            got = [(suggestion.kind, suggestion.id) for suggestion in index.suggest(q, kind, limit)]
+            assert got == oracle.suggest(q, kind, limit), (step, q, kind, limit)
+    assert len(index) == len(oracle.restaurants) + len(oracle.items)
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = init_database(f"sqlite:///{tmp_path / 'autocomplete.db'}")
+    db.create_tables()
+    yield db
+    app.autocomplete.init_autocomplete(None)
+
+
+def insert_restaurant(db, name):
+    restaurant_id = uuid4()
+    with db.get_session() as session:
+        session.execute(insert(Restaurant), [dict(
+            id=restaurant_id, owner_id=uuid4(), name=name, created_at=NOW, updated_at=NOW,
+        )])
+    return restaurant_id
+
+
+def test_rebuilder_picks_up_writes_made_elsewhere(database):
+    insert_restaurant(database, "Samosa House")
+    rebuilder = AutocompleteRebuilder(max_limit=5)
+    rebuilder.rebuild()
+    assert not rebuilder.refresh()
+
+    # As another replica or a manual insert would: no hook runs in this process.
+    restaurant_id = insert_restaurant(database, "Tibs Corner")
+    assert get_autocomplete().suggest("tibs") == []
+    assert rebuilder.refresh()
+    assert [suggestion.id for suggestion in get_autocomplete().suggest("tibs")] == [restaurant_id]
+    assert not rebuilder.refresh()
+    assert rebuilder.stats()["rebuilds"] == 2
+
+
+def test_rebuilder_rebuilds_an_old_index_without_a_version_change(database):
+    insert_restaurant(database, "Samosa House")
+    rebuilder = AutocompleteRebuilder(max_limit=5, max_age=0.0)
+    first = rebuilder.rebuild()
+    assert rebuilder.refresh()
+    assert get_autocomplete() is not first
+    assert len(get_autocomplete()) == 1
@@ -0,0 +1,115 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+
+import shared.cache
+from shared.cache import LRUCache, init_cache
+from shared.database import init_database
+from app.config import settings
+from app.models import Menu, MenuItem, Restaurant
+from app.routes.batch import batch_get_menu_items, batch_get_menus, batch_get_restaurants
+from app.schemas.batch import BatchGetRequest
+from app.services.menu_item_service import MenuItemService
+from app.services.menu_service import MenuService
+from app.services.restaurant_service import RestaurantService
+
+NOW = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture(params=[False, True], ids=["uncached", "cached"])
+def database(request, tmp_path):
+    previous = shared.cache._cache
+    shared.cache._cache = None
+    if request.param:
+        init_cache(LRUCache(max_size=100, ttl=30.0))
+    db = init_database(f"sqlite:///{tmp_path / 'batch.db'}")
+    db.create_tables()
+    restaurant_ids = [uuid4() for _ in range(5)]
+    menu_ids = [uuid4() for _ in range(5)]
+    item_ids = [uuid4() for _ in range(5)]
+    with db.get_session() as session:
+        session.execute(insert(Restaurant), [
+            dict(id=id, owner_id=uuid4(), name=f"Restaurant {n}", created_at=NOW, updated_at=NOW)
+            for n, id in enumerate(restaurant_ids)
+        ])
+        session.execute(insert(Menu), [
+            dict(id=id, restaurant_id=restaurant_ids[0], kind=f"menu {n}", created_at=NOW, updated_at=NOW)
+            for n, id in enumerate(menu_ids)
+        ])
+        session.execute(insert(MenuItem), [
+            dict(id=id, menu_id=menu_ids[0], name=f"Item {n}", price=Decimal("9.50"), created_at=NOW, updated_at=NOW)
+            for n, id in enumerate(item_ids)
+        ])
+    yield {"restaurants": restaurant_ids, "menus": menu_ids, "menu_items": item_ids}
+    shared.cache._cache = previous
+
+
+ROUTES = {
+    "restaurants": (batch_get_restaurants, RestaurantService),
+    "menus": (batch_get_menus, MenuService),
+    "menu_items": (batch_get_menu_items, MenuItemService),
+}
+
+
+def batch_get(kind, ids):
+    route, service = ROUTES[kind]
+    response = route(BatchGetRequest(ids=ids), service())
+    assert response.status_code == 200
+    body = json.loads(response.body)
+    return [UUID(item["id"]) for item in body["items"]], [UUID(id) for id in body["missing"]]
+
+
+@pytest.mark.parametrize("kind", ROUTES)
+def test_items_come_back_in_request_order(database, kind):
+    ids = database[kind]
+    order = [ids[3], ids[0], ids[4], ids[1]]
+    assert batch_get(kind, order) == (order, [])
+    # Again, with some of them now cached (when a cache is configured).
+    order = [ids[2], ids[4], ids[3], ids[0]]
+    assert batch_get(kind, order) == (order, [])
+
+
+@pytest.mark.parametrize("kind", ROUTES)
+def test_unknown_ids_are_reported_missing_in_request_order(database, kind):
+    ids = database[kind]
+    unknown = [uuid4(), uuid4()]
+    items, missing = batch_get(kind, [unknown[0], ids[2], unknown[1], ids[0]])
+    assert items == [ids[2], ids[0]]
+    assert missing == unknown
+    assert batch_get(kind, unknown[:1]) == ([], unknown[:1])
+
+
+@pytest.mark.parametrize("kind", ROUTES)
+def test_duplicate_ids_are_returned_once_at_their_first_position(database, kind):
+    ids = database[kind]
+    unknown = uuid4()
+    items, missing = batch_get(kind, [ids[1], unknown, ids[0], ids[1], unknown, ids[0]])
+    assert items == [ids[1], ids[0]]
+    assert missing == [unknown]
+
+
+@pytest.mark.parametrize("kind", ROUTES)
+def test_at_most_max_ids_distinct_ids_are_accepted(database, kind):
+    limit = settings.batch_get_max_ids
+    ids = [uuid4() for _ in range(limit)]
+    items, missing = batch_get(kind, ids)
+    assert items == [] and len(missing) == limit
+
+    # Duplicates do not count towards the limit.
+    assert len(batch_get(kind, ids + ids[:10])[1]) == limit
+
+    with pytest.raises(HTTPException) as refused:
+        batch_get(kind, ids + [uuid4()])
+    assert refused.value.status_code == 422
+    assert str(limit) in refused.value.detail
+
+
+def test_empty_request_is_rejected():
+    with pytest.raises(ValidationError):
+        BatchGetRequest(ids=[])
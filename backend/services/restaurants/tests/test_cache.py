@@ -0,0 +1,127 @@
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+import shared.cache
+from shared.cache import EntityCache, LRUCache, init_cache
+
+Base = declarative_base()
+
+
+class Dish(Base):
+    __tablename__ = "dishes"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+
+
+dish_cache = EntityCache("dish", Dish)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(shared.cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def backend():
+    previous = shared.cache._cache
+    backend = init_cache(LRUCache(max_size=100, ttl=30.0))
+    yield backend
+    shared.cache._cache = previous
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        session.add_all([Dish(id=1, name="soup"), Dish(id=2, name="salad")])
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def test_lru_entries_expire_after_ttl(clock):
+    cache = LRUCache(ttl=30.0)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60.0)
+    clock[0] += 30.0
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.snapshot()["expirations"] == 1
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.snapshot()["evictions"] == 1
+
+
+def test_lru_does_not_store_none():
+    cache = LRUCache()
+    cache.set("a", None)
+    assert cache.snapshot()["size"] == 0
+
+
+def test_entity_cache_misses_until_initialized(monkeypatch):
+    monkeypatch.setattr(shared.cache, "_cache", None)
+    dish_cache.set(1, "soup", dish_cache.epoch)
+    assert dish_cache.get(1) is None
+    assert dish_cache.get_many([1]) == {}
+
+
+def test_entity_cache_get_many_returns_only_hits(backend):
+    dish_cache.set(1, "soup", dish_cache.epoch)
+    assert dish_cache.get_many([1, 2]) == {1: "soup"}
+
+
+def test_load_started_before_an_invalidation_is_not_stored(backend):
+    epoch = dish_cache.epoch
+    dish_cache.invalidate(2)
+    dish_cache.set(2, "stale salad", epoch)
+    assert dish_cache.get(2) is None
+    dish_cache.set(2, "salad", dish_cache.epoch)
+    assert dish_cache.get(2) == "salad"
+
+
+@pytest.mark.parametrize("change", ["update", "delete"])
+def test_commit_invalidates_changed_rows_and_bumps_epoch(backend, session, change):
+    dish_cache.set(1, "soup", dish_cache.epoch)
+    dish_cache.set(2, "salad", dish_cache.epoch)
+    dish = session.get(Dish, 1)
+    if change == "update":
+        dish.name = "stew"
+    else:
+        session.delete(dish)
+    session.flush()
+    epoch = dish_cache.epoch
+
+    assert dish_cache.get(1) == "soup"
+    session.commit()
+
+    assert dish_cache.get(1) is None
+    assert dish_cache.get(2) == "salad"
+    assert dish_cache.epoch > epoch
+
+
+def test_rollback_discards_pending_invalidations(backend, session):
+    dish_cache.set(1, "soup", dish_cache.epoch)
+    session.get(Dish, 1).name = "stew"
+    session.flush()
+    session.rollback()
+    epoch = dish_cache.epoch
+
+    session.get(Dish, 2).name = "greens"
+    session.commit()
+
+    assert dish_cache.get(1) == "soup"
+    assert dish_cache.get(2) is None
+    assert dish_cache.epoch == epoch + 1
@@ -0,0 +1,108 @@
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert
+
+import app.catalog
+from shared.database import init_database
+from shared.pagination import decode_cursor
+from app.catalog import ColumnarCatalog
+from app.models import Menu, MenuItem, Restaurant
+from app.services.browse_service import BrowseService
+
+PRICES = [Decimal(price) for price in ("8.00", "8.01", "9.99", "12.50", "15.99", "16.00")]
+RATINGS = [None, 0.0, 3.99, 4.0, 4.01, 5.0]
+NOW = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+# Few distinct prices and timestamps, so most pages break ties on the id.
+TIMESTAMPS = [NOW - timedelta(days=days, microseconds=days * 7) for days in range(4)]
+
+OWNER = uuid4()
+QUERIES = [
+    {},
+    {"min_price": Decimal("8.005"), "max_price": Decimal("15.999")},
+    {"min_price": Decimal("8.01"), "max_price": Decimal("16")},
+    {"min_price": Decimal("9.991")},
+    {"max_price": Decimal("7.999")},
+    {"min_rating": 4.0},
+    {"min_rating": 0.0, "menu_kind": "dinner"},
+    {"menu_kind": "brunch"},
+    {"owner_id": OWNER, "max_price": Decimal("12.5")},
+]
+
+
+@pytest.fixture(scope="module")
+def catalog(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("catalog")
+    db = init_database(f"sqlite:///{directory / 'catalog.db'}")
+    db.create_tables()
+    rng = random.Random(7)
+    restaurants, menus, items = [], [], []
+    for index, rating in enumerate(RATINGS * 2):
+        restaurant_id = uuid4()
+        restaurants.append(dict(
+            id=restaurant_id, owner_id=OWNER if index % 4 == 0 else uuid4(), name="Restaurant", rating=rating,
+            created_at=NOW, updated_at=NOW,
+        ))
+        for kind in ("lunch", "dinner"):
+            menu_id = uuid4()
+            menus.append(dict(id=menu_id, restaurant_id=restaurant_id, kind=kind, created_at=NOW, updated_at=NOW))
+            for _ in range(8):
+                created_at = rng.choice(TIMESTAMPS)
+                items.append(dict(
+                    id=uuid4(), menu_id=menu_id, name="Dish", description=rng.choice([None, "Spicy"]),
+                    price=rng.choice(PRICES), created_at=created_at, updated_at=created_at,
+                ))
+    with db.get_session() as session:
+        for model, rows in ((Restaurant, restaurants), (Menu, menus), (MenuItem, items)):
+            session.execute(insert(model), rows)
+    catalog = ColumnarCatalog(str(directory / "columns"))
+    catalog.refresh()
+    yield catalog
+    app.catalog.init_catalog(None)
+    db.engine.dispose()
+
+
+def _utc(value):
+    # SQLite hands back naive timestamps; Postgres and the catalog return UTC.
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _normalized_items(page) -> list[dict]:
+    return [{key: _utc(value) for key, value in item.model_dump().items()} for item in page.items]
+
+
+def _normalized_cursor(cursor, sort):
+    return None if cursor is None else [_utc(value) for value in decode_cursor(cursor, sort)]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("sort", ["price", "-price", "created_at", "-created_at"])
+@pytest.mark.parametrize("limit", [3, 7, 500])
+def test_catalog_and_sql_return_identical_pages(catalog, query, sort, limit):
+    service = BrowseService()
+    app.catalog.init_catalog(None)
+    everything = [item.id for item in service.browse_menu_items(**query, sort=sort, limit=1000).items]
+    seen = []
+    sql_cursor = catalog_cursor = None
+    while True:
+        app.catalog.init_catalog(None)
+        sql_page = service.browse_menu_items(**query, sort=sort, cursor=sql_cursor, limit=limit)
+        app.catalog.init_catalog(catalog)
+        catalog_page = service.browse_menu_items(**query, sort=sort, cursor=catalog_cursor, limit=limit)
+
+        assert _normalized_items(catalog_page) == _normalized_items(sql_page)
+        assert _normalized_cursor(catalog_page.next_cursor, sort) == _normalized_cursor(sql_page.next_cursor, sort)
+        if sort.lstrip("-") == "price":
+            assert catalog_page.next_cursor == sql_page.next_cursor
+        seen += [item.id for item in sql_page.items]
+        # Continue each path from the other's cursor, as a client does when
+        # the catalog goes stale or comes back mid-listing.
+        sql_cursor, catalog_cursor = catalog_page.next_cursor, sql_page.next_cursor
+        if sql_cursor is None:
+            break
+    assert seen == everything
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, insert
+from starlette.requests import Request
+
+from shared.conditional import page_etag
+from shared.database import init_database
+from shared.pagination import RowPage
+from app.models import Menu, Restaurant
+from app.routes.menus import list_menus
+from app.schemas.menu import MenuResponse
+from app.services.menu_service import MenuService
+
+NOW = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+def item(updated_at=NOW, id=None):
+    return SimpleNamespace(id=id or uuid4(), updated_at=updated_at)
+
+
+def test_page_etag_is_stable_for_the_same_rows():
+    items = [item(), item(NOW - timedelta(days=1))]
+    first = page_etag(RowPage(items, "abc", 2), "menus", "created_at", None, 2)
+    again = page_etag(RowPage(list(items), "abc", 2), "menus", "created_at", None, 2)
+    assert first == again
+
+
+def test_page_etag_changes_with_rows_cursor_and_listing():
+    items = [item(), item()]
+    etag = page_etag(RowPage(items, "abc", 2), "menus", None, 2)
+    touched = [items[0], item(NOW + timedelta(seconds=1), id=items[1].id)]
+    variants = [
+        page_etag(RowPage(touched, "abc", 2), "menus", None, 2),
+        page_etag(RowPage(items[:1], "abc", 2), "menus", None, 2),
+        page_etag(RowPage(items, None, 2), "menus", None, 2),
+        page_etag(RowPage(items, "abc", 2), "menu_items", None, 2),
+    ]
+    assert len({etag, *variants}) == 5
+
+
+@pytest.fixture
+def menus_db(tmp_path):
+    db = init_database(f"sqlite:///{tmp_path / 'conditional.db'}")
+    db.create_tables()
+    restaurant_id = uuid4()
+    with db.get_session() as session:
+        session.execute(insert(Restaurant), [dict(
+            id=restaurant_id, owner_id=uuid4(), name="Tibs Corner", created_at=NOW, updated_at=NOW,
+        )])
+        session.execute(insert(Menu), [
+            dict(id=uuid4(), restaurant_id=restaurant_id, kind=kind, created_at=NOW, updated_at=NOW)
+            for kind in ("lunch", "dinner", "brunch")
+        ])
+    return db, restaurant_id
+
+
+def get_menus(db, restaurant_id, **headers):
+    request = Request({
+        "type": "http",
+        "method": "GET",
+        "path": f"/restaurants/{restaurant_id}/menus",
+        "query_string": b"",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+    with db.unit_of_work(readonly=True) as session:
+        return list_menus(restaurant_id, request, "created_at", None, 10, MenuService(session))
+
+
+def test_unchanged_listing_is_answered_before_building_models(menus_db, monkeypatch):
+    db, restaurant_id = menus_db
+    response = get_menus(db, restaurant_id)
+    assert response.status_code == 200
+    assert "last-modified" not in response.headers
+
+    def fail(*args, **kwargs):
+        raise AssertionError("response model built for a 304")
+
+    monkeypatch.setattr(MenuResponse, "model_validate", fail)
+    revalidated = get_menus(db, restaurant_id, if_none_match=response.headers["etag"])
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == response.headers["etag"]
+
+
+def test_listing_ignores_if_modified_since_and_changes_etag_on_delete(menus_db):
+    db, restaurant_id = menus_db
+    first = get_menus(db, restaurant_id)
+    future = "Wed, 01 May 2030 12:00:00 GMT"
+    assert get_menus(db, restaurant_id, if_modified_since=future).status_code == 200
+
+    with db.get_session() as session:
+        session.execute(delete(Menu).where(Menu.kind == "brunch"))
+    after_delete = get_menus(db, restaurant_id, if_none_match=first.headers["etag"])
+    assert after_delete.status_code == 200
+    assert after_delete.headers["etag"] != first.headers["etag"]
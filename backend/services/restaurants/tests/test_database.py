@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from shared.database import Database
+
+
+@pytest.fixture
+def urls(tmp_path):
+    return {
+        "primary": f"sqlite:///{tmp_path / 'primary.db'}",
+        "replica": f"sqlite:///{tmp_path / 'replica.db'}",
+        "dead": f"sqlite:///{tmp_path / 'missing' / 'replica.db'}",
+    }
+
+
+def read_from(db: Database) -> str:
+    with db.get_session(readonly=True) as session:
+        return str(session.get_bind().url)
+
+
+def test_reads_rotate_over_replicas_and_skip_a_dead_one(urls):
+    db = Database(urls["primary"], replica_urls=[urls["replica"], urls["dead"]], replica_retry_interval=60.0)
+    assert [read_from(db) for _ in range(4)] == [urls["replica"]] * 4
+    replicas = db.stats()["replicas"]
+    assert [replica["available"] for replica in replicas] == [True, False]
+    # Marked down once, then left alone until the retry interval has passed.
+    assert [replica["consecutive_failures"] for replica in replicas] == [0, 1]
+
+
+def test_all_replicas_down_falls_back_to_the_primary(urls):
+    db = Database(urls["primary"], replica_urls=[urls["dead"]], replica_retry_interval=60.0)
+    assert read_from(db) == urls["primary"]
+    assert db.stats()["replicas"][0]["available"] is False
+
+
+def test_concurrent_failures_are_all_counted(urls):
+    # No retry delay: every read tries the dead replica once before the primary.
+    db = Database(urls["primary"], replica_urls=[urls["dead"]], replica_retry_interval=0.0)
+    threads, reads = 8, 25
+
+    def worker():
+        for _ in range(reads):
+            assert read_from(db) == urls["primary"]
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    assert db.stats()["replicas"][0]["consecutive_failures"] == threads * reads
+
+
+def test_replica_recovers(urls, tmp_path):
+    db = Database(urls["primary"], replica_urls=[urls["dead"]], replica_retry_interval=0.0)
+    assert read_from(db) == urls["primary"]
+    (tmp_path / "missing").mkdir()
+    assert read_from(db) == urls["dead"]
+    replica = db.stats()["replicas"][0]
+    assert (replica["available"], replica["consecutive_failures"]) == (True, 0)
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import math
+import random
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import insert, select
+
+from shared import geo
+from shared.database import init_database
+from app.config import settings
+from app.jobs.backfill_locations import backfill, parse_coordinates
+from app.models import Restaurant
+from app.routes import restaurants
+from app.services.restaurant_service import RestaurantService
+
+NOW = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+def destination(latitude, longitude, bearing, distance_km):
+    """The point ``distance_km`` from the start along ``bearing`` (degrees), on the same sphere."""
+    phi1, lambda1 = math.radians(latitude), math.radians(longitude)
+    theta, delta = math.radians(bearing), distance_km / geo.EARTH_RADIUS_KM
+    phi2 = math.asin(math.sin(phi1) * math.cos(delta) + math.cos(phi1) * math.sin(delta) * math.cos(theta))
+    lambda2 = lambda1 + math.atan2(
+        math.sin(theta) * math.sin(delta) * math.cos(phi1),
+        math.cos(delta) - math.sin(phi1) * math.sin(phi2),
+    )
+    return math.degrees(phi2), (math.degrees(lambda2) + 540.0) % 360.0 - 180.0
+
+
+def random_centre(rng):
+    latitude = rng.choice([rng.uniform(-80.0, 80.0), rng.uniform(85.0, 89.99), rng.uniform(-89.99, -85.0)])
+    longitude = rng.choice([rng.uniform(-180.0, 180.0), 179.9999, -179.9999, 0.0])
+    return latitude, longitude
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_covering_cells_hold_every_point_within_the_radius(seed):
+    rng = random.Random(seed)
+    for _ in range(400):
+        latitude, longitude = random_centre(rng)
+        radius = rng.choice([0.01, 0.5, 5.0, settings.nearby_max_radius_km, rng.uniform(0.01, 200.0)])
+        cells = geo.covering_cells(latitude, longitude, radius)
+        precision = len(cells[0])
+        assert all(len(cell) == precision for cell in cells)
+        for _ in range(40):
+            # Half the points on the circle itself, where a miss would show first.
+            distance = radius * (1 - 1e-6) * (1.0 if rng.random() < 0.5 else math.sqrt(rng.random()))
+            point = destination(latitude, longitude, rng.uniform(0.0, 360.0), distance)
+            assert geo.encode(*point, precision) in cells, (latitude, longitude, radius, point)
+
+
+KM_PER_DEGREE = 2 * math.pi * geo.EARTH_RADIUS_KM / 360.0
+
+
+@pytest.mark.parametrize("latitude", [0.0, 45.0, -60.0, 80.0])
+def test_precision_cells_span_the_radius(latitude):
+    previous = geo.STORED_PRECISION
+    for radius in (0.001, 0.01, 0.1, 1.0, 5.0, 20.0, 50.0):
+        precision = geo.precision_for_radius(latitude, radius)
+        height, width = geo.cell_size(precision)
+        assert height * KM_PER_DEGREE >= radius
+        # Cells at the circle's poleward edge are the narrowest it touches.
+        edge = math.radians(abs(latitude) + radius / KM_PER_DEGREE)
+        assert width * math.cos(edge) * KM_PER_DEGREE >= radius
+        assert precision <= previous
+        previous = precision
+        assert len(geo.covering_cells(latitude, 10.0, radius)) == 9
+
+
+def test_circle_over_a_pole_is_covered_by_whole_bands():
+    assert geo.precision_for_radius(89.9, 20.0) == 0
+    cells = geo.covering_cells(89.9, 10.0, 20.0)
+    # The far side of the pole is as close as the near side.
+    assert geo.encode(89.9, -170.0, len(cells[0])) in cells
+    assert geo.encode(89.7, 10.0, len(cells[0])) in cells
+    assert len(cells) == 32
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = init_database(f"sqlite:///{tmp_path / 'geo.db'}")
+    db.create_tables()
+    return db
+
+
+def insert_restaurants(db, rows):
+    with db.get_session() as session:
+        session.execute(insert(Restaurant), [
+            dict(id=uuid4(), owner_id=uuid4(), name=f"Restaurant {n}", created_at=NOW, updated_at=NOW, **row)
+            for n, row in enumerate(rows)
+        ])
+
+
+@pytest.mark.parametrize("centre", [(9.03, 38.74), (51.5, -0.12), (-36.85, 179.99)])
+def test_nearby_matches_brute_force(database, centre):
+    rng = random.Random(str(centre))
+    radii = (0.5, 5.0, 20.0, settings.nearby_max_radius_km)
+    points = []
+    while len(points) < 300:
+        point = destination(*centre, rng.uniform(0.0, 360.0), rng.uniform(0.0, 2 * settings.nearby_max_radius_km))
+        # Nothing within rounding of a tested circle, where SQL and Python arithmetic may disagree.
+        if all(abs(geo.haversine_km(*centre, *point) - radius) > 1e-6 for radius in radii):
+            points.append(point)
+    insert_restaurants(database, [
+        dict(latitude=lat, longitude=lon, geohash=geo.encode(lat, lon)) for lat, lon in points
+    ] + [dict(location="Bole Road")])
+    with database.get_session() as session:
+        distances = {
+            restaurant.id: geo.haversine_km(*centre, restaurant.latitude, restaurant.longitude)
+            for restaurant in session.scalars(select(Restaurant).where(Restaurant.latitude.is_not(None)))
+        }
+
+    service = RestaurantService()
+    for radius in radii:
+        within = sorted((distance, id) for id, distance in distances.items() if distance <= radius)
+        for limit in (1, 10, 500):
+            results = service.nearby(*centre, radius, limit)
+            assert [result.id for result in results] == [id for _, id in within[:limit]]
+            assert [result.distance_km for result in results] == pytest.approx([d for d, _ in within[:limit]])
+
+
+def call(app, path, query):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query.encode(), "headers": [],
+        "server": ("testserver", 80), "client": ("testclient", 50000),
+    }
+    asyncio.run(app(scope, receive, send))
+    body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+    return messages[0]["status"], json.loads(body)
+
+
+@pytest.mark.parametrize("radius, status", [
+    (settings.nearby_max_radius_km, 200),
+    (settings.nearby_max_radius_km + 0.1, 422),
+    (0, 422),
+    (-1, 422),
+])
+def test_nearby_route_enforces_the_radius_limits(database, radius, status):
+    insert_restaurants(database, [dict(latitude=9.03, longitude=38.74, geohash=geo.encode(9.03, 38.74))])
+    app = FastAPI()
+    app.include_router(restaurants.router)
+    code, body = call(app, "/restaurants/nearby", f"lat=9.03&lon=38.74&radius={radius}")
+    assert code == status
+    if status == 200:
+        assert len(body) == 1 and body[0]["distance_km"] == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize("location, expected", [
+    ("9.03, 38.74", (9.03, 38.74)),
+    (" -33.9,18.42 ", (-33.9, 18.42)),
+    ("91.0, 10.0", None),
+    ("10.0, 181", None),
+    ("Bole Road, Addis Ababa", None),
+    (None, None),
+])
+def test_parse_coordinates(location, expected):
+    assert parse_coordinates(location) == expected
+
+
+def test_backfill_locates_rows_once(database):
+    insert_restaurants(database, [
+        dict(latitude=9.03, longitude=38.74),
+        dict(location="51.5, -0.12"),
+        dict(location="Bole Road, Addis Ababa"),
+        dict(latitude=1.0, longitude=2.0, geohash=geo.encode(1.0, 2.0)),
+    ])
+
+    assert backfill(batch_size=1, dry_run=True) == {"scanned": 3, "located": 2, "skipped": 1}
+    with database.get_session() as session:
+        assert len(session.scalars(select(Restaurant.id).where(Restaurant.geohash.is_(None))).all()) == 3
+
+    assert backfill(batch_size=2) == {"scanned": 3, "located": 2, "skipped": 1}
+    with database.get_session() as session:
+        located = {r.location or r.latitude: r for r in session.scalars(select(Restaurant))}
+    assert located[9.03].geohash == geo.encode(9.03, 38.74)
+    assert (located["51.5, -0.12"].latitude, located["51.5, -0.12"].longitude) == (51.5, -0.12)
+    assert located["51.5, -0.12"].geohash == geo.encode(51.5, -0.12)
+    assert located["Bole Road, Addis Ababa"].geohash is None
+
+    # Re-running only revisits the row it could not place.
+    assert backfill(batch_size=2) == {"scanned": 1, "located": 0, "skipped": 1}
@@ -0,0 +1,47 @@
+import pytest
+
+from shared.cache import SizedLRUCache
+from app.routes.menu_snapshots import _accepts_gzip
+from app.services.menu_snapshot_service import snapshot_size
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", False),
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("br;q=1.0, gzip;q=0.8", True),
+    ("GZIP", True),
+    ("x-gzip", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.000", False),
+    ("deflate, gzip;q=0", False),
+    ("*", True),
+    ("*;q=0", False),
+    ("gzip;q=0, *", False),
+    ("identity", False),
+    ("gzip;q=oops", False),
+])
+def test_accepts_gzip_honours_q_values(header, expected):
+    assert _accepts_gzip(header) is expected
+
+
+def test_sized_cache_evicts_by_bytes():
+    cache = SizedLRUCache(max_bytes=100, size_of=snapshot_size)
+    cache.set("a", (b"x" * 30, b"x" * 10))
+    cache.set("b", (b"x" * 30, b"x" * 10))
+    cache.get("a")
+    cache.set("c", (b"x" * 30, b"x" * 10))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.snapshot()["bytes"] == 80
+
+
+def test_sized_cache_skips_values_over_budget_and_replaces_in_place():
+    cache = SizedLRUCache(max_bytes=100, size_of=snapshot_size)
+    cache.set("big", (b"x" * 90, b"x" * 20))
+    assert cache.get("big") is None
+    cache.set("a", (b"x" * 50, b""))
+    cache.set("a", (b"x" * 20, b""))
+    assert cache.snapshot()["bytes"] == 20
+    cache.delete("a")
+    assert cache.snapshot()["bytes"] == 0
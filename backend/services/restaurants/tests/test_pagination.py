@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, insert, select
+
+from shared.exceptions import ValidationError
+from shared.pagination import build_page, decode_cursor, encode_cursor, keyset_select, parse_sort
+
+metadata = MetaData()
+dishes = Table(
+    "dishes",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("name", String(50), nullable=False),
+    Column("calories", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+SORTS = {
+    "name": (dishes.c.name, dishes.c.id),
+    "calories": (dishes.c.calories, dishes.c.id),
+    "created_at": (dishes.c.created_at, dishes.c.id),
+}
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    rows = [
+        {
+            "id": str(uuid4()),
+            "name": f"dish {n % 7}",
+            "calories": n % 5 * 100,
+            "created_at": start + timedelta(minutes=n % 11),
+        }
+        for n in range(53)
+    ]
+    with engine.begin() as connection:
+        connection.execute(insert(dishes), rows)
+    yield engine
+    engine.dispose()
+
+
+def fetch_all(engine, sort: str, limit: int) -> tuple[list[str], int]:
+    ids, cursor, pages = [], None, 0
+    with engine.connect() as connection:
+        while True:
+            statement = keyset_select(select(dishes.c.id), SORTS, sort, cursor, limit)
+            page = build_page(connection.execute(statement).all(), sort, limit, lambda dish_id: dish_id)
+            assert len(page.items) <= limit
+            ids.extend(page.items)
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                return ids, pages
+
+
+@pytest.mark.parametrize("value", [
+    datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    datetime(2024, 5, 1, 12, 30),
+    UUID("12345678-1234-5678-1234-567812345678"),
+    Decimal("12.50"),
+    4.25,
+    42,
+    "Café ☕",
+])
+def test_cursor_round_trips_typed_values(value):
+    (decoded,) = decode_cursor(encode_cursor("name", [value]), "name")
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+def test_cursor_is_url_safe_and_unpadded():
+    cursor = encode_cursor("-created_at", [datetime(2024, 1, 1), uuid4()])
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+def test_cursor_is_bound_to_its_sort():
+    cursor = encode_cursor("name", ["a", uuid4()])
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor, "-name")
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", encode_cursor("name", [])[:-2] + "!!"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor, "name")
+
+
+def test_unencodable_value_raises():
+    with pytest.raises(TypeError):
+        encode_cursor("name", [object()])
+
+
+def test_parse_sort_direction_and_unknown_sort():
+    assert parse_sort("-name", SORTS) == (SORTS["name"], True)
+    assert parse_sort("name", SORTS) == (SORTS["name"], False)
+    with pytest.raises(ValidationError) as error:
+        parse_sort("price", SORTS)
+    assert "-name" in error.value.details["allowed"]
+
+
+def test_cursor_with_wrong_arity_is_rejected(engine):
+    with pytest.raises(ValidationError):
+        keyset_select(select(dishes.c.id), SORTS, "name", encode_cursor("name", ["dish 1"]), 10)
+
+
+@pytest.mark.parametrize("sort", ["name", "-name", "calories", "-calories", "created_at", "-created_at"])
+@pytest.mark.parametrize("limit", [1, 4, 10, 53, 100])
+def test_pages_cover_the_sorted_collection_exactly_once(engine, sort, limit):
+    column = sort.lstrip("-")
+    with engine.connect() as connection:
+        rows = connection.execute(select(dishes.c.id, dishes.c[column])).all()
+    expected = [row.id for row in sorted(rows, key=lambda row: (row[1], row.id), reverse=sort.startswith("-"))]
+
+    ids, pages = fetch_all(engine, sort, limit)
+
+    assert ids == expected
+    # limit + 1 rows are fetched, so an exactly full last page has no next cursor.
+    assert pages == -(-len(expected) // limit)
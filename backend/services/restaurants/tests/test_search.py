@@ -0,0 +1,108 @@
+import os
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from shared.database import Base, init_database
+from shared.pagination import encode_cursor
+from app.models import Menu, MenuItem, Restaurant
+from app.services.search_service import MenuItemSearchIndex, SearchService, _search_statement
+
+# A scratch Postgres database; the test works in a throwaway schema.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+def page_through(search, sort: str, limit: int) -> list:
+    ids, cursor = [], None
+    while True:
+        page = search(sort, cursor, limit)
+        ids.extend(item.id for item in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            return ids
+
+
+def test_rank_is_float8_in_select_order_and_cursor():
+    cursor = encode_cursor("-rank", [0.1, uuid4()])
+    statement = _search_statement(["chick"], None, None, None, "-rank", cursor, 5)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    select_list, _, rest = sql.partition("\nFROM ")
+    where, _, order_by = rest.partition(" ORDER BY ")
+    rank = "CAST(ts_rank_cd(menu_items.search_vector, to_tsquery("
+    assert f"{rank}" in select_list and "AS DOUBLE PRECISION) AS keyset_0" in select_list
+    assert f"({rank}" in where and "AS DOUBLE PRECISION), menu_items.id) < (" in where
+    assert order_by.startswith("keyset_0 DESC, keyset_1 DESC")
+
+
+def test_search_vector_is_created_on_postgres_only():
+    postgres = postgresql.dialect()
+    table = str(CreateTable(MenuItem.__table__).compile(dialect=postgres))
+    assert "search_vector TSVECTOR GENERATED ALWAYS AS (setweight(" in table and ") STORED" in table
+    indexes = [str(CreateIndex(index).compile(dialect=postgres)) for index in MenuItem.__table__.indexes]
+    assert "CREATE INDEX ix_menu_items_search_vector ON menu_items USING gin (search_vector)" in indexes
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    columns = {column["name"] for column in inspect(engine).get_columns("menu_items")}
+    assert "search_vector" not in columns and "name" in columns
+    assert "ix_menu_items_search_vector" not in {index["name"] for index in inspect(engine).get_indexes("menu_items")}
+    engine.dispose()
+
+
+@pytest.mark.parametrize("sort", ["rank", "-rank"])
+def test_fallback_index_pages_through_tied_ranks(sort):
+    menu_id, restaurant_id, now = uuid4(), uuid4(), datetime.now(timezone.utc)
+    rows = [
+        (MenuItem(id=uuid4(), menu_id=menu_id, name=name, price=5, created_at=now, updated_at=now), restaurant_id)
+        for name in ["Chicken Tikka"] * 9 + ["Chicken Soup"] * 4 + ["Chickpea Salad"]
+    ]
+    index = MenuItemSearchIndex(rows)
+
+    ids = page_through(lambda sort, cursor, limit: index.search(["chick"], sort, cursor, limit), sort, 4)
+
+    assert sorted(ids) == sorted(item.id for item, _ in rows)
+    assert len(ids) == len(set(ids))
+
+
+@pytest.fixture
+def postgres_session():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    schema = f"test_search_{uuid4().hex[:12]}"
+    init_database(TEST_DATABASE_URL)
+    engine = create_engine(TEST_DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+        Base.metadata.create_all(connection)
+    try:
+        with Session(engine) as session:
+            yield session
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        engine.dispose()
+
+
+@pytest.mark.parametrize("sort", ["rank", "-rank"])
+def test_postgres_search_pages_through_tied_ranks(postgres_session, sort):
+    restaurant = Restaurant(owner_id=uuid4(), name="Tikka House")
+    menu = Menu(restaurant=restaurant, kind="main")
+    # ts_rank_cd of these is not exactly representable in float4, so a cursor
+    # compared at a different precision would skip or repeat tied rows.
+    names = ["Chicken Tikka"] * 9 + ["Chicken Tikka Masala"] * 6 + ["Chicken Soup with chicken"] * 4
+    items = [MenuItem(menu=menu, name=name, description="chicken", price=9) for name in names]
+    postgres_session.add_all([restaurant, menu, *items])
+    postgres_session.commit()
+    service = SearchService(postgres_session)
+
+    ids = page_through(
+        lambda sort, cursor, limit: service.search_menu_items("chick", sort=sort, cursor=cursor, limit=limit), sort, 4
+    )
+
+    assert sorted(ids) == sorted(item.id for item in items)
+    assert len(ids) == len(set(ids))
@@ -0,0 +1,48 @@
+"""Store refresh tokens as SHA-256 digests and drop redundant indexes
+
+Rows that are already expired or revoked are deleted first, so the rewrite
+only touches live tokens. Live rows get token_hash = sha256(token); the token
+column and the indexes on id (duplicate of the primary key), is_revoked
+(boolean, never selective) and token (replaced by the digest) are dropped.
+
+Revision ID: 000000000003
+Revises: 000000000002
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '000000000003'
+down_revision: Union[str, Sequence[str], None] = '000000000002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DELETE FROM refresh_tokens WHERE expires_at < now() OR is_revoked")
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+    op.execute("UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))")
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=True)
+    op.create_index(
+        'ix_refresh_tokens_revoked', 'refresh_tokens', ['id'], unique=False, postgresql_where=sa.text('is_revoked')
+    )
+    op.drop_index('ix_refresh_tokens_token', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_is_revoked', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_id', table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token')
+
+
+def downgrade() -> None:
+    # Digests cannot be turned back into tokens: every session has to sign in again.
+    op.execute("DELETE FROM refresh_tokens")
+    op.add_column('refresh_tokens', sa.Column('token', sa.String(length=255), nullable=False))
+    op.create_index('ix_refresh_tokens_id', 'refresh_tokens', ['id'], unique=False)
+    op.create_index('ix_refresh_tokens_is_revoked', 'refresh_tokens', ['is_revoked'], unique=False)
+    op.create_index('ix_refresh_tokens_token', 'refresh_tokens', ['token'], unique=True)
+    op.drop_index('ix_refresh_tokens_revoked', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_token_hash', table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
@@ -0,0 +1,33 @@
+"""Case-insensitive unique index on users.email
+
+Sign-in filtered with email ILIKE, which no index can serve. Stored emails
+are lower-cased (registration already did this for new rows) and the plain
+unique index is replaced by a unique index on lower(email), which equality
+lookups on lower(email) use. Fails if two accounts differ only by case;
+those have to be merged first.
+
+Revision ID: 000000000004
+Revises: 000000000003
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '000000000004'
+down_revision: Union[str, Sequence[str], None] = '000000000003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+    op.drop_index('ix_users_email', table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -2,8 +2,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from uuid import UUID
 from shared.logging import get_logger
-from app.services.auth_service import AuthService
-from app.services.profile_service import ProfileService
+from app.services.auth_service import AsyncAuthService
+from app.services.profile_service import AsyncProfileService
 from app.schemas.user import UserResponse
 
 logger = get_logger("users.dependencies")
@@ -11,20 +11,22 @@ logger = get_logger("users.dependencies")
 security = HTTPBearer()
 
 
-def get_auth_service() -> AuthService:
-    return AuthService()
+# The routes are all ``async def``, so they always get the asyncpg-backed
+# services; see the note on ``init_async_database`` in app/main.py.
+def get_auth_service() -> AsyncAuthService:
+    return AsyncAuthService()
 
 
-def get_profile_service() -> ProfileService:
-    return ProfileService()
+def get_profile_service() -> AsyncProfileService:
+    return AsyncProfileService()
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ) -> UserResponse:
     token = credentials.credentials
-    user = auth_service.validate_access_token(token)
+    user = await auth_service.validate_access_token(token)
     if not user:
         logger.warning("Invalid access token in request")
         raise HTTPException(
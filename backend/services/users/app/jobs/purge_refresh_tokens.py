@@ -0,0 +1,122 @@
+"""Delete expired and revoked refresh tokens in small batches.
+
+Each batch picks at most ``batch_size`` rows with ``FOR UPDATE SKIP LOCKED``
+and deletes them in its own short transaction, so the purge never holds
+more than one batch of row locks and never waits on a concurrent logout or
+refresh. Runs in the background of the users service (see
+``RefreshTokenPurger``) and can be run by hand:
+
+Run from ``backend/services/users``:
+
+    PYTHONPATH=.:../.. python -m app.jobs.purge_refresh_tokens
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, func, or_, select
+
+from shared.database import init_database, get_database
+from shared.logging import get_logger, setup_logging
+from shared.metrics import Counter
+
+from app.config import settings
+from app.models.refresh_token import RefreshToken
+
+logger = get_logger("users.purge_refresh_tokens")
+
+
+def _purge_statement(batch_size: int):
+    victims = (
+        select(RefreshToken.id)
+        .where(or_(RefreshToken.expires_at < func.now(), RefreshToken.is_revoked))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return delete(RefreshToken).where(RefreshToken.id.in_(victims.scalar_subquery()))
+
+
+def purge_refresh_tokens(batch_size: int, max_batches: Optional[int] = None, pause: float = 0.0) -> int:
+    db = get_database()
+    purged = batches = 0
+    while max_batches is None or batches < max_batches:
+        with db.get_session() as session:
+            deleted = session.execute(_purge_statement(batch_size)).rowcount
+            session.commit()
+        purged += deleted
+        batches += 1
+        if deleted < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return purged
+
+
+class RefreshTokenPurger:
+    def __init__(self, interval: float, batch_size: int, max_batches: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.purged = Counter()
+        self.runs = Counter()
+        self.failures = Counter()
+        self.last_run_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def purge_once(self) -> int:
+        started = time.perf_counter()
+        purged = purge_refresh_tokens(self.batch_size, self.max_batches)
+        self.last_run_seconds = time.perf_counter() - started
+        self.purged.inc(purged)
+        self.runs.inc()
+        if purged:
+            logger.info("Purged refresh tokens", extra={"purged": purged, "seconds": round(self.last_run_seconds, 3)})
+        return purged
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.purge_once)
+            except Exception as e:
+                self.failures.inc()
+                logger.error("Refresh token purge failed", extra={"error": str(e)})
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "purged": self.purged.value,
+            "runs": self.runs.value,
+            "failures": self.failures.value,
+            "last_run_seconds": self.last_run_seconds,
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=settings.refresh_token_purge_batch_size)
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds to sleep between batches")
+    args = parser.parse_args()
+
+    setup_logging(service_name="users-purge-refresh-tokens", log_level="INFO")
+    init_database(settings.database_url)
+    purged = purge_refresh_tokens(args.batch_size, pause=args.pause)
+    logger.info("Refresh token purge finished", extra={"purged": purged})
+
+
+if __name__ == "__main__":
+    main()
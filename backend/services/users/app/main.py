@@ -1,12 +1,21 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from shared.logging import setup_logging, get_logger
-from shared.database import init_database, get_database
+from shared.cache import LRUCache, init_cache
+from shared.database import init_database, get_database, init_async_database, get_async_database
 from shared.exceptions import BitezException
+from shared.health import init_health_monitor, get_health_monitor
+from shared.metrics import collect_metrics, register_metrics
+from shared.middleware import QueryStatsMiddleware
 from app.config import settings
+from app.jobs.purge_refresh_tokens import RefreshTokenPurger
+from app.utils.revocation import RevocationSet, init_revocations
+from app.utils.throttle import LoginThrottle, MemoryThrottleBackend, init_login_throttle
+from app.utils.password_pool import PasswordPool, init_password_pool, get_password_pool
 from app.routes import auth, profiles
 
 logger = setup_logging(
@@ -29,7 +38,8 @@ async def lifespan(app: FastAPI):
             pool_size=10,
             max_overflow=20,
             pool_pre_ping=True,
-            echo=settings.debug
+            echo=settings.debug,
+            slow_query_threshold=settings.slow_query_threshold_ms / 1000
         )
         db = get_database()
         
@@ -38,12 +48,66 @@ async def lifespan(app: FastAPI):
         else:
             logger.error("Database health check failed")
             raise RuntimeError("Database connection failed")
+
+        # Not optional, unlike the restaurants service's plain ``def`` routes
+        # on the threadpool: every route here is ``async def``, so the sync
+        # services would run their queries on the event loop. The sync engine
+        # above serves the revocation set load, the purge job and health checks.
+        init_async_database(
+            settings.database_url,
+            pool_size=10,
+            max_overflow=20,
+            pool_pre_ping=True,
+            echo=settings.debug,
+            slow_query_threshold=settings.slow_query_threshold_ms / 1000
+        )
     except Exception as e:
         logger.error("Failed to initialize database", extra={"error": str(e)})
         raise
+    if settings.user_cache_enabled:
+        cache = init_cache(LRUCache(max_size=settings.user_cache_max_size, ttl=settings.user_cache_ttl))
+        register_metrics("cache", cache.snapshot)
+    if settings.login_throttle_enabled:
+        throttle = init_login_throttle(LoginThrottle(
+            MemoryThrottleBackend(max_keys=settings.login_throttle_max_keys),
+            email_limit=settings.login_throttle_email_limit,
+            ip_limit=settings.login_throttle_ip_limit,
+            window=settings.login_throttle_window
+        ))
+        register_metrics("login_throttle", throttle.stats)
+    if settings.revocation_set_enabled:
+        revocations = RevocationSet(max_entries=settings.revocation_set_max_entries)
+        await asyncio.to_thread(revocations.load)
+        init_revocations(revocations)
+        register_metrics("revocations", revocations.stats)
+    if settings.password_pool_workers:
+        pool = init_password_pool(PasswordPool(settings.password_pool_workers, settings.password_pool_max_queue))
+        register_metrics("password_pool", pool.stats)
+
+    health_monitor = init_health_monitor(
+        settings.database_url,
+        interval=settings.health_check_interval,
+        timeout=settings.health_check_timeout
+    )
+    await health_monitor.start()
+    purger = None
+    if settings.refresh_token_purge_enabled:
+        purger = RefreshTokenPurger(
+            settings.refresh_token_purge_interval,
+            settings.refresh_token_purge_batch_size,
+            settings.refresh_token_purge_max_batches
+        )
+        register_metrics("refresh_token_purge", purger.stats)
+        await purger.start()
     
     yield
     
+    if purger is not None:
+        await purger.stop()
+    await health_monitor.stop()
+    if get_password_pool() is not None:
+        get_password_pool().shutdown()
+    await get_async_database().dispose()
     logger.info("Users service shutting down")
 
 
@@ -65,6 +129,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    QueryStatsMiddleware,
+    statement_budget=settings.sql_statement_budget,
+    repeated_statement_threshold=settings.sql_repeated_statement_threshold
+)
 
 
 @app.exception_handler(BitezException)
@@ -108,23 +177,28 @@ async def root():
 
 @app.get("/health")
 async def health():
-    db = get_database()
-    db_healthy = db.health_check()
+    monitor = get_health_monitor()
+    db_healthy = monitor.is_healthy("database")
     return {
-        "status": "healthy" if db_healthy else "unhealthy",
+        "status": "healthy" if monitor.all_healthy() else "unhealthy",
         "service": "users",
-        "database": "connected" if db_healthy else "disconnected"
+        "database": "connected" if db_healthy else "disconnected",
+        "checks": monitor.status()
     }
 
 
 @app.get("/health/ready")
 async def readiness():
-    db = get_database()
-    db_ready = db.health_check()
-    if not db_ready:
+    monitor = get_health_monitor()
+    if not monitor.all_healthy():
         return JSONResponse(
             status_code=503,
-            content={"status": "not ready", "service": "users", "database": "not connected"}
+            content={
+                "status": "not ready",
+                "service": "users",
+                "database": "connected" if monitor.is_healthy("database") else "not connected",
+                "checks": monitor.status()
+            }
         )
     return {"status": "ready", "service": "users"}
 
@@ -132,3 +206,8 @@ async def readiness():
 @app.get("/health/live")
 async def liveness():
     return {"status": "alive", "service": "users"}
+
+
+@app.get("/metrics")
+async def metrics():
+    return {"service": "users", **collect_metrics()}
@@ -1,6 +1,6 @@
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, Boolean, DateTime, ForeignKey, Index, LargeBinary, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from shared.database import Base
@@ -8,12 +8,18 @@ from shared.database import Base
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Only revoked rows, which the purge job deletes; stays tiny.
+        Index("ix_refresh_tokens_revoked", "id", postgresql_where="is_revoked"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    token = Column(String(255), unique=True, nullable=False, index=True)
+    # SHA-256 of the token; the token itself is never stored.
+    token_hash = Column(LargeBinary(32), unique=True, nullable=False, index=True)
     expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
-    is_revoked = Column(Boolean, default=False, nullable=False, index=True)
+    is_revoked = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     user = relationship("User", backref="refresh_tokens")
@@ -1,5 +1,5 @@
 from uuid import uuid4
-from sqlalchemy import Column, String, Boolean, DateTime, func
+from sqlalchemy import Column, String, Boolean, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from shared.database import Base
 
@@ -11,9 +11,10 @@ USER_ROLES = (ROLE_CUSTOMER, ROLE_RESTAURANT_OWNER, ROLE_DELIVERY_PERSON)
 
 class User(Base):
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4, index=True)
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    email = Column(String(255), nullable=False)
     password_hash = Column(String(255), nullable=False)
     first_name = Column(String(100), nullable=True)
     last_name = Column(String(100), nullable=True)
@@ -27,3 +28,8 @@ class User(Base):
         onupdate=func.now(),
         nullable=False
     )
+
+    __table_args__ = (
+        # Case-insensitive uniqueness, and the index behind sign-in lookups.
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+    )
@@ -6,6 +6,7 @@ from shared.database import Base
 
 class UserProfile(Base):
     __tablename__ = "user_profiles"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), unique=True, nullable=False, index=True)
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+import math
+from fastapi import APIRouter, HTTPException, Request, status, Depends
 from shared.logging import get_logger
-from shared.exceptions import ValidationError
+from shared.exceptions import ValidationError, ServiceUnavailableError, TooManyRequestsError
 
 from app.schemas.auth import (
     UserRegister,
@@ -10,7 +11,7 @@ from app.schemas.auth import (
     TokenValidationResponse
 )
 from app.schemas.user import UserResponse
-from app.services.auth_service import AuthService
+from app.services.auth_service import AsyncAuthService
 from app.dependencies import get_current_user, get_auth_service
 from app.config import settings
 
@@ -22,10 +23,10 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 @router.post("/signup", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def signup(
     user_data: UserRegister,
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     try:
-        user, access_token, refresh_token = auth_service.register_user(user_data)
+        user, access_token, refresh_token = await auth_service.register_user(user_data)
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -36,6 +37,8 @@ async def signup(
     except ValidationError as e:
         logger.warning("Signup failed", extra={"error": e.message, "email": user_data.email})
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    except ServiceUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=e.message, headers={"Retry-After": "1"})
     except Exception as e:
         logger.error("Signup error", extra={"error": str(e), "email": user_data.email})
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to register user")
@@ -44,10 +47,13 @@ async def signup(
 @router.post("/signin", response_model=TokenResponse, status_code=status.HTTP_200_OK)
 async def signin(
     login_data: UserLogin,
-    auth_service: AuthService = Depends(get_auth_service)
+    request: Request,
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
+    # nginx forwards the caller's address as X-Real-IP.
+    client_ip = request.headers.get("x-real-ip") or (request.client.host if request.client else None)
     try:
-        user, access_token, refresh_token = auth_service.login_user(login_data)
+        user, access_token, refresh_token = await auth_service.login_user(login_data, client_ip)
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -58,6 +64,14 @@ async def signin(
     except ValidationError as e:
         logger.warning("Signin failed", extra={"error": e.message, "email": login_data.email})
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=e.message)
+    except TooManyRequestsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=e.message,
+            headers={"Retry-After": str(max(math.ceil(e.retry_after), 1))}
+        )
+    except ServiceUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=e.message, headers={"Retry-After": "1"})
     except Exception as e:
         logger.error("Signin error", extra={"error": str(e), "email": login_data.email})
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to authenticate user")
@@ -66,10 +80,10 @@ async def signin(
 @router.post("/refresh", response_model=dict, status_code=status.HTTP_200_OK)
 async def refresh_token(
     token_data: TokenRefresh,
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     try:
-        access_token = auth_service.refresh_access_token(token_data.refresh_token)
+        access_token = await auth_service.refresh_access_token(token_data.refresh_token)
         return {
             "access_token": access_token,
             "token_type": "bearer",
@@ -86,10 +100,10 @@ async def refresh_token(
 @router.post("/logout", status_code=status.HTTP_200_OK)
 async def logout(
     token_data: TokenRefresh,
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     try:
-        auth_service.logout_user(token_data.refresh_token)
+        await auth_service.logout_user(token_data.refresh_token)
         return {"message": "Logged out successfully"}
     except ValidationError as e:
         logger.warning("Logout failed", extra={"error": e.message})
@@ -8,7 +8,7 @@ from app.schemas.user_profile import (
     UserProfileUpdate,
     UserProfileResponse
 )
-from app.services.profile_service import ProfileService
+from app.services.profile_service import AsyncProfileService
 from app.dependencies import get_current_user_id, get_profile_service
 
 logger = get_logger("users.profiles")
@@ -19,10 +19,10 @@ router = APIRouter(prefix="/profiles", tags=["profiles"])
 @router.get("/me", response_model=UserProfileResponse, status_code=status.HTTP_200_OK)
 async def get_my_profile(
     current_user_id: UUID = Depends(get_current_user_id),
-    profile_service: ProfileService = Depends(get_profile_service)
+    profile_service: AsyncProfileService = Depends(get_profile_service)
 ):
     try:
-        profile = profile_service.get_profile(current_user_id)
+        profile = await profile_service.get_profile(current_user_id)
         
         if not profile:
             raise NotFoundError("Profile not found")
@@ -54,10 +54,10 @@ async def get_my_profile(
 async def create_profile(
     profile_data: UserProfileCreate,
     current_user_id: UUID = Depends(get_current_user_id),
-    profile_service: ProfileService = Depends(get_profile_service)
+    profile_service: AsyncProfileService = Depends(get_profile_service)
 ):
     try:
-        profile = profile_service.create_profile(current_user_id, profile_data)
+        profile = await profile_service.create_profile(current_user_id, profile_data)
         
         return profile
         
@@ -84,10 +84,10 @@ async def create_profile(
 async def update_my_profile(
     profile_data: UserProfileUpdate,
     current_user_id: UUID = Depends(get_current_user_id),
-    profile_service: ProfileService = Depends(get_profile_service)
+    profile_service: AsyncProfileService = Depends(get_profile_service)
 ):
     try:
-        profile = profile_service.update_profile(current_user_id, profile_data)
+        profile = await profile_service.update_profile(current_user_id, profile_data)
         
         return profile
         
@@ -117,10 +117,10 @@ async def update_my_profile(
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_my_profile(
     current_user_id: UUID = Depends(get_current_user_id),
-    profile_service: ProfileService = Depends(get_profile_service)
+    profile_service: AsyncProfileService = Depends(get_profile_service)
 ):
     try:
-        profile_service.delete_profile(current_user_id)
+        await profile_service.delete_profile(current_user_id)
         
         return None
         
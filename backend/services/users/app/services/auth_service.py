@@ -1,11 +1,13 @@
 from datetime import datetime
 from typing import Optional, Tuple
 from uuid import UUID
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 
-from shared.database import get_database
+from shared.database import get_database, get_async_database
 from shared.logging import get_logger
 from shared.exceptions import ValidationError, DatabaseError
+from shared.cache import EntityCache
 
 from app.models.user import User
 from app.models.refresh_token import RefreshToken
@@ -13,9 +15,28 @@ from app.schemas.auth import UserRegister, UserLogin
 from app.schemas.user import UserResponse
 from app.services.token_service import TokenService
 from app.utils.password import hash_password, verify_password, validate_password_strength
+from app.utils.password_pool import hash_password_async, verify_password_async
+from app.utils.revocation import is_revoked, record_revocation
+from app.utils.throttle import check_login_attempt, record_login_success
 
 logger = get_logger("users.auth_service")
 
+# Dropped after any commit that changes the user (deactivation included);
+# the cache TTL bounds staleness for writes made outside this process.
+user_cache = EntityCache("user", User)
+
+
+def _access_token_user_id(payload: Optional[dict]) -> Optional[UUID]:
+    try:
+        return UUID(payload["sub"]) if payload else None
+    except (KeyError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def _email_matches(email: str):
+    # Equality on lower(email) is served by ix_users_email_lower; ILIKE is not.
+    return func.lower(User.email) == email.lower()
+
 
 class AuthService:
     def __init__(self):
@@ -27,6 +48,13 @@ class AuthService:
         if not is_valid:
             raise ValidationError(f"Password validation failed: {error_message}")
 
+        # Checked before bcrypt so a duplicate costs one index lookup; the
+        # unique index still catches a concurrent registration below.
+        with self.db.get_session() as session:
+            if session.scalar(select(User.id).where(_email_matches(user_data.email))) is not None:
+                logger.warning("Registration failed: email already exists", extra={"email": user_data.email})
+                raise ValidationError("Email already registered")
+
         password_hash = hash_password(user_data.password)
 
         new_user = User(
@@ -53,7 +81,7 @@ class AuthService:
 
                 refresh_token_record = RefreshToken(
                     user_id=new_user.id,
-                    token=refresh_token,
+                    token_hash=self.token_service.hash_refresh_token(refresh_token),
                     expires_at=datetime.utcnow() + self.token_service.get_refresh_token_expiry_delta(),
                     is_revoked=False
                 )
@@ -81,10 +109,12 @@ class AuthService:
                 logger.error("User registration failed", extra={"error": str(e), "email": user_data.email})
                 raise DatabaseError("Failed to register user", details={"error": str(e)})
 
-    def login_user(self, login_data: UserLogin) -> Tuple[UserResponse, str, str]:
+    def login_user(self, login_data: UserLogin, client_ip: Optional[str] = None) -> Tuple[UserResponse, str, str]:
+        check_login_attempt(login_data.email, client_ip)
+
         with self.db.get_session() as session:
             user = session.query(User).filter(
-                User.email.ilike(login_data.email.lower())
+                _email_matches(login_data.email)
             ).first()
 
             if not user:
@@ -108,13 +138,14 @@ class AuthService:
 
             refresh_token_record = RefreshToken(
                 user_id=user.id,
-                token=refresh_token,
+                token_hash=self.token_service.hash_refresh_token(refresh_token),
                 expires_at=datetime.utcnow() + self.token_service.get_refresh_token_expiry_delta(),
                 is_revoked=False
             )
             session.add(refresh_token_record)
             session.commit()
 
+            record_login_success(login_data.email)
             logger.info("User logged in successfully", extra={
                 "user_id": str(user.id),
                 "email": user.email
@@ -137,9 +168,14 @@ class AuthService:
         except (ValueError, TypeError):
             raise ValidationError("Invalid refresh token payload")
 
+        token_hash = self.token_service.hash_refresh_token(refresh_token)
+        if is_revoked(token_hash):
+            logger.warning("Refresh token revoked", extra={"user_id": user_id})
+            raise ValidationError("Refresh token has been revoked")
+
         with self.db.get_session() as session:
             token_record = session.query(RefreshToken).filter(
-                RefreshToken.token == refresh_token,
+                RefreshToken.token_hash == token_hash,
                 RefreshToken.user_id == user_uuid
             ).first()
 
@@ -148,6 +184,7 @@ class AuthService:
                 raise ValidationError("Invalid refresh token")
 
             if token_record.is_revoked:
+                record_revocation(token_hash, token_record.expires_at)
                 logger.warning("Refresh token revoked", extra={"user_id": user_id})
                 raise ValidationError("Refresh token has been revoked")
 
@@ -170,9 +207,14 @@ class AuthService:
         if not user_id:
             raise ValidationError("Invalid refresh token payload")
 
+        token_hash = self.token_service.hash_refresh_token(refresh_token)
+        if is_revoked(token_hash):
+            logger.warning("Refresh token not found or already revoked", extra={"user_id": user_id})
+            return
+
         with self.db.get_session() as session:
             token_record = session.query(RefreshToken).filter(
-                RefreshToken.token == refresh_token,
+                RefreshToken.token_hash == token_hash,
                 RefreshToken.user_id == UUID(user_id),
                 RefreshToken.is_revoked == False
             ).first()
@@ -180,23 +222,223 @@ class AuthService:
             if token_record:
                 token_record.is_revoked = True
                 session.commit()
+                record_revocation(token_hash, token_record.expires_at)
                 logger.info("User logged out", extra={"user_id": user_id})
             else:
                 logger.warning("Refresh token not found or already revoked", extra={"user_id": user_id})
 
     def validate_access_token(self, access_token: str) -> Optional[UserResponse]:
         payload = self.token_service.decode_access_token(access_token)
-        if not payload:
+        user_id = _access_token_user_id(payload)
+        if user_id is None:
             return None
 
+        user = user_cache.get(user_id)
+        if user is None:
+            epoch = user_cache.epoch
+            with self.db.get_session() as session:
+                record = session.query(User).filter(User.id == user_id).first()
+                if not record:
+                    return None
+                user = UserResponse.model_validate(record)
+            user_cache.set(user_id, user, epoch)
+
+        return user if user.is_active else None
+
+
+class AsyncAuthService:
+    def __init__(self):
+        self.token_service = TokenService()
+        self.db = get_async_database()
+
+    def _issue_tokens(self, user: User) -> Tuple[str, str, RefreshToken]:
+        access_token = self.token_service.create_access_token(
+            {"sub": str(user.id), "email": user.email, "role": user.role}
+        )
+        refresh_token = self.token_service.create_refresh_token(
+            {"sub": str(user.id)}
+        )
+        refresh_token_record = RefreshToken(
+            user_id=user.id,
+            token_hash=self.token_service.hash_refresh_token(refresh_token),
+            expires_at=datetime.utcnow() + self.token_service.get_refresh_token_expiry_delta(),
+            is_revoked=False
+        )
+        return access_token, refresh_token, refresh_token_record
+
+    async def register_user(self, user_data: UserRegister) -> Tuple[UserResponse, str, str]:
+        is_valid, error_message = validate_password_strength(user_data.password)
+        if not is_valid:
+            raise ValidationError(f"Password validation failed: {error_message}")
+
+        async with self.db.get_session() as session:
+            if await session.scalar(select(User.id).where(_email_matches(user_data.email))) is not None:
+                logger.warning("Registration failed: email already exists", extra={"email": user_data.email})
+                raise ValidationError("Email already registered")
+
+        # bcrypt is CPU bound; keep it off the event loop.
+        password_hash = await hash_password_async(user_data.password)
+
+        new_user = User(
+            email=user_data.email.lower(),
+            password_hash=password_hash,
+            first_name=user_data.first_name,
+            last_name=user_data.last_name,
+            role=user_data.role,
+            is_active=True,
+            is_verified=False
+        )
+
+        async with self.db.get_session() as session:
+            try:
+                session.add(new_user)
+                await session.flush()
+
+                access_token, refresh_token, refresh_token_record = self._issue_tokens(new_user)
+                session.add(refresh_token_record)
+                await session.commit()
+
+                logger.info("User registered successfully", extra={
+                    "user_id": str(new_user.id),
+                    "email": new_user.email
+                })
+
+                user_response = UserResponse.model_validate(new_user)
+                return user_response, access_token, refresh_token
+            except IntegrityError as e:
+                await session.rollback()
+                if "unique constraint" in str(e).lower() or "duplicate key" in str(e).lower():
+                    logger.warning("Registration failed: email already exists", extra={"email": user_data.email})
+                    raise ValidationError("Email already registered")
+                raise DatabaseError("Failed to register user", details={"error": str(e)})
+            except (ValidationError, DatabaseError):
+                await session.rollback()
+                raise
+            except Exception as e:
+                await session.rollback()
+                logger.error("User registration failed", extra={"error": str(e), "email": user_data.email})
+                raise DatabaseError("Failed to register user", details={"error": str(e)})
+
+    async def login_user(self, login_data: UserLogin, client_ip: Optional[str] = None) -> Tuple[UserResponse, str, str]:
+        check_login_attempt(login_data.email, client_ip)
+
+        async with self.db.get_session() as session:
+            user = await session.scalar(select(User).where(
+                _email_matches(login_data.email)
+            ))
+
+            if not user:
+                logger.warning("Login failed: user not found", extra={"email": login_data.email})
+                raise ValidationError("Invalid email or password")
+
+            if not await verify_password_async(login_data.password, user.password_hash):
+                logger.warning("Login failed: invalid password", extra={"user_id": str(user.id)})
+                raise ValidationError("Invalid email or password")
+
+            if not user.is_active:
+                logger.warning("Login failed: user inactive", extra={"user_id": str(user.id)})
+                raise ValidationError("User account is inactive")
+
+            access_token, refresh_token, refresh_token_record = self._issue_tokens(user)
+            session.add(refresh_token_record)
+            await session.commit()
+
+            record_login_success(login_data.email)
+            logger.info("User logged in successfully", extra={
+                "user_id": str(user.id),
+                "email": user.email
+            })
+
+            user_response = UserResponse.model_validate(user)
+            return user_response, access_token, refresh_token
+
+    async def refresh_access_token(self, refresh_token: str) -> str:
+        payload = self.token_service.decode_refresh_token(refresh_token)
+        if not payload:
+            raise ValidationError("Invalid refresh token")
+
         user_id = payload.get("sub")
         if not user_id:
-            return None
+            raise ValidationError("Invalid refresh token payload")
 
-        with self.db.get_session() as session:
-            user = session.query(User).filter(User.id == UUID(user_id)).first()
+        try:
+            user_uuid = UUID(user_id)
+        except (ValueError, TypeError):
+            raise ValidationError("Invalid refresh token payload")
+
+        token_hash = self.token_service.hash_refresh_token(refresh_token)
+        if is_revoked(token_hash):
+            logger.warning("Refresh token revoked", extra={"user_id": user_id})
+            raise ValidationError("Refresh token has been revoked")
+
+        async with self.db.get_session() as session:
+            token_record = await session.scalar(select(RefreshToken).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.user_id == user_uuid
+            ))
+
+            if not token_record:
+                logger.warning("Refresh token not found in database", extra={"user_id": user_id})
+                raise ValidationError("Invalid refresh token")
+
+            if token_record.is_revoked:
+                record_revocation(token_hash, token_record.expires_at)
+                logger.warning("Refresh token revoked", extra={"user_id": user_id})
+                raise ValidationError("Refresh token has been revoked")
 
+            user = await session.scalar(select(User).where(User.id == user_uuid))
             if not user or not user.is_active:
-                return None
+                raise ValidationError("User account is inactive")
+
+            access_token = self.token_service.create_access_token(
+                {"sub": str(user.id), "email": user.email, "role": user.role}
+            )
+            logger.info("Access token refreshed", extra={"user_id": user_id})
+            return access_token
+
+    async def logout_user(self, refresh_token: str) -> None:
+        payload = self.token_service.decode_refresh_token(refresh_token)
+        if not payload:
+            raise ValidationError("Invalid refresh token")
+
+        user_id = payload.get("sub")
+        if not user_id:
+            raise ValidationError("Invalid refresh token payload")
+
+        token_hash = self.token_service.hash_refresh_token(refresh_token)
+        if is_revoked(token_hash):
+            logger.warning("Refresh token not found or already revoked", extra={"user_id": user_id})
+            return
+
+        async with self.db.get_session() as session:
+            token_record = await session.scalar(select(RefreshToken).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.user_id == UUID(user_id),
+                RefreshToken.is_revoked == False
+            ))
+
+            if token_record:
+                token_record.is_revoked = True
+                await session.commit()
+                record_revocation(token_hash, token_record.expires_at)
+                logger.info("User logged out", extra={"user_id": user_id})
+            else:
+                logger.warning("Refresh token not found or already revoked", extra={"user_id": user_id})
+
+    async def validate_access_token(self, access_token: str) -> Optional[UserResponse]:
+        payload = self.token_service.decode_access_token(access_token)
+        user_id = _access_token_user_id(payload)
+        if user_id is None:
+            return None
 
-            return UserResponse.model_validate(user)
+        user = user_cache.get(user_id)
+        if user is None:
+            epoch = user_cache.epoch
+            async with self.db.get_session() as session:
+                record = await session.scalar(select(User).where(User.id == user_id))
+                if not record:
+                    return None
+                user = UserResponse.model_validate(record)
+            user_cache.set(user_id, user, epoch)
+
+        return user if user.is_active else None
@@ -1,5 +1,7 @@
+import hashlib
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+from uuid import uuid4
 from jose import JWTError, jwt
 from shared.logging import get_logger
 from app.config import settings
@@ -26,7 +28,8 @@ class TokenService:
             expire = datetime.utcnow() + expires_delta
         else:
             expire = datetime.utcnow() + timedelta(seconds=settings.jwt_refresh_token_expires_in)
-        to_encode.update({"exp": expire, "type": "refresh"})
+        # jti keeps two tokens issued to one user in the same second distinct.
+        to_encode.update({"exp": expire, "type": "refresh", "jti": uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, settings.jwt_refresh_secret, algorithm=settings.jwt_algorithm)
         return encoded_jwt
 
@@ -54,6 +57,10 @@ class TokenService:
             logger.debug("Refresh token decode failed", extra={"error": str(e)})
             return None
 
+    @staticmethod
+    def hash_refresh_token(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
     @staticmethod
     def get_refresh_token_expiry_delta() -> timedelta:
         return timedelta(seconds=settings.jwt_refresh_token_expires_in)
@@ -0,0 +1,140 @@
+"""bcrypt hashing and verification in a pool of worker processes.
+
+A bcrypt check at cost 12 takes a few hundred milliseconds of CPU. On the
+default thread executor a login burst queues without limit and competes with
+request handling for the interpreter; here it runs in a fixed number of
+worker processes, and the number of calls waiting for one is bounded: once
+``max_queue`` are waiting, new calls fail fast with
+``ServiceUnavailableError`` instead of piling up.
+
+If a worker process dies (OOM kill, segfault) the executor is broken for
+good, so it is replaced by a fresh one and the calls it failed are retried
+once; a call that breaks the new executor as well gets the same error.
+"""
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from shared.exceptions import ServiceUnavailableError
+from shared.logging import get_logger
+from shared.metrics import Counter, Histogram
+
+from app.utils.password import hash_password, verify_password
+
+logger = get_logger("users.password_pool")
+
+
+class PasswordPool:
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.rejected = Counter()
+        self.recreated = Counter()
+        self.queue_wait = Histogram()
+        self.latency = Histogram()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # Not fork: the service process has an event loop, database pools and
+        # their threads, none of which survive being copied into a child.
+        # Workers come from a clean forkserver process instead.
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver"))
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        # Only touched from the event loop thread, so plain ints are enough.
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected.inc()
+            logger.warning("Password pool saturated", extra={"in_flight": self.in_flight})
+            raise ServiceUnavailableError("Too many concurrent sign-ins, retry shortly")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        submitted = time.perf_counter()
+        try:
+            try:
+                started, result = await self._submit(fn, *args)
+            except BrokenProcessPool:
+                try:
+                    started, result = await self._submit(fn, *args)
+                except BrokenProcessPool:
+                    raise ServiceUnavailableError("Password workers are restarting, retry shortly")
+        finally:
+            self.in_flight -= 1
+        finished = time.perf_counter()
+        self.queue_wait.observe(max(started - submitted, 0.0))
+        self.latency.observe(finished - submitted)
+        return result
+
+    async def _submit(self, fn: Callable, *args) -> tuple:
+        executor = self._executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, _timed, fn, *args)
+        except BrokenProcessPool:
+            self._replace(executor)
+            raise
+
+    def _replace(self, broken: ProcessPoolExecutor) -> None:
+        # Every call in flight on the broken executor fails; only the first replaces it.
+        if self._executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+        self.recreated.inc()
+        logger.error("Password pool worker died, executor recreated", extra={"recreated": self.recreated.value})
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(verify_password, password, password_hash)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.workers, 0),
+            "max_in_flight": self.max_in_flight,
+            "rejected": self.rejected.value,
+            "recreated": self.recreated.value,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "latency_seconds": self.latency.snapshot(),
+        }
+
+
+def _timed(fn: Callable, *args) -> tuple:
+    # perf_counter is system-wide on Linux, so the start time is comparable
+    # with the submitting process's clock.
+    return time.perf_counter(), fn(*args)
+
+
+_password_pool: Optional[PasswordPool] = None
+
+
+def init_password_pool(pool: Optional[PasswordPool]) -> Optional[PasswordPool]:
+    global _password_pool
+    _password_pool = pool
+    return _password_pool
+
+
+def get_password_pool() -> Optional[PasswordPool]:
+    return _password_pool
+
+
+async def hash_password_async(password: str) -> str:
+    if _password_pool is None:
+        return await asyncio.to_thread(hash_password, password)
+    return await _password_pool.hash(password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    if _password_pool is None:
+        return await asyncio.to_thread(verify_password, password, password_hash)
+    return await _password_pool.verify(password, password_hash)
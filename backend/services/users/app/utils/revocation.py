@@ -0,0 +1,107 @@
+"""In-process set of revoked refresh token digests.
+
+Consulted by refresh and logout before ``refresh_tokens`` is queried: a
+token found here is rejected (or, on logout, acknowledged) without a round
+trip. Entries are kept until the token's own expiry, after which the JWT
+check rejects it anyway, so tokens whose rows were already purged still
+hit. Loaded at startup and extended on every logout in this process;
+revocations made by another replica are simply not in it and fall through
+to the database, so the set can only save queries, never change an answer.
+"""
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select
+
+from shared.database import get_database
+from shared.logging import get_logger
+from shared.metrics import Counter
+
+from app.models.refresh_token import RefreshToken
+
+logger = get_logger("users.revocation")
+
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class RevocationSet:
+    def __init__(self, max_entries: int = 1000000):
+        self.max_entries = max_entries
+        self.hits = Counter()
+        self.misses = Counter()
+        self.dropped = Counter()
+        self._expires_at: Dict[bytes, float] = {}
+        self._next_prune = 1024
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    def __contains__(self, token_hash: bytes) -> bool:
+        expires_at = self._expires_at.get(token_hash)
+        if expires_at is not None and expires_at > datetime.now(timezone.utc).timestamp():
+            self.hits.inc()
+            return True
+        self.misses.inc()
+        return False
+
+    def add(self, token_hash: bytes, expires_at: datetime) -> None:
+        with self._lock:
+            if len(self._expires_at) >= self._next_prune:
+                self._prune()
+            if len(self._expires_at) >= self.max_entries:
+                self.dropped.inc()
+                return
+            self._expires_at[token_hash] = _timestamp(expires_at)
+
+    def _prune(self) -> None:
+        now = datetime.now(timezone.utc).timestamp()
+        self._expires_at = {key: value for key, value in self._expires_at.items() if value > now}
+        self._next_prune = max(len(self._expires_at) * 2, 1024)
+
+    def load(self) -> int:
+        with get_database().get_session(readonly=True) as session:
+            rows = session.execute(
+                select(RefreshToken.token_hash, RefreshToken.expires_at)
+                .where(RefreshToken.is_revoked, RefreshToken.expires_at > func.now())
+            ).all()
+        for token_hash, expires_at in rows:
+            self.add(token_hash, expires_at)
+        logger.info("Revocation set loaded", extra={"entries": len(self)})
+        return len(self)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits.value,
+            "misses": self.misses.value,
+            "dropped": self.dropped.value,
+        }
+
+
+_revocations: Optional[RevocationSet] = None
+
+
+def init_revocations(revocations: Optional[RevocationSet]) -> Optional[RevocationSet]:
+    global _revocations
+    _revocations = revocations
+    return _revocations
+
+
+def get_revocations() -> Optional[RevocationSet]:
+    return _revocations
+
+
+def is_revoked(token_hash: bytes) -> bool:
+    return _revocations is not None and token_hash in _revocations
+
+
+def record_revocation(token_hash: bytes, expires_at: datetime) -> None:
+    if _revocations is not None:
+        _revocations.add(token_hash, expires_at)
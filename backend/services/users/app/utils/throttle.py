@@ -0,0 +1,142 @@
+"""Sliding-window sign-in throttle, checked before any password work.
+
+Every attempt is charged to both the email and the client address before
+the user is looked up, so a burst cannot slip past while earlier attempts
+are still in bcrypt. A key that already has ``limit`` attempts in the last
+``window`` seconds is refused with ``TooManyRequestsError``; a successful
+sign-in clears its email's window.
+
+The default backend is per process. Workers that should share counts plug
+in a backend over common storage (e.g. Redis sorted sets) implementing
+``ThrottleBackend``.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional
+
+from shared.exceptions import TooManyRequestsError
+from shared.logging import get_logger
+from shared.metrics import Counter
+
+logger = get_logger("users.throttle")
+
+
+class ThrottleBackend(ABC):
+    @abstractmethod
+    def hit(self, key: str, limit: int, window: float) -> Optional[float]:
+        """Record an attempt for ``key`` unless it is over ``limit``.
+
+        Returns ``None`` if the attempt was recorded, otherwise the seconds
+        until the oldest attempt in the window expires.
+        """
+
+    @abstractmethod
+    def reset(self, key: str) -> None:
+        ...
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__}
+
+
+class MemoryThrottleBackend(ThrottleBackend):
+    """Attempt timestamps per key, at most ``limit`` each, LRU-bounded in keys."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._attempts: "OrderedDict[str, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: float) -> Optional[float]:
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None:
+                attempts = self._attempts[key] = deque(maxlen=limit)
+                while len(self._attempts) > self.max_keys:
+                    self._attempts.popitem(last=False)
+            else:
+                self._attempts.move_to_end(key)
+            while attempts and attempts[0] <= now - window:
+                attempts.popleft()
+            if len(attempts) >= limit:
+                return attempts[0] + window - now
+            attempts.append(now)
+            return None
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._attempts.pop(key, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**super().snapshot(), "keys": len(self._attempts), "max_keys": self.max_keys}
+
+
+class LoginThrottle:
+    def __init__(
+        self,
+        backend: ThrottleBackend,
+        email_limit: int,
+        ip_limit: int,
+        window: float,
+    ):
+        self.backend = backend
+        self.email_limit = email_limit
+        self.ip_limit = ip_limit
+        self.window = window
+        self.allowed = Counter()
+        self.rejected_email = Counter()
+        self.rejected_ip = Counter()
+
+    def attempt(self, email: str, client_ip: Optional[str]) -> None:
+        # The address first: a stuffing run spreads over many emails from few sources.
+        if client_ip:
+            retry_after = self.backend.hit(f"ip:{client_ip}", self.ip_limit, self.window)
+            if retry_after is not None:
+                self.rejected_ip.inc()
+                logger.warning("Sign-in throttled by client address", extra={"client_ip": client_ip})
+                raise TooManyRequestsError("Too many sign-in attempts, retry later", retry_after)
+        retry_after = self.backend.hit(f"email:{email.lower()}", self.email_limit, self.window)
+        if retry_after is not None:
+            self.rejected_email.inc()
+            logger.warning("Sign-in throttled by email", extra={"email": email})
+            raise TooManyRequestsError("Too many sign-in attempts, retry later", retry_after)
+        self.allowed.inc()
+
+    def succeeded(self, email: str) -> None:
+        self.backend.reset(f"email:{email.lower()}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.backend.snapshot(),
+            "allowed": self.allowed.value,
+            "rejected_email": self.rejected_email.value,
+            "rejected_ip": self.rejected_ip.value,
+            "email_limit": self.email_limit,
+            "ip_limit": self.ip_limit,
+            "window_seconds": self.window,
+        }
+
+
+_login_throttle: Optional[LoginThrottle] = None
+
+
+def init_login_throttle(throttle: Optional[LoginThrottle]) -> Optional[LoginThrottle]:
+    global _login_throttle
+    _login_throttle = throttle
+    return _login_throttle
+
+
+def get_login_throttle() -> Optional[LoginThrottle]:
+    return _login_throttle
+
+
+def check_login_attempt(email: str, client_ip: Optional[str]) -> None:
+    if _login_throttle is not None:
+        _login_throttle.attempt(email, client_ip)
+
+
+def record_login_success(email: str) -> None:
+    if _login_throttle is not None:
+        _login_throttle.succeeded(email)
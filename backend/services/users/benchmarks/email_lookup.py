@@ -0,0 +1,90 @@
+"""Sign-in user lookup: email ILIKE versus equality on lower(email).
+
+Seeds ``--users`` accounts (into a throwaway SQLite database, or into
+``--database-url``, which should be a scratch database migrated to head;
+seeded rows are deleted afterwards) and prints the plan and latency of the
+old and new lookup for random existing emails.
+
+Run from ``backend/services/users``:
+
+    PYTHONPATH=.:../.. python -m benchmarks.email_lookup --users 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete, insert, select, text
+
+from shared.database import init_database, get_database
+from app.models import User
+from app.services.auth_service import _email_matches
+
+DOMAIN = "bench.invalid"
+
+LOOKUPS = {
+    "email ILIKE": lambda email: User.email.ilike(email.lower()),
+    "lower(email) =": _email_matches,
+}
+
+
+def seed(users: int, chunk: int = 20000):
+    with get_database().get_session() as session:
+        for start in range(0, users, chunk):
+            session.execute(insert(User), [
+                dict(id=uuid4(), email=f"user{n}@{DOMAIN}", password_hash="x", role="customer",
+                     is_active=True, is_verified=False)
+                for n in range(start, min(start + chunk, users))
+            ])
+            session.commit()
+
+
+def plan(session, statement) -> str:
+    compiled = str(statement.compile(session.bind, compile_kwargs={"literal_binds": True}))
+    if session.bind.dialect.name == "postgresql":
+        rows = session.execute(text(f"EXPLAIN ANALYZE {compiled}")).scalars()
+    else:
+        rows = (row[-1] for row in session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    return "\n      ".join(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--database-url", default=None, help="scratch database migrated to head instead of SQLite")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bitez-email-")
+    init_database(args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    if args.database_url is None:
+        get_database().create_tables()
+    start = time.perf_counter()
+    seed(args.users)
+    print(f"{args.users} users seeded in {time.perf_counter() - start:.1f}s")
+
+    random.seed(7)
+    emails = [f"User{random.randrange(args.users)}@{DOMAIN.upper()}" for _ in range(args.lookups)]
+    try:
+        with get_database().get_session() as session:
+            for name, predicate in LOOKUPS.items():
+                statement = select(User.id).where(predicate(emails[0]))
+                print(f"  {name}\n      {plan(session, statement)}")
+                timings = []
+                for email in emails:
+                    started = time.perf_counter()
+                    assert session.scalar(select(User.id).where(predicate(email))) is not None
+                    timings.append(time.perf_counter() - started)
+                print(f"      median {statistics.median(timings) * 1e3:.3f} ms   max {max(timings) * 1e3:.3f} ms")
+    finally:
+        if args.database_url is not None:
+            with get_database().get_session() as session:
+                session.execute(delete(User).where(User.email.like(f"%@{DOMAIN}")))
+                session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Sign-in throughput and event loop stalls versus password pool size.
+
+Fires ``--logins`` concurrent password checks at the thread fallback and at
+process pools of each size, while a ticker measures how late the event loop
+runs a 10 ms timer (what every other endpoint feels during a login burst).
+
+Run from ``backend/services/users``:
+
+    PYTHONPATH=.:../.. python -m benchmarks.password_pool --logins 64 --sizes 1,2,4
+"""
+import argparse
+import asyncio
+import time
+
+from app.utils.password import pwd_context
+from app.utils.password_pool import PasswordPool, init_password_pool, verify_password_async
+
+PASSWORD = "Correct-horse-9"
+
+
+async def ticker(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - start - 0.01)
+
+
+async def burst(logins: int, password_hash: str) -> tuple:
+    stop, lags = asyncio.Event(), []
+    tick = asyncio.create_task(ticker(stop, lags))
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(verify_password_async(PASSWORD, password_hash) for _ in range(logins)), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    rejected = sum(isinstance(result, Exception) for result in results)
+    return (logins - rejected) / elapsed, max(lags, default=0.0), rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--sizes", default="1,2,4")
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--max-queue", type=int, default=1000)
+    args = parser.parse_args()
+
+    password_hash = pwd_context.copy(bcrypt__rounds=args.rounds).hash(PASSWORD)
+    print(f"{args.logins} concurrent sign-ins, bcrypt cost {args.rounds}")
+    init_password_pool(None)
+    rate, lag, _ = asyncio.run(burst(args.logins, password_hash))
+    print(f"  threads        {rate:7.1f} logins/s   worst loop lag {lag * 1e3:7.1f} ms")
+    for size in map(int, args.sizes.split(",")):
+        pool = init_password_pool(PasswordPool(size, args.max_queue))
+        asyncio.run(burst(size, password_hash))  # start the workers
+        rate, lag, rejected = asyncio.run(burst(args.logins, password_hash))
+        stats = pool.stats()
+        print(f"  {size} process(es) {rate:7.1f} logins/s   worst loop lag {lag * 1e3:7.1f} ms"
+              f"   p95 latency {stats['latency_seconds']['p95']} s   rejected {rejected}")
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import asyncio
+import inspect
+
+import pytest
+from sqlalchemy import select
+
+import shared.cache
+from shared.cache import LRUCache, get_cache, init_cache
+from shared.database import init_async_database, init_database
+from shared.exceptions import ValidationError
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.schemas.auth import UserLogin, UserRegister
+from app.services.auth_service import AsyncAuthService, AuthService, _email_matches, user_cache
+from app.services.token_service import TokenService
+
+
+class Harness:
+    """Either auth service over one SQLite file, with sync-looking calls."""
+
+    def __init__(self, path, flavour):
+        self.db = init_database(f"sqlite:///{path}")
+        self.db.create_tables()
+        self.loop = asyncio.new_event_loop()
+        self.async_db = None
+        if flavour == "async":
+            self.async_db = init_async_database(f"sqlite+aiosqlite:///{path}")
+            self.service = AsyncAuthService()
+        else:
+            self.service = AuthService()
+
+    def __getattr__(self, name):
+        method = getattr(self.service, name)
+
+        def call(*args, **kwargs):
+            result = method(*args, **kwargs)
+            return self.loop.run_until_complete(result) if inspect.isawaitable(result) else result
+
+        return call
+
+    def set_active(self, user_id, is_active):
+        # An ORM write through the service's own kind of session.
+        if self.async_db is None:
+            with self.db.get_session() as session:
+                session.get(User, user_id).is_active = is_active
+            return
+
+        async def update():
+            async with self.async_db.get_session() as session:
+                (await session.get(User, user_id)).is_active = is_active
+
+        self.loop.run_until_complete(update())
+
+    def close(self):
+        if self.async_db is not None:
+            self.loop.run_until_complete(self.async_db.dispose())
+        self.loop.close()
+
+
+@pytest.fixture(params=["sync", "async"])
+def auth(request, tmp_path):
+    previous = shared.cache._cache
+    init_cache(LRUCache(max_size=100, ttl=60.0))
+    harness = Harness(tmp_path / "users.db", request.param)
+    yield harness
+    harness.close()
+    shared.cache._cache = previous
+
+
+def insert_user(db, email, password_hash="not-a-real-hash"):
+    with db.get_session() as session:
+        user = User(email=email, password_hash=password_hash, first_name="Ana", last_name="Bekele")
+        session.add(user)
+        session.flush()
+        return user.id
+
+
+def access_token(user_id):
+    return TokenService.create_access_token({"sub": str(user_id), "role": "customer"})
+
+
+def test_deactivation_is_seen_by_the_next_validation(auth):
+    user_id = insert_user(auth.db, "ana@example.com")
+    token = access_token(user_id)
+    user = auth.validate_access_token(token)
+    assert user.id == user_id and user.is_active
+    assert auth.validate_access_token(token) is user
+    misses = get_cache().snapshot()["misses"]
+
+    auth.set_active(user_id, False)
+    assert user_cache.get(user_id) is None
+    assert auth.validate_access_token(token) is None
+    # Two misses: the lookup above and the service's own.
+    assert get_cache().snapshot()["misses"] == misses + 2
+
+    auth.set_active(user_id, True)
+    assert auth.validate_access_token(token).is_active
+
+
+def test_unknown_or_malformed_subjects_are_rejected(auth):
+    assert auth.validate_access_token(access_token("not-a-uuid")) is None
+    assert auth.validate_access_token("not.a.jwt") is None
+    assert auth.validate_access_token(access_token("6f1c6c3e-5f7a-4c4e-9a57-4c0e3b8e4d11")) is None
+
+
+def stored_tokens(db):
+    with db.get_session() as session:
+        return {row.token_hash: row.is_revoked for row in session.scalars(select(RefreshToken))}
+
+
+def test_refresh_tokens_are_found_by_their_hash_through_their_lifecycle(auth):
+    password = "Correct-horse-9"
+    user, _, registered = auth.register_user(UserRegister(
+        first_name="Ana", last_name="Bekele", email="ana@example.com", password=password, password_confirm=password,
+    ))
+    _, _, logged_in = auth.login_user(UserLogin(email="ana@example.com", password=password))
+    hashes = [TokenService.hash_refresh_token(token) for token in (registered, logged_in)]
+    # Only the SHA-256 digests are stored, never the tokens themselves.
+    assert all(len(token_hash) == 32 for token_hash in hashes)
+    assert stored_tokens(auth.db) == {hashes[0]: False, hashes[1]: False}
+
+    assert auth.refresh_access_token(logged_in)
+    auth.logout_user(logged_in)
+    assert stored_tokens(auth.db) == {hashes[0]: False, hashes[1]: True}
+    with pytest.raises(ValidationError, match="revoked"):
+        auth.refresh_access_token(logged_in)
+    # Logging out twice is a no-op; the other session is untouched.
+    auth.logout_user(logged_in)
+    assert auth.refresh_access_token(registered)
+
+    unknown = TokenService.create_refresh_token({"sub": str(user.id)})
+    with pytest.raises(ValidationError, match="Invalid refresh token"):
+        auth.refresh_access_token(unknown)
+
+
+def registration(email, password="Correct-horse-9"):
+    return UserRegister(first_name="Ana", last_name="Bekele", email=email, password=password, password_confirm=password)
+
+
+def test_emails_are_stored_lowercased_and_matched_ignoring_case(auth):
+    user, _, _ = auth.register_user(registration("Ana.Bekele@Example.COM"))
+    assert user.email == "ana.bekele@example.com"
+    with auth.db.get_session() as session:
+        assert session.scalars(select(User.email)).all() == ["ana.bekele@example.com"]
+        assert session.scalar(select(User.id).where(_email_matches("ANA.BEKELE@example.com"))) == user.id
+
+    for email in ("ana.bekele@example.com", "ANA.BEKELE@EXAMPLE.COM"):
+        logged_in, _, _ = auth.login_user(UserLogin(email=email, password="Correct-horse-9"))
+        assert logged_in.id == user.id
+
+    with pytest.raises(ValidationError, match="already registered"):
+        auth.register_user(registration("ANA.bekele@example.com"))
+    with pytest.raises(ValidationError, match="Invalid email or password"):
+        auth.login_user(UserLogin(email="ANA.BEKELE@EXAMPLE.COM", password="wrong-password-1"))
+
+
+def test_mixed_case_rows_written_elsewhere_still_match(auth):
+    # A row written without going through registration may keep its case.
+    user_id = insert_user(auth.db, "Old.User@Example.com")
+    with auth.db.get_session() as session:
+        assert session.scalar(select(User.id).where(_email_matches("old.user@example.com"))) == user_id
+    with pytest.raises(ValidationError, match="already registered"):
+        auth.register_user(registration("OLD.USER@example.com"))
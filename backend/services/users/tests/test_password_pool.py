@@ -0,0 +1,58 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from shared.exceptions import ServiceUnavailableError
+from app.utils.password import verify_password
+from app.utils.password_pool import PasswordPool
+
+
+def exit_once(marker: str) -> None:
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+
+
+@pytest.fixture
+def pool():
+    pool = PasswordPool(workers=2, max_queue=4)
+    yield pool
+    pool.shutdown()
+
+
+def test_hash_and_verify_in_worker_processes(pool):
+    async def scenario():
+        password_hash = await pool.hash("correct horse")
+        return password_hash, await pool.verify("correct horse", password_hash), await pool.verify("wrong", password_hash)
+
+    password_hash, good, bad = asyncio.run(scenario())
+    assert verify_password("correct horse", password_hash)
+    assert (good, bad) == (True, False)
+    assert pool.stats()["recreated"] == 0
+
+
+def test_dead_worker_recreates_the_executor(pool):
+    async def scenario():
+        with pytest.raises(ServiceUnavailableError):
+            # Kills its worker on the first executor and again on the replacement.
+            await pool._run(os._exit, 1)
+        return await pool.hash("after the crash")
+
+    assert verify_password("after the crash", asyncio.run(scenario()))
+    assert pool.stats()["recreated"] == 2
+    # Replacements are started the same way, never forked from the service.
+    assert pool._executor._mp_context.get_start_method() == "forkserver"
+    assert pool.stats()["in_flight"] == 0
+
+
+def test_calls_in_flight_on_a_broken_executor_are_retried(pool, tmp_path):
+    async def scenario():
+        return await asyncio.gather(
+            pool._run(time.sleep, 0.2),
+            pool._run(exit_once, str(tmp_path / "crashed")),
+        )
+
+    assert asyncio.run(scenario()) == [None, None]
+    assert pool.stats()["recreated"] == 1
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, insert, select
+
+import app.jobs.purge_refresh_tokens
+from shared.database import init_database
+from app.jobs.purge_refresh_tokens import RefreshTokenPurger, purge_refresh_tokens
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = init_database(f"sqlite:///{tmp_path / 'purge.db'}")
+    db.create_tables()
+    return db
+
+
+@pytest.fixture
+def deletes(database):
+    """Number of DELETE statements run, i.e. purge batches."""
+    count = [0]
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("DELETE"):
+            count[0] += 1
+
+    event.listen(database.engine, "before_cursor_execute", before_cursor_execute)
+    yield count
+    event.remove(database.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def insert_tokens(db, live=0, expired=0, revoked=0):
+    # Naive UTC, as the services write expires_at.
+    now = datetime.utcnow()
+    user_id = uuid4()
+    rows = (
+        [dict(expires_at=now + timedelta(days=7), is_revoked=False)] * live
+        + [dict(expires_at=now - timedelta(days=1), is_revoked=False)] * expired
+        + [dict(expires_at=now + timedelta(days=7), is_revoked=True)] * revoked
+    )
+    with db.get_session() as session:
+        session.execute(insert(User), [dict(id=user_id, email=f"{user_id}@example.com", password_hash="x")])
+        session.execute(insert(RefreshToken), [
+            dict(id=uuid4(), user_id=user_id, token_hash=hashlib.sha256(uuid4().bytes).digest(), **row)
+            for row in rows
+        ])
+
+
+def remaining(db):
+    """Tokens left, and how many of them are revoked."""
+    with db.get_session() as session:
+        revoked = session.scalars(select(RefreshToken.is_revoked)).all()
+    return len(revoked), sum(revoked)
+
+
+def test_expired_and_revoked_tokens_are_deleted(database, deletes):
+    insert_tokens(database, live=3, expired=4, revoked=2)
+    assert purge_refresh_tokens(batch_size=100) == 6
+    assert remaining(database) == (3, 0)
+    assert deletes[0] == 1
+    assert purge_refresh_tokens(batch_size=100) == 0
+
+
+@pytest.mark.parametrize("victims, batch_size, batches", [
+    (5, 2, 3),  # 2, 2, then a short 1
+    (4, 2, 3),  # 2, 2, then an empty batch to find out
+    (3, 10, 1),
+    (0, 10, 1),
+])
+def test_purge_stops_after_a_short_batch(database, deletes, victims, batch_size, batches):
+    insert_tokens(database, live=2, expired=victims)
+    assert purge_refresh_tokens(batch_size=batch_size) == victims
+    assert deletes[0] == batches
+    assert remaining(database)[0] == 2
+
+
+def test_purge_stops_at_max_batches(database, deletes):
+    insert_tokens(database, live=1, expired=5, revoked=2)
+    assert purge_refresh_tokens(batch_size=2, max_batches=2) == 4
+    assert deletes[0] == 2
+    assert remaining(database)[0] == 4
+    assert purge_refresh_tokens(batch_size=2, max_batches=2) == 3
+    assert remaining(database)[0] == 1
+
+
+def test_purger_counts_runs_and_purged_rows(database):
+    insert_tokens(database, live=1, expired=3, revoked=1)
+    purger = RefreshTokenPurger(interval=60.0, batch_size=2, max_batches=10)
+    assert purger.purge_once() == 4
+    assert purger.purge_once() == 0
+    stats = purger.stats()
+    assert (stats["purged"], stats["runs"], stats["failures"]) == (4, 2, 0)
+    assert stats["last_run_seconds"] is not None and stats["last_run_seconds"] >= 0
+    assert stats["batch_size"] == 2
+
+
+def test_purger_counts_failures_and_keeps_running(monkeypatch):
+    calls = []
+
+    def failing(batch_size, max_batches=None, pause=0.0):
+        calls.append(batch_size)
+        raise RuntimeError("database is away")
+
+    monkeypatch.setattr(app.jobs.purge_refresh_tokens, "purge_refresh_tokens", failing)
+    purger = RefreshTokenPurger(interval=0.01, batch_size=2, max_batches=10)
+
+    async def scenario():
+        await purger.start()
+        while len(calls) < 3:
+            await asyncio.sleep(0.01)
+        await purger.stop()
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert purger.stats()["failures"] >= 3
+    assert purger.stats()["runs"] == 0
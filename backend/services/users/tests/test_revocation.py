@@ -0,0 +1,93 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app.utils.revocation
+from app.utils.revocation import RevocationSet, init_revocations, is_revoked, record_revocation
+
+NOW = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+class Clock(datetime):
+    now_value = NOW
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.now_value
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    Clock.now_value = NOW
+    monkeypatch.setattr(app.utils.revocation, "datetime", Clock)
+    return Clock
+
+
+def digest(n: int) -> bytes:
+    return hashlib.sha256(str(n).encode()).digest()
+
+
+def test_entry_is_revoked_until_the_token_expires(clock):
+    revocations = RevocationSet()
+    revocations.add(digest(1), NOW + timedelta(days=7))
+    assert digest(1) in revocations
+    assert digest(2) not in revocations
+
+    clock.now_value = NOW + timedelta(days=7)
+    assert digest(1) not in revocations
+    assert revocations.stats()["hits"] == 1
+    assert revocations.stats()["misses"] == 2
+
+
+def test_naive_expiry_is_read_as_utc(clock):
+    revocations = RevocationSet()
+    revocations.add(digest(1), (NOW + timedelta(minutes=1)).replace(tzinfo=None))
+    assert digest(1) in revocations
+    clock.now_value = NOW + timedelta(minutes=1, seconds=1)
+    assert digest(1) not in revocations
+
+
+def test_expired_entries_are_pruned_once_the_set_doubles(clock):
+    revocations = RevocationSet()
+    for n in range(1000):
+        revocations.add(digest(n), NOW + timedelta(minutes=1))
+    for n in range(1000, 1024):
+        revocations.add(digest(n), NOW + timedelta(days=1))
+    clock.now_value = NOW + timedelta(minutes=2)
+    assert len(revocations) == 1024
+
+    # The next add prunes the 1000 expired entries; the threshold stays at its floor.
+    revocations.add(digest(2000), NOW + timedelta(days=1))
+    assert len(revocations) == 25
+    assert revocations._next_prune == 1024
+
+    for n in range(3000, 4000):
+        revocations.add(digest(n), NOW + timedelta(days=1))
+    assert len(revocations) == 1025
+    assert revocations._next_prune == 1024 * 2
+
+
+def test_adds_past_max_entries_are_dropped(clock):
+    revocations = RevocationSet(max_entries=3)
+    for n in range(5):
+        revocations.add(digest(n), NOW + timedelta(days=1))
+    assert len(revocations) == 3
+    assert revocations.stats()["dropped"] == 2
+    assert digest(2) in revocations
+    assert digest(3) not in revocations
+
+
+def test_module_helpers_are_no_ops_without_a_set(clock):
+    previous = app.utils.revocation._revocations
+    try:
+        init_revocations(None)
+        record_revocation(digest(1), NOW + timedelta(days=1))
+        assert not is_revoked(digest(1))
+
+        init_revocations(RevocationSet())
+        record_revocation(digest(1), NOW + timedelta(days=1))
+        assert is_revoked(digest(1))
+        assert not is_revoked(digest(2))
+    finally:
+        init_revocations(previous)
@@ -0,0 +1,81 @@
+import pytest
+
+import app.utils.throttle
+from shared.exceptions import TooManyRequestsError
+from app.utils.throttle import LoginThrottle, MemoryThrottleBackend
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(app.utils.throttle.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_window_slides_with_the_oldest_attempt(clock):
+    backend = MemoryThrottleBackend()
+    for offset in (0.0, 10.0, 20.0):
+        clock[0] = 1000.0 + offset
+        assert backend.hit("key", limit=3, window=60.0) is None
+
+    clock[0] = 1030.0
+    assert backend.hit("key", limit=3, window=60.0) == pytest.approx(30.0)
+    # The refused attempt is not recorded, so the window is unchanged.
+    clock[0] = 1059.0
+    assert backend.hit("key", limit=3, window=60.0) == pytest.approx(1.0)
+
+    # The first attempt leaves the window: room for exactly one more.
+    clock[0] = 1060.0
+    assert backend.hit("key", limit=3, window=60.0) is None
+    assert backend.hit("key", limit=3, window=60.0) == pytest.approx(10.0)
+
+
+def test_keys_are_independent_and_lru_bounded(clock):
+    backend = MemoryThrottleBackend(max_keys=2)
+    assert backend.hit("a", limit=1, window=60.0) is None
+    assert backend.hit("b", limit=1, window=60.0) is None
+    assert backend.hit("a", limit=1, window=60.0) is not None
+    # "b" is now the least recently used key, so "c" evicts it.
+    assert backend.hit("c", limit=1, window=60.0) is None
+    assert backend.snapshot()["keys"] == 2
+    assert backend.hit("b", limit=1, window=60.0) is None
+    assert backend.hit("c", limit=1, window=60.0) is not None
+
+
+def make_throttle(email_limit=3, ip_limit=5):
+    return LoginThrottle(MemoryThrottleBackend(), email_limit=email_limit, ip_limit=ip_limit, window=60.0)
+
+
+def test_email_limit_is_case_insensitive_and_reset_on_success(clock):
+    throttle = make_throttle()
+    for email in ("a@example.com", "A@Example.com", "a@EXAMPLE.com"):
+        throttle.attempt(email, "10.0.0.1")
+    with pytest.raises(TooManyRequestsError) as refused:
+        throttle.attempt("a@example.com", "10.0.0.2")
+    assert refused.value.retry_after == pytest.approx(60.0)
+    assert throttle.stats()["rejected_email"] == 1
+
+    throttle.succeeded("A@EXAMPLE.COM")
+    throttle.attempt("a@example.com", "10.0.0.2")
+    assert throttle.stats()["allowed"] == 4
+
+
+def test_address_is_checked_before_the_email(clock):
+    throttle = make_throttle(email_limit=1, ip_limit=2)
+    throttle.attempt("a@example.com", "10.0.0.1")
+    throttle.attempt("b@example.com", "10.0.0.1")
+    with pytest.raises(TooManyRequestsError):
+        throttle.attempt("c@example.com", "10.0.0.1")
+    assert throttle.stats()["rejected_ip"] == 1
+    assert throttle.stats()["rejected_email"] == 0
+    # Refused by address, so the attempt was not charged to the email.
+    throttle.attempt("c@example.com", "10.0.0.2")
+
+
+def test_attempts_without_an_address_are_limited_by_email_only(clock):
+    throttle = make_throttle(email_limit=2, ip_limit=1)
+    throttle.attempt("a@example.com", None)
+    throttle.attempt("a@example.com", None)
+    with pytest.raises(TooManyRequestsError):
+        throttle.attempt("a@example.com", None)
+    assert throttle.stats()["rejected_ip"] == 0
@@ -0,0 +1,278 @@
+"""Read-through entity caching with invalidation on commit."""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from shared.logging import get_logger
+from shared.metrics import Counter
+
+logger = get_logger("cache")
+
+
+class CacheBackend(ABC):
+    """Storage for cached values.
+
+    ``None`` is never stored, so ``get`` returning ``None`` means a miss.
+    Out-of-process backends (Redis, memcached) implement this interface and
+    are responsible for serializing values themselves.
+    """
+
+    def __init__(self):
+        self.hits = Counter()
+        self.misses = Counter()
+        self.invalidations = Counter()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def snapshot(self) -> Dict[str, Any]:
+        hits, misses = self.hits.value, self.misses.value
+        return {
+            "backend": type(self).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "invalidations": self.invalidations.value,
+        }
+
+
+class LRUCache(CacheBackend):
+    """In-process LRU cache with a per-entry TTL and a bound on entry count."""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = Counter()
+        self.expirations = Counter()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits.inc()
+                    return value
+                del self._entries[key]
+                self.expirations.inc()
+        self.misses.inc()
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if value is None:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions.inc()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        self.invalidations.inc()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **super().snapshot(),
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "evictions": self.evictions.value,
+            "expirations": self.expirations.value,
+        }
+
+
+class SizedLRUCache(CacheBackend):
+    """In-process LRU cache bounded by the total size of its values.
+
+    For large values such as response bodies, where a bound on entry count
+    says nothing about memory. ``size_of`` gives a value's size in bytes; a
+    value larger than the whole budget is not stored. ``ttl=None`` keeps
+    entries until they are evicted.
+    """
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None, size_of: Callable[[Any], int] = len):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_of = size_of
+        self.bytes = 0
+        self.evictions = Counter()
+        self.expirations = Counter()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits.inc()
+                    return value
+                del self._entries[key]
+                self.bytes -= size
+                self.expirations.inc()
+        self.misses.inc()
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if value is None:
+            return
+        size = self.size_of(value)
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (value, size, expires_at)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions.inc()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+        self.invalidations.inc()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **super().snapshot(),
+            "size": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "evictions": self.evictions.value,
+            "expirations": self.expirations.value,
+        }
+
+
+_cache: Optional[CacheBackend] = None
+
+
+def init_cache(backend: CacheBackend) -> CacheBackend:
+    global _cache
+    _cache = backend
+    return _cache
+
+
+def get_cache() -> CacheBackend:
+    if _cache is None:
+        raise RuntimeError("Cache has not been initialized. Call init_cache() first.")
+    return _cache
+
+
+_entity_caches: Dict[type, "EntityCache"] = {}
+
+
+class EntityCache:
+    """Caches one model's response objects by primary key.
+
+    Entries are dropped after any commit that inserts, updates or deletes a
+    row of ``model`` (including ORM cascades), so services only read through
+    it. Until ``init_cache`` is called every lookup is a miss.
+    """
+
+    def __init__(self, namespace: str, model: type, ttl: Optional[float] = None):
+        self.namespace = namespace
+        self.ttl = ttl
+        # Bumped on every invalidation; a load that started before it is not
+        # stored, so a slow reader cannot re-cache a row that was just changed.
+        self.epoch = 0
+        _entity_caches[model] = self
+
+    def _key(self, entity_id: Hashable) -> str:
+        return f"{self.namespace}:{entity_id}"
+
+    def get(self, entity_id: Hashable) -> Optional[Any]:
+        if _cache is None:
+            return None
+        return _cache.get(self._key(entity_id))
+
+    def get_many(self, entity_ids: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Cached values for whichever of ``entity_ids`` are present."""
+        if _cache is None:
+            return {}
+        found = {}
+        for entity_id in entity_ids:
+            value = _cache.get(self._key(entity_id))
+            if value is not None:
+                found[entity_id] = value
+        return found
+
+    def set(self, entity_id: Hashable, value: Any, epoch: int) -> None:
+        if _cache is None or epoch != self.epoch:
+            return
+        _cache.set(self._key(entity_id), value, self.ttl)
+
+    def invalidate(self, entity_id: Hashable) -> None:
+        self.epoch += 1
+        if _cache is not None:
+            _cache.delete(self._key(entity_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session, flush_context):
+    pending = session.info.setdefault("cache_invalidations", set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        cache = _entity_caches.get(type(instance))
+        if cache is not None:
+            identity = inspect(instance).identity
+            if identity is not None:
+                pending.add((cache, identity[0]))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    for cache, entity_id in session.info.pop("cache_invalidations", ()):
+        try:
+            cache.invalidate(entity_id)
+        except Exception as e:
+            logger.error("Cache invalidation failed", extra={"namespace": cache.namespace, "error": str(e)})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop("cache_invalidations", None)
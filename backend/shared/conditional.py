@@ -0,0 +1,67 @@
+"""ETag / Last-Modified validators and conditional GET handling."""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def page_etag(page: Any, *parts: Any) -> str:
+    """ETag for one page of a listing, from the rows it returned.
+
+    ``parts`` identify the listing (resource, filters, sort, cursor, limit).
+    Items must carry ``id`` and ``updated_at``; the page itself is the version,
+    so no extra query is needed to validate it. There is deliberately no
+    Last-Modified to go with it: a deleted row, or one that no longer matches
+    the filters, leaves the newest ``updated_at`` unchanged, so only
+    If-None-Match can be answered for a listing.
+    """
+    items = page.items
+    return make_etag(*parts, page.next_cursor, *(f"{item.id}@{item.updated_at}" for item in items))
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no ETag was sent (RFC 9110 13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution.
+    return last_modified.replace(microsecond=0) <= since
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None) -> Response:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return set_validators(Response(status_code=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
@@ -1,15 +1,116 @@
-from contextlib import contextmanager
-from typing import Generator, Optional
+import hashlib
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Callable, Dict, Generator, List, Optional
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 
 from shared.logging import get_logger
 from shared.exceptions import DatabaseError, ValidationError
+from shared.metrics import register_metrics
+from shared.pool_metrics import PoolMetrics, InstrumentedQueuePool, InstrumentedAsyncQueuePool
+from shared.query_stats import attach_query_monitor
 
 logger = get_logger("database")
 
 Base = declarative_base()
 
+# Identifies the caller (user or client) for read-your-writes stickiness.
+# Set per request by shared.middleware.ConsistencyKeyMiddleware.
+_consistency_key: ContextVar[Optional[str]] = ContextVar("consistency_key", default=None)
+
+
+def set_consistency_key(key: Optional[str]):
+    return _consistency_key.set(key)
+
+
+def reset_consistency_key(token) -> None:
+    _consistency_key.reset(token)
+
+
+def consistency_key_from_credentials(credentials: str) -> str:
+    return hashlib.sha256(credentials.encode("utf-8")).hexdigest()[:32]
+
+
+def _reject_readonly_flush(session, flush_context, instances):
+    raise DatabaseError("Attempted to write through a read-only session")
+
+
+def _record_write(session, flush_context):
+    session.info["has_writes"] = True
+
+
+def _record_statement_write(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+def after_commit(session, callback: Callable, *args) -> None:
+    """Call ``callback(*args)`` once ``session`` commits; dropped if it rolls back.
+
+    For in-process side effects, such as the autocomplete index, that must
+    never see a write the database did not keep.
+    """
+    session = getattr(session, "sync_session", session)
+    session.info.setdefault("after_commit", []).append((callback, args))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    for callback, args in session.info.pop("after_commit", ()):
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error("After-commit hook failed", extra={"hook": callback.__name__, "error": str(e)})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session):
+    session.info.pop("after_commit", None)
+
+
+def _create_instrumented_engine(database_url: str, slow_query_threshold: float, **kwargs):
+    engine = create_engine(database_url, poolclass=InstrumentedQueuePool, **kwargs)
+    metrics = PoolMetrics()
+    engine.pool.metrics = metrics
+    metrics.attach(engine)
+    attach_query_monitor(engine, slow_query_threshold)
+    return engine, metrics
+
+
+class _Replica:
+    """A read replica; its health fields are only touched under ``Database._lock``."""
+
+    def __init__(self, url: str, engine, session_factory: sessionmaker, metrics: PoolMetrics):
+        self.url = url
+        self.engine = engine
+        self.SessionLocal = session_factory
+        self.metrics = metrics
+        self.unavailable_until = 0.0
+        self.failures = 0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.unavailable_until
+
+    def mark_down(self, retry_interval: float):
+        self.failures += 1
+        self.unavailable_until = time.monotonic() + retry_interval
+
+    def mark_up(self) -> bool:
+        """Clear the failure state; returns whether the replica had been failing."""
+        recovered = self.failures > 0
+        self.failures = 0
+        self.unavailable_until = 0.0
+        return recovered
+
+
 class Database:
     def __init__(
         self,
@@ -17,44 +118,135 @@ class Database:
         pool_size: int = 10,
         max_overflow: int = 20,
         pool_pre_ping: bool = True,
-        echo: bool = False
+        echo: bool = False,
+        replica_urls: Optional[List[str]] = None,
+        replica_retry_interval: float = 30.0,
+        read_your_writes_window: float = 5.0,
+        slow_query_threshold: float = 0.5
     ):
         self.database_url = database_url
-        self.engine = create_engine(
+        self.engine, self.pool_metrics = _create_instrumented_engine(
             database_url,
+            slow_query_threshold,
             pool_size=pool_size,
             max_overflow=max_overflow,
             pool_pre_ping=pool_pre_ping,
             echo=echo
         )
 
+        # Objects stay loaded after commit so services can build responses
+        # without a refresh SELECT (server defaults come back via RETURNING).
         self.SessionLocal = sessionmaker(
             autocommit=False,
             autoflush=False,
+            expire_on_commit=False,
             bind=self.engine
         )
+        event.listen(self.SessionLocal, "after_flush", _record_write)
+        event.listen(self.SessionLocal, "do_orm_execute", _record_statement_write)
 
-        self._setup_event_listeners()
+        self.replica_retry_interval = replica_retry_interval
+        self.read_your_writes_window = read_your_writes_window
+        self.replicas: List[_Replica] = []
+        for url in replica_urls or []:
+            replica_engine, replica_metrics = _create_instrumented_engine(
+                url,
+                slow_query_threshold,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_pre_ping=pool_pre_ping,
+                echo=echo
+            )
+            replica_sessions = sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=replica_engine
+            )
+            event.listen(replica_sessions, "before_flush", _reject_readonly_flush)
+            self.replicas.append(_Replica(url, replica_engine, replica_sessions, replica_metrics))
+        self._replica_cursor = 0
+        self._recent_writes: Dict[str, float] = {}
+        self._lock = threading.Lock()
 
         logger.info("Database connection initialized", extra={
-            "database_url": database_url.split("@")[-1] if "@" in database_url else "hidden"
+            "database_url": database_url.split("@")[-1] if "@" in database_url else "hidden",
+            "replicas": len(self.replicas)
         })
     
-    def _setup_event_listeners(self):
-        @event.listens_for(self.engine, "checkout")
-        def receive_checkout(dbapi_conn, connection_record, connection_proxy):
-            logger.debug("Connection checked out from pool")
-        
-        @event.listens_for(self.engine, "checkin")
-        def receive_checkin(dbapi_conn, connection_record):
-            logger.debug("Connection returned to pool")
+    def stats(self) -> dict:
+        stats = {"primary": self.pool_metrics.snapshot(self.engine.pool)}
+        if self.replicas:
+            with self._lock:
+                health = [(replica.available, replica.failures) for replica in self.replicas]
+            stats["replicas"] = [
+                {
+                    "url": replica.url.split("@")[-1],
+                    "available": available,
+                    "consecutive_failures": failures,
+                    **replica.metrics.snapshot(replica.engine.pool),
+                }
+                for replica, (available, failures) in zip(self.replicas, health)
+            ]
+        return stats
+
+    def _mark_write(self):
+        key = _consistency_key.get()
+        if key is None or not self.replicas:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[key] = now + self.read_your_writes_window
+            if len(self._recent_writes) > 10000:
+                self._recent_writes = {k: v for k, v in self._recent_writes.items() if v > now}
+
+    def _wrote_recently(self) -> bool:
+        key = _consistency_key.get()
+        if key is None:
+            return False
+        expires_at = self._recent_writes.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def _next_replicas(self) -> List[_Replica]:
+        """Available replicas in round-robin order, starting one further each call."""
+        with self._lock:
+            start = self._replica_cursor
+            self._replica_cursor = (start + 1) % len(self.replicas)
+            return [replica for replica in self.replicas[start:] + self.replicas[:start] if replica.available]
+
+    def _open_read_session(self) -> Session:
+        if not self.replicas or self._wrote_recently():
+            return self.SessionLocal()
+        for replica in self._next_replicas():
+            session = replica.SessionLocal()
+            try:
+                # Check out the connection up front so a dead replica fails
+                # over here rather than in the middle of the caller's query.
+                session.connection()
+            except OperationalError as e:
+                session.close()
+                with self._lock:
+                    replica.mark_down(self.replica_retry_interval)
+                logger.warning("Read replica unavailable, failing over", extra={
+                    "replica": replica.url.split("@")[-1],
+                    "error": str(e)
+                })
+                continue
+            with self._lock:
+                recovered = replica.mark_up()
+            if recovered:
+                logger.info("Read replica recovered", extra={"replica": replica.url.split("@")[-1]})
+            return session
+        return self.SessionLocal()
 
     @contextmanager
-    def get_session(self) -> Generator[Session, None, None]:
-        session = self.SessionLocal()
+    def get_session(self, readonly: bool = False) -> Generator[Session, None, None]:
+        session = self._open_read_session() if readonly else self.SessionLocal()
         try:
             yield session
-            session.commit()
+            if session.in_transaction():
+                session.commit()
+            if session.info.get("has_writes"):
+                self._mark_write()
         except ValidationError as e:
             session.rollback()
             raise e
@@ -72,17 +264,40 @@ class Database:
         finally:
             session.close()
         
-    def get_session_dependency(self) -> Session:
-        session = self.SessionLocal()
+    @contextmanager
+    def unit_of_work(self, readonly: bool = False) -> Generator[Session, None, None]:
+        """One session, and at most one connection, for a whole request.
+
+        Services sharing the session only flush; a write session is committed
+        exactly once, here, when the request succeeds, and hooks queued with
+        ``after_commit`` run then. Errors are re-raised unchanged so HTTP
+        exceptions keep their status codes.
+        """
+        session = self._open_read_session() if readonly else self.SessionLocal()
         try:
             yield session
-            session.commit()
-        except Exception as e:
+            if not readonly:
+                session.commit()
+            if session.info.get("has_writes"):
+                self._mark_write()
+        except Exception:
             session.rollback()
-            logger.error("Database session error", extra={"error": str(e)})
-            raise DatabaseError(f"Database operation failed: {str(e)}")
+            raise
         finally:
             session.close()
+
+    @contextmanager
+    def session_scope(self, session: Optional[Session] = None, readonly: bool = False) -> Generator[Session, None, None]:
+        """Use the caller's request session if given, otherwise open a standalone one."""
+        if session is not None:
+            yield session
+        else:
+            with self.get_session(readonly=readonly) as standalone:
+                yield standalone
+
+    def get_session_dependency(self, readonly: bool = False) -> Generator[Session, None, None]:
+        with self.unit_of_work(readonly=readonly) as session:
+            yield session
     
     def create_tables(self):
         Base.metadata.create_all(bind=self.engine)
@@ -101,12 +316,100 @@ class Database:
             logger.error("Database health check failed", extra={"error": str(e)})
             return False
 
+
+def to_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+class AsyncDatabase:
+    def __init__(
+        self,
+        database_url: str,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_pre_ping: bool = True,
+        echo: bool = False,
+        slow_query_threshold: float = 0.5
+    ):
+        self.database_url = to_async_url(database_url)
+        self.engine = create_async_engine(
+            self.database_url,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=pool_pre_ping,
+            echo=echo
+        )
+        self.pool_metrics = PoolMetrics()
+        self.engine.sync_engine.pool.metrics = self.pool_metrics
+        self.pool_metrics.attach(self.engine.sync_engine)
+        attach_query_monitor(self.engine.sync_engine, slow_query_threshold)
+
+        # expire_on_commit is disabled because expired attributes cannot be
+        # lazy-loaded outside of the greenlet once the session is committed.
+        self.SessionLocal = async_sessionmaker(
+            bind=self.engine,
+            autoflush=False,
+            expire_on_commit=False,
+            class_=AsyncSession
+        )
+
+        logger.info("Async database connection initialized", extra={
+            "database_url": database_url.split("@")[-1] if "@" in database_url else "hidden"
+        })
+
+    @asynccontextmanager
+    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+        session = self.SessionLocal()
+        try:
+            yield session
+            if session.in_transaction():
+                await session.commit()
+        except ValidationError as e:
+            await session.rollback()
+            raise e
+        except Exception as e:
+            await session.rollback()
+            import traceback
+            tb = traceback.format_exc()
+            logger.error(
+                "Async database session error: %s\n%s",
+                str(e),
+                tb,
+                extra={"error": str(e), "error_type": type(e).__name__, "traceback": tb},
+            )
+            raise DatabaseError(f"Database operation failed: {str(e)}")
+        finally:
+            await session.close()
+
+    def stats(self) -> dict:
+        return {"primary": self.pool_metrics.snapshot(self.engine.sync_engine.pool)}
+
+    async def health_check(self) -> bool:
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            logger.error("Async database health check failed", extra={"error": str(e)})
+            return False
+
+    async def dispose(self):
+        await self.engine.dispose()
+        logger.info("Async database engine disposed")
+
+
 _db_instance: Optional[Database] = None
+_async_db_instance: Optional[AsyncDatabase] = None
 
 
 def init_database(database_url: str, **kwargs) -> Database:
     global _db_instance
     _db_instance = Database(database_url, **kwargs)
+    register_metrics("database", _db_instance.stats)
     return _db_instance
 
 
@@ -114,3 +417,16 @@ def get_database() -> Database:
     if _db_instance is None:
         raise DatabaseError("Database has not been initialized. Call init_database() first.")
     return _db_instance
+
+
+def init_async_database(database_url: str, **kwargs) -> AsyncDatabase:
+    global _async_db_instance
+    _async_db_instance = AsyncDatabase(database_url, **kwargs)
+    register_metrics("async_database", _async_db_instance.stats)
+    return _async_db_instance
+
+
+def get_async_database() -> AsyncDatabase:
+    if _async_db_instance is None:
+        raise DatabaseError("Async database has not been initialized. Call init_async_database() first.")
+    return _async_db_instance
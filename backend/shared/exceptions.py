@@ -38,4 +38,18 @@ class NotFoundError(BitezException):
     """Resource not found errors."""
     
     def __init__(self, message: str, details: Optional[dict] = None):
-        super().__init__(message, status_code=404, details=details)
\ No newline at end of file
+        super().__init__(message, status_code=404, details=details)
+
+class ServiceUnavailableError(BitezException):
+    """Temporary overload; the client should retry later."""
+    
+    def __init__(self, message: str, details: Optional[dict] = None):
+        super().__init__(message, status_code=503, details=details)
+
+
+class TooManyRequestsError(BitezException):
+    """Rate limit exceeded; ``retry_after`` is in seconds."""
+    
+    def __init__(self, message: str, retry_after: float, details: Optional[dict] = None):
+        super().__init__(message, status_code=429, details=details)
+        self.retry_after = retry_after
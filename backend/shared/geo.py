@@ -0,0 +1,116 @@
+"""Geohash cells and great-circle distance for proximity queries.
+
+A geohash interleaves longitude and latitude bits and encodes them in base32,
+so every prefix names a rectangular cell and nearby points share prefixes.
+Rows store a full-precision hash; a radius query looks at the cell holding
+the centre plus its eight neighbours, at the finest precision whose cells
+still span the circle's radius in degrees each way, which always covers the
+whole circle.
+"""
+import math
+from typing import Optional, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+STORED_PRECISION = 9  # ~4.8m x 4.8m
+BAND_PRECISION = 2  # 5.6 x 11.25 degrees, 32 cells round the globe
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def encode(latitude: float, longitude: float, precision: int = STORED_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        bounds, point = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if point >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Height and width of a cell in degrees."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def _extent(latitude: float, radius_km: float) -> Tuple[float, Optional[float]]:
+    """Half-height and half-width in degrees of the circle's bounding box.
+
+    The width is ``None`` when the circle contains a pole, where every
+    longitude is in reach.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    ratio = math.sin(angle) / max(math.cos(math.radians(latitude)), 1e-12)
+    if angle >= math.pi / 2 or ratio >= 1.0:
+        return math.degrees(angle), None
+    return math.degrees(angle), math.degrees(math.asin(ratio))
+
+
+def precision_for_radius(latitude: float, radius_km: float) -> int:
+    """The finest precision whose cells span the circle's half-height and half-width, or 0 if none does."""
+    half_height, half_width = _extent(latitude, radius_km)
+    if half_width is None:
+        return 0
+    for precision in range(STORED_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        if height >= half_height and width >= half_width:
+            return precision
+    return 0
+
+
+def _band_cells(south: float, north: float) -> list[str]:
+    # Every cell in the rows between the two latitudes, all the way round.
+    precision = BAND_PRECISION if north - south <= cell_size(BAND_PRECISION)[0] else 1
+    height, width = cell_size(precision)
+    first = int((max(south, -90.0) + 90.0) // height)
+    last = int((min(north, 90.0 - 1e-9) + 90.0) // height)
+    columns = round(360.0 / width)
+    return sorted(
+        encode(-90.0 + (row + 0.5) * height, -180.0 + (column + 0.5) * width, precision)
+        for row in range(first, last + 1)
+        for column in range(columns)
+    )
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float) -> list[str]:
+    """The centre cell and its neighbours, deduplicated at the poles.
+
+    Circles too wide for a 3x3 block, i.e. those reaching over (or very
+    near) a pole, get whole bands of coarse cells instead.
+    """
+    precision = precision_for_radius(latitude, radius_km)
+    if precision == 0:
+        half_height, _ = _extent(latitude, radius_km)
+        return _band_cells(latitude - half_height, latitude + half_height)
+    height, width = cell_size(precision)
+    cells = set()
+    for dlat in (-height, 0.0, height):
+        for dlon in (-width, 0.0, width):
+            lat = min(max(latitude + dlat, -90.0), 90.0 - 1e-9)
+            lon = (longitude + dlon + 180.0) % 360.0 - 180.0
+            cells.add(encode(lat, lon, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
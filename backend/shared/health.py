@@ -0,0 +1,174 @@
+"""Background dependency health probing for liveness/readiness endpoints."""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from shared.exceptions import MessagingError
+from shared.logging import get_logger
+from shared.messaging import get_rabbitmq
+
+logger = get_logger("health")
+
+
+class ComponentHealth:
+    def __init__(self, name: str):
+        self.name = name
+        self.healthy: Optional[bool] = None
+        self.checked_at: Optional[datetime] = None
+        self.checked_monotonic: Optional[float] = None
+        self.last_healthy_at: Optional[datetime] = None
+        self.latency_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        self.consecutive_failures = 0
+
+    def record(self, healthy: bool, latency: float, error: Optional[str] = None):
+        now = datetime.now(timezone.utc)
+        self.healthy = healthy
+        self.checked_at = now
+        self.checked_monotonic = time.monotonic()
+        self.latency_ms = round(latency * 1000, 2)
+        self.error = error
+        if healthy:
+            self.last_healthy_at = now
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+
+    def age(self) -> Optional[float]:
+        if self.checked_monotonic is None:
+            return None
+        return time.monotonic() - self.checked_monotonic
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "last_healthy_at": self.last_healthy_at.isoformat() if self.last_healthy_at else None,
+            "latency_ms": self.latency_ms,
+            "consecutive_failures": self.consecutive_failures,
+            "error": self.error,
+        }
+
+
+class HealthMonitor:
+    """Probes dependencies on an interval and serves the cached results.
+
+    The database probe runs over its own single-connection engine so that
+    probes never wait behind (or take slots from) request traffic.
+    """
+
+    def __init__(self, database_url: str, interval: float = 5.0, timeout: float = 2.0):
+        self.interval = interval
+        self.timeout = timeout
+        # A result older than this is treated as unhealthy: the probe loop
+        # itself has stalled.
+        self.stale_after = max(interval * 3, timeout * 2)
+        connect_args = {}
+        if make_url(database_url).get_backend_name() == "postgresql":
+            connect_args = {
+                "connect_timeout": max(int(timeout), 1),
+                "options": f"-c statement_timeout={int(timeout * 1000)}",
+            }
+        self.engine = create_engine(
+            database_url,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=timeout,
+            pool_recycle=300,
+            connect_args=connect_args
+        )
+        self.components: Dict[str, ComponentHealth] = {"database": ComponentHealth("database")}
+        self._probes: Dict[str, Callable[[], None]] = {"database": self._probe_database}
+        self._task: Optional[asyncio.Task] = None
+
+    def _probe_database(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    def _probe_rabbitmq(self):
+        if not get_rabbitmq().is_open():
+            raise MessagingError("RabbitMQ connection is closed")
+
+    def _rabbitmq_initialized(self) -> bool:
+        try:
+            get_rabbitmq()
+            return True
+        except MessagingError:
+            return False
+
+    async def _probe(self, name: str, probe: Callable[[], None]):
+        component = self.components.setdefault(name, ComponentHealth(name))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(probe), timeout=self.timeout)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if component.healthy is not False:
+                logger.warning("Health probe failed", extra={"component": name, "error": error})
+            component.record(False, time.perf_counter() - start, error)
+            return
+        if component.healthy is False:
+            logger.info("Health probe recovered", extra={"component": name})
+        component.record(True, time.perf_counter() - start)
+
+    async def probe_once(self):
+        if "rabbitmq" not in self._probes and self._rabbitmq_initialized():
+            self._probes["rabbitmq"] = self._probe_rabbitmq
+        await asyncio.gather(*(self._probe(name, probe) for name, probe in self._probes.items()))
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.error("Health monitor iteration failed", extra={"error": str(e)})
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        await self.probe_once()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.engine.dispose()
+
+    def is_healthy(self, name: str) -> bool:
+        component = self.components.get(name)
+        if component is None or not component.healthy:
+            return False
+        age = component.age()
+        return age is not None and age <= self.stale_after
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            name: {**component.to_dict(), "fresh": (component.age() or 0) <= self.stale_after}
+            for name, component in self.components.items()
+        }
+
+    def all_healthy(self) -> bool:
+        return all(self.is_healthy(name) for name in self.components)
+
+
+_health_monitor: Optional[HealthMonitor] = None
+
+
+def init_health_monitor(database_url: str, **kwargs) -> HealthMonitor:
+    global _health_monitor
+    _health_monitor = HealthMonitor(database_url, **kwargs)
+    return _health_monitor
+
+
+def get_health_monitor() -> HealthMonitor:
+    if _health_monitor is None:
+        raise RuntimeError("Health monitor has not been initialized. Call init_health_monitor() first.")
+    return _health_monitor
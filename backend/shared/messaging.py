@@ -68,6 +68,9 @@ class RabbitMQConnection:
         except Exception as e:
             logger.error("Error disconnecting from RabbitMQ", extra={"error": str(e)})
     
+    def is_open(self) -> bool:
+        return bool(self.connection and self.connection.is_open and self.channel and self.channel.is_open)
+
     def ensure_connection(self):
         if not self.connection or self.connection.is_closed:
             self.connect()
@@ -0,0 +1,89 @@
+"""Lightweight in-process metrics exposed through each service's /metrics endpoint."""
+import bisect
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+class Counter:
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            if value > self._max:
+                self._max = value
+
+    def _quantile(self, counts: list, total: int, q: float) -> Optional[float]:
+        # Upper bound of the bucket holding the q-th observation.
+        if total == 0:
+            return None
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.buckets, counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self._max
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total, total_sum, maximum = self._count, self._sum, self._max
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = total
+        return {
+            "count": total,
+            "sum": total_sum,
+            "mean": total_sum / total if total else None,
+            "max": maximum,
+            "p50": self._quantile(counts, total, 0.50),
+            "p95": self._quantile(counts, total, 0.95),
+            "p99": self._quantile(counts, total, 0.99),
+            "buckets": cumulative,
+        }
+
+
+_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_metrics(name: str, source: Callable[[], Dict[str, Any]]):
+    _sources[name] = source
+
+
+def unregister_metrics(name: str):
+    _sources.pop(name, None)
+
+
+def collect_metrics() -> Dict[str, Any]:
+    return {name: source() for name, source in list(_sources.items())}
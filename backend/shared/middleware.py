@@ -0,0 +1,101 @@
+"""ASGI middleware shared by Bitez services."""
+from shared.database import (
+    consistency_key_from_credentials,
+    reset_consistency_key,
+    set_consistency_key,
+)
+from shared.logging import get_logger
+from shared.query_stats import (
+    begin_request_stats,
+    budget_exceeded_total,
+    current_request_stats,
+    end_request_stats,
+    probable_n_plus_one_total,
+)
+
+logger = get_logger("middleware")
+
+
+class ConsistencyKeyMiddleware:
+    """Tags each request with a caller key for read-your-writes routing.
+
+    The key is derived from the Authorization header, falling back to the
+    client address forwarded by the gateway, so a caller that just wrote is
+    routed to the primary for its next reads instead of a lagging replica.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        credentials = headers.get(b"authorization") or headers.get(b"x-real-ip")
+        if credentials is None and scope.get("client"):
+            credentials = scope["client"][0].encode("latin-1")
+
+        key = consistency_key_from_credentials(credentials.decode("latin-1")) if credentials else None
+        token = set_consistency_key(key)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_consistency_key(token)
+
+
+class QueryStatsMiddleware:
+    """Counts SQL statements and DB time per request.
+
+    Requests that exceed the statement budget, or that run the same
+    statement repeatedly (a probable N+1), are logged. The totals are also
+    returned in a Server-Timing header.
+    """
+
+    def __init__(self, app, statement_budget: int = 20, repeated_statement_threshold: int = 5):
+        self.app = app
+        self.statement_budget = statement_budget
+        self.repeated_statement_threshold = repeated_statement_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = begin_request_stats()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                stats = current_request_stats()
+                if stats is not None:
+                    timing = 'db;dur=%.2f;desc="%d statements"' % (stats.total_time * 1000, stats.statements)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", timing.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            stats = end_request_stats(token)
+            if stats is not None:
+                self._report(scope, stats)
+
+    def _report(self, scope, stats):
+        request = {"method": scope.get("method"), "path": scope.get("path")}
+        if stats.statements > self.statement_budget:
+            budget_exceeded_total.inc()
+            logger.warning("Request exceeded SQL statement budget", extra={
+                **request,
+                "statements": stats.statements,
+                "budget": self.statement_budget,
+                "db_time_ms": round(stats.total_time * 1000, 2),
+            })
+        for statement, count in stats.repeated_statements(self.repeated_statement_threshold):
+            probable_n_plus_one_total.inc()
+            logger.warning("Probable N+1 query", extra={
+                **request,
+                "statement": statement,
+                "executions": count,
+            })
@@ -0,0 +1,156 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+A page is fetched with ``WHERE (sort_key, id) > (:last_sort_key, :last_id)
+ORDER BY sort_key, id LIMIT n + 1`` so the cost of a page does not depend on
+how deep into the listing it is. Cursors are opaque to clients and bound to
+the sort they were issued for.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import Select, literal, tuple_
+
+from shared.exceptions import ValidationError
+
+T = TypeVar("T")
+
+SortOptions = Dict[str, Tuple[Any, ...]]
+
+KEY_LABEL_PREFIX = "keyset_"
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
+_ENCODERS = {
+    datetime: ("dt", datetime.isoformat),
+    UUID: ("uuid", str),
+    Decimal: ("dec", str),
+    float: ("f", float),
+    int: ("i", int),
+    str: ("s", str),
+}
+_DECODERS = {
+    "dt": datetime.fromisoformat,
+    "uuid": UUID,
+    "dec": Decimal,
+    "f": float,
+    "i": int,
+    "s": str,
+}
+
+
+def _encode_value(value: Any) -> list:
+    for type_, (tag, encode) in _ENCODERS.items():
+        if isinstance(value, type_):
+            return [tag, encode(value)]
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    payload = json.dumps({"sort": sort, "after": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        after = [_DECODERS[tag](value) for tag, value in payload["after"]]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValidationError("Invalid cursor")
+    if payload.get("sort") != sort:
+        raise ValidationError("Cursor does not match the requested sort", details={"sort": sort})
+    return after
+
+
+def parse_sort(sort: str, options: SortOptions) -> Tuple[Tuple[Any, ...], bool]:
+    """Resolve ``name`` / ``-name`` to the sort key columns and direction."""
+    descending = sort.startswith("-")
+    keys = options.get(sort.lstrip("-"))
+    if keys is None:
+        raise ValidationError(
+            "Unsupported sort",
+            details={"sort": sort, "allowed": sorted(options) + sorted(f"-{name}" for name in options)},
+        )
+    return keys, descending
+
+
+def keyset_select(
+    statement: Select,
+    options: SortOptions,
+    sort: str,
+    cursor: Optional[str],
+    limit: int,
+) -> Select:
+    """Apply ordering, the cursor predicate and ``limit + 1`` to a select.
+
+    The sort key values are added as extra, labelled result columns so the
+    next cursor can be built from the last row; pass the rows to
+    :func:`build_page`. Every key set must end in a unique column so the
+    ordering is total.
+    """
+    keys, descending = parse_sort(sort, options)
+    labels = [key.label(f"{KEY_LABEL_PREFIX}{index}") for index, key in enumerate(keys)]
+    statement = statement.add_columns(*labels)
+    if cursor:
+        after = decode_cursor(cursor, sort)
+        if len(after) != len(keys):
+            raise ValidationError("Invalid cursor")
+        bound = tuple_(*(literal(value, key.type) for key, value in zip(keys, after)))
+        statement = statement.where(tuple_(*keys) < bound if descending else tuple_(*keys) > bound)
+    order = [label.desc() if descending else label.asc() for label in labels]
+    return statement.order_by(*order).limit(limit + 1)
+
+
+class RowPage(Generic[T]):
+    """A page of selected entities (or column tuples), not yet turned into models.
+
+    Lets a caller look at the rows (e.g. to validate a conditional request)
+    before paying for :meth:`to_page`.
+    """
+
+    __slots__ = ("items", "next_cursor", "limit")
+
+    def __init__(self, items: List[T], next_cursor: Optional[str], limit: int):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.limit = limit
+
+    def to_page(self, to_item: Callable[[T], Any]) -> Page:
+        return Page(items=[to_item(item) for item in self.items], next_cursor=self.next_cursor, limit=self.limit)
+
+
+def row_page(rows: Sequence[Any], sort: str, limit: int) -> RowPage:
+    """Split ``keyset_select`` rows into the page's entities and its next cursor.
+
+    Items are the selected entity, or a tuple of the selected columns when
+    the statement selects more than one (sort keys excluded).
+    """
+    rows = list(rows)
+    if not rows:
+        return RowPage([], None, limit)
+    width = sum(1 for name in rows[0]._fields if not name.startswith(KEY_LABEL_PREFIX))
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(sort, tuple(rows[-1])[width:])
+    if width == 1:
+        items = [row[0] for row in rows]
+    else:
+        items = [tuple(row[:width]) for row in rows]
+    return RowPage(items, next_cursor, limit)
+
+
+def build_page(rows: Sequence[Any], sort: str, limit: int, to_item: Callable[[Any], T]) -> Page[T]:
+    """Turn ``keyset_select`` rows into a page; ``to_item`` gets each :func:`row_page` item."""
+    return row_page(rows, sort, limit).to_page(to_item)
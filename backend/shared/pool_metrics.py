@@ -0,0 +1,129 @@
+"""Connection pool instrumentation for the shared database engines."""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from shared.metrics import Counter, Histogram
+
+CONNECTION_AGE_BUCKETS = (1, 10, 60, 300, 900, 1800, 3600, 7200, 21600, 86400)
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkout_wait = Histogram()
+        self.checkout_age = Histogram(CONNECTION_AGE_BUCKETS)
+        self.checkouts = Counter()
+        self.checkins = Counter()
+        self.connects = Counter()
+        self.closes = Counter()
+        self.invalidations = Counter()
+        self.soft_invalidations = Counter()
+        self.timeouts = Counter()
+        self._connected_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine):
+        """Register pool event listeners on a (sync) engine."""
+
+        @event.listens_for(engine, "connect")
+        def receive_connect(dbapi_conn, connection_record):
+            self.connects.inc()
+            connected_at = time.monotonic()
+            connection_record.info["connected_at"] = connected_at
+            with self._lock:
+                self._connected_at[id(connection_record)] = connected_at
+
+        @event.listens_for(engine, "checkout")
+        def receive_checkout(dbapi_conn, connection_record, connection_proxy):
+            self.checkouts.inc()
+            connected_at = connection_record.info.get("connected_at")
+            if connected_at is not None:
+                self.checkout_age.observe(time.monotonic() - connected_at)
+
+        @event.listens_for(engine, "checkin")
+        def receive_checkin(dbapi_conn, connection_record):
+            self.checkins.inc()
+
+        @event.listens_for(engine, "invalidate")
+        def receive_invalidate(dbapi_conn, connection_record, exception):
+            self.invalidations.inc()
+
+        @event.listens_for(engine, "soft_invalidate")
+        def receive_soft_invalidate(dbapi_conn, connection_record, exception):
+            self.soft_invalidations.inc()
+
+        @event.listens_for(engine, "close")
+        def receive_close(dbapi_conn, connection_record):
+            self.closes.inc()
+            with self._lock:
+                self._connected_at.pop(id(connection_record), None)
+
+        @event.listens_for(engine, "close_detached")
+        def receive_close_detached(dbapi_conn):
+            self.closes.inc()
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - connected_at for connected_at in self._connected_at.values()]
+        size = pool.size() if hasattr(pool, "size") else None
+        checked_in = pool.checkedin() if hasattr(pool, "checkedin") else None
+        checked_out = pool.checkedout() if hasattr(pool, "checkedout") else None
+        overflow = pool.overflow() if hasattr(pool, "overflow") else None
+        max_overflow = getattr(pool, "_max_overflow", None)
+        return {
+            "pool_size": size,
+            "max_overflow": max_overflow,
+            "in_use": checked_out,
+            "idle": checked_in,
+            # QueuePool reports overflow relative to pool_size, so it is
+            # negative until every pooled connection has been opened.
+            "overflow": max(overflow, 0) if overflow is not None else None,
+            "capacity_remaining": (
+                size + max_overflow - checked_out
+                if None not in (size, max_overflow, checked_out) and max_overflow >= 0 else None
+            ),
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "connection_age_at_checkout_seconds": self.checkout_age.snapshot(),
+            "open_connections": len(ages),
+            "oldest_connection_age_seconds": max(ages) if ages else None,
+            "checkouts": self.checkouts.value,
+            "checkins": self.checkins.value,
+            "connects": self.connects.value,
+            "closes": self.closes.value,
+            "timeouts": self.timeouts.value,
+            "invalidations": self.invalidations.value,
+            "soft_invalidations": self.soft_invalidations.value,
+        }
+
+
+class _InstrumentedPoolMixin:
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts.inc()
+            raise
+        if self.metrics is not None:
+            self.metrics.checkout_wait.observe(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
@@ -0,0 +1,111 @@
+"""Per-request SQL accounting: statement counts, DB time and slow-query logging."""
+import time
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+
+from shared.logging import get_logger
+from shared.metrics import Counter, Histogram, register_metrics
+
+logger = get_logger("database.queries")
+
+STATEMENT_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+
+
+class RequestQueryStats:
+    def __init__(self):
+        self.statements = 0
+        self.total_time = 0.0
+        self.by_statement: StatementCounter = StatementCounter()
+
+    def record(self, statement: str, duration: float):
+        self.statements += 1
+        self.total_time += duration
+        self.by_statement[statement] += 1
+
+    def repeated_statements(self, threshold: int) -> List[tuple]:
+        return [(statement, count) for statement, count in self.by_statement.most_common() if count >= threshold]
+
+
+_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+statements_total = Counter()
+slow_statements_total = Counter()
+budget_exceeded_total = Counter()
+probable_n_plus_one_total = Counter()
+statements_per_request = Histogram(STATEMENT_COUNT_BUCKETS)
+db_time_per_request = Histogram()
+
+
+def _snapshot() -> dict:
+    return {
+        "statements": statements_total.value,
+        "slow_statements": slow_statements_total.value,
+        "requests_over_budget": budget_exceeded_total.value,
+        "probable_n_plus_one": probable_n_plus_one_total.value,
+        "statements_per_request": statements_per_request.snapshot(),
+        "db_seconds_per_request": db_time_per_request.snapshot(),
+    }
+
+
+register_metrics("queries", _snapshot)
+
+
+def begin_request_stats():
+    return _request_stats.set(RequestQueryStats())
+
+
+def end_request_stats(token) -> Optional[RequestQueryStats]:
+    stats = _request_stats.get()
+    _request_stats.reset(token)
+    if stats is not None:
+        statements_per_request.observe(stats.statements)
+        db_time_per_request.observe(stats.total_time)
+    return stats
+
+
+def current_request_stats() -> Optional[RequestQueryStats]:
+    return _request_stats.get()
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Replace bound values with their type names so no user data is logged."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        return {"rows": len(parameters), "first": redact_parameters(parameters[0]) if parameters else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def attach_query_monitor(engine, slow_query_threshold: float = 0.5):
+    """Instrument a (sync) engine; async engines pass their sync_engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        statements_total.inc()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        if duration >= slow_query_threshold:
+            slow_statements_total.inc()
+            logger.warning("Slow query", extra={
+                "duration_ms": round(duration * 1000, 2),
+                "statement": statement,
+                "parameters": redact_parameters(parameters, executemany),
+            })
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Keep the timing stack balanced when a statement fails.
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
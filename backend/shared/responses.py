@@ -0,0 +1,23 @@
+"""Response classes for returning already-validated models.
+
+When a route returns a ``Response`` instance FastAPI skips its own
+``response_model`` validation and serialization. Routes whose services
+already hand back response models return ``ModelResponse(result)`` and keep
+``response_model=`` on the decorator for the OpenAPI schema only, so each
+model is validated once (in the service) and serialized once (here).
+"""
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class ModelResponse(JSONResponse):
+    """JSON response rendered by pydantic-core.
+
+    Accepts Pydantic models, lists/dicts of them, and the types pydantic
+    already knows how to serialize (UUID, datetime, Decimal).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)